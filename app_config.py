@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚙️ 설정 관리
+config.json 을 한 번 읽어 검증한 타입 있는 설정 객체로 캐시하고, 파일이 바뀌면 다시 읽어
+바뀐 항목만 알려 실행 중인 GUI/서비스가 재시작 없이 템플릿과 레이아웃 규칙을 반영하게 함
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+CONFIG_PATH = 'config.json'
+
+# 파일 변경 확인 간격(초) - os.stat 한 번이므로 짧아도 부담 없음
+WATCH_INTERVAL = 1.0
+
+# 레이아웃 규칙 조건식에서 쓸 수 있는 이름 (TextFeatures.as_analysis 의 키)
+RULE_NAMES = frozenset({
+    'text_length', 'text_type', 'image_count', 'line_count', 'colon_count', 'bullet_count',
+    'symbol_bullets', 'number_bullets', 'letter_bullets', 'script'
+})
+
+# 조건식에 허용하는 구문 (비교, and/or/not, 상수, 튜플/리스트)
+_RULE_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.Compare,
+               ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+               ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List)
+
+NUMBER = (int, float)
+
+
+class ConfigError(ValueError):
+    """설정 검증 실패 (문제 목록을 모두 담음)"""
+
+    def __init__(self, problems: List[str]):
+        super().__init__('\n'.join(problems))
+        self.problems = problems
+
+
+def compile_condition(source: str) -> Callable[[Dict], bool]:
+    """레이아웃 규칙 조건식 → 분석 dict 를 받는 함수 (허용된 구문/이름이 아니면 ValueError)"""
+    tree = ast.parse(source, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _RULE_NODES):
+            raise ValueError(f"허용되지 않는 구문: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in RULE_NAMES:
+            raise ValueError(f"알 수 없는 이름: {node.id}")
+    code = compile(tree, '<layout_rules>', 'eval')
+    return lambda analysis: bool(eval(code, {'__builtins__': {}}, analysis))
+
+
+@dataclass
+class AppSettings:
+    """app_settings"""
+    name: str = "Keynote 자동 생성기"
+    version: str = "1.0.0"
+    debug: bool = False
+    auto_save: bool = True
+    telemetry_log: Optional[str] = None
+    thumbnail_cache: Optional[str] = None
+    render_backend: str = 'applescript'
+    replay_dir: Optional[str] = None
+    replay_include_images: bool = True
+
+
+@dataclass
+class TemplateConfig:
+    """templates 항목 하나"""
+    template_id: str
+    path: str
+    description: str = ""
+    category: str = ""
+
+    @property
+    def display_name(self) -> str:
+        """GUI 목록에 보이는 이름"""
+        return f"템플릿 {self.template_id}" + (f" ({self.category})" if self.category else "")
+
+
+@dataclass
+class LayoutRule:
+    """layout_rules 항목 하나 (조건식은 읽을 때 한 번 컴파일)"""
+    name: str
+    condition: str
+    keynote_layout: str
+    priority: float
+    predicate: Callable[[Dict], bool] = field(compare=False, repr=False, default=None)
+
+
+@dataclass
+class ImageSettings:
+    """image_settings"""
+    supported_formats: Tuple[str, ...] = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
+    max_file_size_mb: float = 50
+    default_position: str = 'right'
+    default_size: str = 'medium'
+    positions: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class AISettings:
+    """ai_settings (layout_optimization 이 꺼지면 모든 문단에 기본 레이아웃)"""
+    text_analysis: bool = True
+    image_analysis: bool = True
+    layout_optimization: bool = True
+    auto_template_selection: bool = True
+
+
+@dataclass
+class UISettings:
+    """ui_settings"""
+    window_width: int = 1200
+    window_height: int = 900
+    theme: str = 'system'
+    font_size: int = 11
+    auto_analyze: bool = True
+
+
+class _Validator:
+    """항목을 읽으며 문제를 모음 (첫 문제에서 멈추지 않고 전부 보고)"""
+
+    def __init__(self):
+        self.problems: List[str] = []
+
+    def section(self, data: Dict, key: str) -> Dict:
+        value = data.get(key, {})
+        if not isinstance(value, dict):
+            self.problems.append(f"{key}: 객체여야 합니다")
+            return {}
+        return value
+
+    def value(self, data: Dict, key: str, types, default, where: str, optional: bool = False,
+              check: Optional[Callable] = None, message: str = ""):
+        value = data.get(key, default)
+        if value is None and optional:
+            return None
+        if isinstance(value, bool) and bool not in (types if isinstance(types, tuple) else (types,)):
+            valid = False  # bool 은 int 이기도 하므로 숫자 자리에 true/false 를 막음
+        else:
+            valid = isinstance(value, types)
+        if not valid or (check and not check(value)):
+            self.problems.append(f"{where}.{key}: {message or '형식이 맞지 않습니다'} ({value!r})")
+            return default
+        return value
+
+
+@dataclass
+class ConfigChange:
+    """두 설정의 차이 (의존 캐시를 필요한 만큼만 무효화하는 데 사용)"""
+    sections: Set[str] = field(default_factory=set)    # 바뀐 최상위 항목
+    templates: Set[str] = field(default_factory=set)   # 추가/삭제/변경된 템플릿 id
+    positions_changed: bool = False                    # image_settings.positions
+    limits_changed: bool = False                       # resource_limits, 이미지 크기/형식 한도
+
+    def __bool__(self) -> bool:
+        return bool(self.sections)
+
+    @property
+    def rules_changed(self) -> bool:
+        """레이아웃 규칙(또는 layout_optimization) 변경"""
+        return bool({'layout_rules', 'ai_settings'} & self.sections)
+
+    @property
+    def plans_changed(self) -> bool:
+        """같은 입력이라도 슬라이드 계획이 달라질 수 있는 변경"""
+        return self.rules_changed or self.positions_changed or self.limits_changed
+
+
+@dataclass
+class AppConfig:
+    """검증된 config.json
+
+    raw 는 원본 dict 로, ResourceLimits.from_config/OutputSink.from_config 처럼 dict 를
+    받는 쪽에 그대로 넘깁니다. layout_rules 가 None 이면 코드에 있는 기본 규칙을 씁니다.
+    """
+    app: AppSettings
+    templates: Dict[str, TemplateConfig]
+    layout_rules: Optional[Dict[str, LayoutRule]]
+    image: ImageSettings
+    ai: AISettings
+    ui: UISettings
+    raw: Dict
+
+    @classmethod
+    def parse(cls, data) -> "AppConfig":
+        """dict → AppConfig (문제가 하나라도 있으면 ConfigError)"""
+        if not isinstance(data, dict):
+            raise ConfigError(["최상위가 객체여야 합니다"])
+        v = _Validator()
+        optional_str = dict(types=str, default=None, optional=True)
+
+        section = v.section(data, 'app_settings')
+        defaults = AppSettings()
+        app = AppSettings(
+            name=v.value(section, 'name', str, defaults.name, 'app_settings'),
+            version=v.value(section, 'version', str, defaults.version, 'app_settings'),
+            debug=v.value(section, 'debug', bool, False, 'app_settings'),
+            auto_save=v.value(section, 'auto_save', bool, True, 'app_settings'),
+            telemetry_log=v.value(section, 'telemetry_log', where='app_settings', **optional_str),
+            thumbnail_cache=v.value(section, 'thumbnail_cache', where='app_settings', **optional_str),
+            render_backend=v.value(section, 'render_backend', str, defaults.render_backend,
+                                   'app_settings', check=bool),
+            replay_dir=v.value(section, 'replay_dir', where='app_settings', **optional_str),
+            replay_include_images=v.value(section, 'replay_include_images', bool, True,
+                                          'app_settings'))
+
+        templates = {}
+        for template_id, info in v.section(data, 'templates').items():
+            where = f"templates.{template_id}"
+            if not isinstance(info, dict):
+                v.problems.append(f"{where}: 객체여야 합니다")
+                continue
+            path = v.value(info, 'path', str, None, where, check=bool, message="경로가 필요합니다")
+            if path is None:
+                continue
+            templates[template_id] = TemplateConfig(
+                template_id, path,
+                v.value(info, 'description', str, f"템플릿 {template_id}", where),
+                v.value(info, 'category', str, '', where))
+
+        layout_rules = None
+        if 'layout_rules' in data:
+            layout_rules = {}
+            for name, rule in v.section(data, 'layout_rules').items():
+                where = f"layout_rules.{name}"
+                if not isinstance(rule, dict):
+                    v.problems.append(f"{where}: 객체여야 합니다")
+                    continue
+                condition = v.value(rule, 'condition', str, None, where, check=bool,
+                                    message="조건식이 필요합니다")
+                layout = v.value(rule, 'keynote_layout', str, None, where, check=bool,
+                                 message="레이아웃 이름이 필요합니다")
+                priority = v.value(rule, 'priority', NUMBER, None, where,
+                                   message="우선순위 숫자가 필요합니다")
+                if condition is None or layout is None or priority is None:
+                    continue
+                try:
+                    predicate = compile_condition(condition)
+                except (SyntaxError, ValueError) as e:
+                    v.problems.append(f"{where}.condition: {e} ({condition!r})")
+                    continue
+                layout_rules[name] = LayoutRule(name, condition, layout, priority, predicate)
+
+        section = v.section(data, 'image_settings')
+        defaults = ImageSettings()
+        positions = {}
+        for position, box in v.section(section, 'positions').items():
+            where = f"image_settings.positions.{position}"
+            if not isinstance(box, dict):
+                v.problems.append(f"{where}: 객체여야 합니다")
+                continue
+            values = {key: v.value(box, key, NUMBER, None, where, message="숫자가 필요합니다")
+                      for key in ('x', 'y', 'width', 'height')}
+            if None in values.values():
+                continue
+            if values['width'] <= 0 or values['height'] <= 0:
+                v.problems.append(f"{where}: 크기는 0 보다 커야 합니다")
+                continue
+            positions[position] = values
+        formats = v.value(section, 'supported_formats', list, list(defaults.supported_formats),
+                          'image_settings',
+                          check=lambda items: all(isinstance(item, str) and item.startswith('.')
+                                                  for item in items),
+                          message="'.png' 같은 확장자 목록이어야 합니다")
+        image = ImageSettings(
+            supported_formats=tuple(extension.lower() for extension in formats),
+            max_file_size_mb=v.value(section, 'max_file_size_mb', NUMBER, defaults.max_file_size_mb,
+                                     'image_settings', check=lambda size: size > 0),
+            default_position=v.value(section, 'default_position', str, defaults.default_position,
+                                     'image_settings',
+                                     check=lambda name: not positions or name in positions,
+                                     message="positions 에 있는 이름이어야 합니다"),
+            default_size=v.value(section, 'default_size', str, defaults.default_size,
+                                 'image_settings'),
+            positions=positions)
+
+        section = v.section(data, 'ai_settings')
+        ai = AISettings(**{name: v.value(section, name, bool, True, 'ai_settings')
+                           for name in AISettings.__dataclass_fields__})
+
+        section = v.section(data, 'ui_settings')
+        window = v.section(section, 'window_size')
+        defaults = UISettings()
+
+        def positive(number):
+            return number > 0
+
+        ui = UISettings(
+            window_width=v.value(window, 'width', int, defaults.window_width,
+                                 'ui_settings.window_size', check=positive),
+            window_height=v.value(window, 'height', int, defaults.window_height,
+                                  'ui_settings.window_size', check=positive),
+            theme=v.value(section, 'theme', str, defaults.theme, 'ui_settings'),
+            font_size=v.value(section, 'font_size', int, defaults.font_size, 'ui_settings',
+                              check=positive),
+            auto_analyze=v.value(section, 'auto_analyze', bool, True, 'ui_settings'))
+
+        # dict 로 넘기는 항목은 형식만 확인
+        section = v.section(data, 'resource_limits')
+        for name in ('max_slides', 'max_images', 'max_memory_mb'):
+            if name in section:  # 없으면 기본값, null 이나 실수는 오류
+                v.value(section, name, int, None, 'resource_limits', check=positive,
+                        message="1 이상의 정수여야 합니다")
+        v.value(section, 'spill_dir', where='resource_limits', **optional_str)
+        section = v.section(data, 'output')
+        v.value(section, 'root', where='output', **optional_str)
+        v.value(section, 'prefix', str, 'auto_presentation', 'output', check=bool)
+        retention = v.section(section, 'retention')
+        for name in ('max_files', 'max_age_days', 'max_total_mb'):
+            v.value(retention, name, NUMBER, None, 'output.retention', optional=True,
+                    check=lambda number: number >= 0)
+        section = v.section(data, 'slide_library')
+        v.value(section, 'path', where='slide_library', **optional_str)
+        slides = v.section(section, 'slides')
+        for name in slides:
+            v.value(slides, name, int, None, 'slide_library.slides', check=positive,
+                    message="1 이상의 슬라이드 번호여야 합니다")
+
+        if v.problems:
+            raise ConfigError(v.problems)
+        return cls(app, templates, layout_rules, image, ai, ui, data)
+
+    @classmethod
+    def load(cls, path: str = CONFIG_PATH) -> "AppConfig":
+        """파일에서 읽어 검증 (JSON 오류도 ConfigError)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ConfigError([f"JSON 형식 오류: {e}"])
+        return cls.parse(data)
+
+    @property
+    def effective_layout_rules(self) -> Optional[Dict[str, LayoutRule]]:
+        """LayoutSelector 에 넘길 규칙 (None 이면 기본 규칙, 빈 dict 면 항상 기본 레이아웃)"""
+        if not self.ai.layout_optimization:
+            return {}
+        return self.layout_rules
+
+    def diff(self, other: "AppConfig") -> ConfigChange:
+        """self → other 로 바뀐 항목"""
+        sections = {key for key in set(self.raw) | set(other.raw)
+                    if self.raw.get(key) != other.raw.get(key)}
+        templates = {template_id for template_id in set(self.templates) | set(other.templates)
+                     if self.templates.get(template_id) != other.templates.get(template_id)}
+        limits_changed = ('resource_limits' in sections or
+                          self.image.max_file_size_mb != other.image.max_file_size_mb or
+                          self.image.supported_formats != other.image.supported_formats)
+        return ConfigChange(sections, templates, self.image.positions != other.image.positions,
+                            limits_changed)
+
+
+class ConfigStore:
+    """config.json 캐시 + 변경 감시
+
+    get() 은 처음 한 번만 파일을 읽고 이후에는 캐시를 반환합니다. check() 는 파일 크기/수정
+    시각이 바뀌었을 때만 다시 읽어, 검증에 통과하면 교체하고 구독자에게 (새 설정, 변경 내역)을
+    알립니다. 검증에 실패하면 이전 설정을 유지하고 last_error 에 기록합니다.
+    GUI 는 root.after 로 check() 를 주기적으로 부르고, 서비스는 watch() 스레드를 씁니다.
+    """
+
+    def __init__(self, path: str = CONFIG_PATH):
+        self.path = path
+        self.last_error: Optional[ConfigError] = None
+        self._config: Optional[AppConfig] = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[AppConfig, ConfigChange], None]] = []
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self) -> AppConfig:
+        """캐시된 설정 (처음이면 읽기 - 파일이 없거나 잘못되면 OSError/ConfigError)"""
+        with self._lock:
+            if self._config is None:
+                signature = self._file_signature()
+                self._config = AppConfig.load(self.path)
+                self._signature = signature
+            return self._config
+
+    def subscribe(self, listener: Callable[[AppConfig, ConfigChange], None]):
+        """변경 알림 구독 (check() 를 부른 스레드에서 호출됨)"""
+        self._listeners.append(listener)
+
+    def check(self) -> Optional[ConfigChange]:
+        """파일이 바뀌었으면 다시 읽고 변경 내역 반환 (변경 없음/검증 실패면 None)"""
+        with self._lock:
+            signature = self._file_signature()
+            if signature is None or signature == self._signature:
+                return None
+            self._signature = signature
+            try:
+                config = AppConfig.load(self.path)
+            except (OSError, ConfigError) as e:
+                self.last_error = e if isinstance(e, ConfigError) else ConfigError([str(e)])
+                print(f"⚠️  {self.path} 다시 읽기 실패 (이전 설정 유지):\n{self.last_error}")
+                return None
+            self.last_error = None
+            # 처음 읽기에 실패했다가 고쳐진 경우는 기본값에서 모든 항목이 바뀐 것으로 알림
+            previous, self._config = self._config or AppConfig.parse({}), config
+            change = previous.diff(config)
+        if change:
+            for listener in list(self._listeners):
+                try:
+                    listener(config, change)
+                except Exception as e:
+                    print(f"⚠️  설정 변경 반영 실패: {type(e).__name__}: {e}")
+        return change
+
+    def watch(self, interval: float = WATCH_INTERVAL):
+        """백그라운드 스레드로 interval 마다 check() (서비스용)"""
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.check()
+
+        self._watcher = threading.Thread(target=run, name='config-watch', daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """감시 중지"""
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+_stores: Dict[str, ConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def config_store(path: str = CONFIG_PATH) -> ConfigStore:
+    """경로별 공유 ConfigStore (같은 파일은 프로세스에서 한 번만 읽음)"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ConfigStore(path)
+        return _stores[key]
+
+
+def main():
+    """메인 함수 - 설정 파일 검증"""
+    parser = argparse.ArgumentParser(description="config.json 검증")
+    parser.add_argument('--config', default=CONFIG_PATH)
+    args = parser.parse_args()
+
+    try:
+        config = AppConfig.load(args.config)
+    except ConfigError as e:
+        print(f"❌ {args.config} 문제 {len(e.problems)}개")
+        for problem in e.problems:
+            print(f"   {problem}")
+        return False
+    except OSError as e:
+        print(f"❌ {e}")
+        return False
+
+    rules = config.layout_rules
+    print(f"✅ {args.config}: 템플릿 {len(config.templates)}개, "
+          f"레이아웃 규칙 {len(rules) if rules is not None else '기본'}개, "
+          f"이미지 위치 {len(config.image.positions)}개")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
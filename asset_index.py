@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔑 자산 키
+이미지/템플릿 파일을 내용 해시(sha256 + 확장자)로 식별하는 키와, 같은 파일을 다시 해시하지 않는
+경로 → 키 색인 (렌더 팜 자산 전송과 출력 파일 내용 키에서 함께 사용)
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Tuple
+
+# 자산 키: sha256 16진수 + 확장자
+ASSET_KEY_PATTERN = re.compile(r'^[0-9a-f]{64}(\.[A-Za-z0-9]{1,8})?$')
+
+
+def file_asset_key(path: str) -> str:
+    """파일 내용 sha256 + 확장자"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest() + os.path.splitext(path)[1].lower()
+
+
+class AssetIndex:
+    """경로 → 자산 키 (파일 크기/수정 시각이 같으면 다시 해시하지 않음)"""
+
+    def __init__(self):
+        self._keys: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def key(self, path: str) -> str:
+        stat = os.stat(path)
+        cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            key = self._keys.get(cache_key)
+        if key is None:
+            key = file_asset_key(path)
+            with self._lock:
+                self._keys[cache_key] = key
+        return key
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📤 Keynote 내보내기 파이프라인
+저장된 .key 파일을 PDF/PowerPoint 로 일괄 변환하는 작업 큐와 폴더 감시 모드
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from keynote_generator_main import AppleScriptController
+
+EXPORT_EXTENSIONS = {
+    'pdf': '.pdf',
+    'pptx': '.pptx'
+}
+
+
+@dataclass
+class ExportJob:
+    """내보내기 작업 (문서 하나 + 여러 형식)"""
+    source_path: str
+    formats: List[str]
+    output_dir: Optional[str] = None
+    document_open: bool = False  # 이미 front document 로 열려 있으면 다시 열지 않음
+    outputs: Dict[str, str] = field(default_factory=dict)
+    success: bool = False
+    result: Optional[object] = None  # 내보내기 함수가 반환한 ScriptResult
+    queued_at: float = field(default_factory=time.time)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    def __post_init__(self):
+        base_name = os.path.splitext(os.path.basename(self.source_path.rstrip(os.sep)))[0]
+        output_dir = self.output_dir or os.path.dirname(self.source_path.rstrip(os.sep))
+        for export_format in self.formats:
+            if export_format not in EXPORT_EXTENSIONS:
+                raise ValueError(f"지원하지 않는 내보내기 형식: {export_format}")
+            self.outputs[export_format] = os.path.join(
+                output_dir, base_name + EXPORT_EXTENSIONS[export_format])
+
+    @property
+    def wait_time(self) -> float:
+        """큐에서 대기한 시간(초)"""
+        return self.started_at - self.queued_at if self.started_at else 0.0
+
+    @property
+    def export_time(self) -> float:
+        """내보내기에 걸린 시간(초)"""
+        return self.finished_at - self.started_at if self.finished_at else 0.0
+
+
+class ExportQueue:
+    """동시 실행 수가 제한된 내보내기 작업 큐
+
+    Keynote 는 하나의 앱 인스턴스로 동작하므로 기본 동시 실행 수는 1 입니다.
+    """
+
+    def __init__(self, concurrency: int = 1,
+                 export_func: Callable[..., bool] = AppleScriptController.export_presentation):
+        self.export_func = export_func
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers = []
+        for i in range(max(1, concurrency)):
+            worker = threading.Thread(target=self._worker, name=f'export-{i}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, job: ExportJob) -> Future:
+        """작업 추가 (완료 시 job 을 결과로 갖는 Future 반환)"""
+        future: Future = Future()
+        job.queued_at = time.time()
+        self._queue.put((job, future))
+        return future
+
+    def join(self):
+        """큐의 모든 작업이 끝날 때까지 대기"""
+        self._queue.join()
+
+    def shutdown(self):
+        """워커 종료"""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            job, future = item
+            if not future.set_running_or_notify_cancel():
+                self._queue.task_done()
+                continue
+
+            job.started_at = time.time()
+            try:
+                source_path = None if job.document_open else job.source_path
+                job.result = self.export_func(job.outputs, source_path)
+                job.success = bool(job.result)
+                job.finished_at = time.time()
+                future.set_result(job)
+            except Exception as e:
+                job.finished_at = time.time()
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+
+def find_keynote_files(root_path: str) -> List[str]:
+    """경로 아래의 모든 .key 파일(패키지 폴더 포함) 찾기"""
+    if root_path.endswith('.key'):
+        return [root_path]
+
+    key_files = []
+    for dir_path, dir_names, file_names in os.walk(root_path):
+        # .key 패키지 폴더는 하나의 문서로 취급하고 내부로 들어가지 않음
+        for dir_name in [d for d in dir_names if d.endswith('.key')]:
+            key_files.append(os.path.join(dir_path, dir_name))
+            dir_names.remove(dir_name)
+        key_files.extend(os.path.join(dir_path, f) for f in file_names if f.endswith('.key'))
+    return sorted(key_files)
+
+
+def _mtime(path: str) -> Optional[float]:
+    """수정 시각 (없거나 읽을 수 없으면 None)"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def needs_export(job: ExportJob) -> bool:
+    """출력 파일이 없거나 원본보다 오래되었는지 확인 (원본을 읽을 수 없으면 OSError)"""
+    source_mtime = os.path.getmtime(job.source_path)
+    for path in job.outputs.values():
+        output_mtime = _mtime(path)
+        if output_mtime is None or output_mtime < source_mtime:
+            return True
+    return False
+
+
+def convert_directory(root_path: str, formats: List[str], export_queue: ExportQueue,
+                      output_dir: Optional[str] = None, seen: Optional[Dict[str, float]] = None
+                      ) -> List[Future]:
+    """경로 아래의 .key 파일 중 변환이 필요한 것을 큐에 추가
+
+    찾은 뒤 확인하기 전에 지워지거나 이름이 바뀐 파일(저장 중인 임시 .key 등)은 건너뜁니다.
+    """
+    futures = []
+    for key_path in find_keynote_files(root_path):
+        try:
+            mtime = os.path.getmtime(key_path)
+            if seen is not None and seen.get(key_path) == mtime:
+                continue
+
+            job = ExportJob(source_path=key_path, formats=formats, output_dir=output_dir)
+            stale = needs_export(job)
+        except OSError:
+            continue
+        if stale:
+            futures.append(export_queue.submit(job))
+        if seen is not None:
+            seen[key_path] = mtime
+    return futures
+
+
+def report(job: ExportJob):
+    """작업별 시간 출력"""
+    status = "✅" if job.success else "❌"
+    formats = ', '.join(job.formats)
+    print(f"{status} {job.source_path} [{formats}] "
+          f"대기 {job.wait_time:.2f}초, 내보내기 {job.export_time:.2f}초")
+    if not job.success and hasattr(job.result, 'describe'):
+        print(f"   {job.result.describe()}")
+
+
+def watch_directory(root_path: str, formats: List[str], export_queue: ExportQueue,
+                    output_dir: Optional[str] = None, interval: float = 5.0):
+    """폴더를 주기적으로 확인하며 새로 저장되거나 변경된 .key 파일을 변환"""
+    seen: Dict[str, float] = {}
+    print(f"👀 감시 중: {root_path} (Ctrl+C 로 종료)")
+    while True:
+        try:
+            futures = convert_directory(root_path, formats, export_queue, output_dir, seen)
+        except OSError as e:
+            # 감시 폴더가 잠시 없어지는 등 한 번의 확인 실패로 감시를 멈추지 않음
+            print(f"⚠️ 폴더 확인 실패: {e}")
+            futures = []
+        for future in futures:
+            future.add_done_callback(
+                lambda f: report(f.result()) if f.exception() is None else
+                print(f"❌ 내보내기 오류: {f.exception()}"))
+        time.sleep(interval)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Keynote 파일을 PDF/PowerPoint 로 일괄 내보내기")
+    parser.add_argument('path', help=".key 파일 또는 .key 파일이 들어 있는 폴더")
+    parser.add_argument('--formats', nargs='+', default=['pdf', 'pptx'],
+                        choices=sorted(EXPORT_EXTENSIONS), help="내보낼 형식")
+    parser.add_argument('--output-dir', help="출력 폴더 (기본: 원본과 같은 폴더)")
+    parser.add_argument('--jobs', type=int, default=1, help="동시 내보내기 수")
+    parser.add_argument('--watch', action='store_true', help="폴더 감시 모드")
+    parser.add_argument('--interval', type=float, default=5.0, help="감시 주기(초)")
+    args = parser.parse_args()
+
+    export_queue = ExportQueue(concurrency=args.jobs)
+
+    if args.watch:
+        try:
+            watch_directory(args.path, args.formats, export_queue, args.output_dir, args.interval)
+        except KeyboardInterrupt:
+            print("\n감시 종료")
+        return True
+
+    start_time = time.time()
+    futures = convert_directory(args.path, args.formats, export_queue, args.output_dir)
+    jobs = [future.result() for future in futures]
+    for job in jobs:
+        report(job)
+
+    succeeded = sum(1 for job in jobs if job.success)
+    print(f"\n📊 {succeeded}/{len(jobs)} 변환 완료 ({time.time() - start_time:.2f}초)")
+    return succeeded == len(jobs)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,693 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🌐 Keynote 생성 HTTP 서비스
+다른 내부 도구가 JSON 으로 프레젠테이션 생성을 요청할 수 있는 로컬 서비스
+(작업 큐 + 제한된 워커 풀, 동일 요청 병합, 작업별 시간 제한, 진행 상황 스트리밍)
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib import request as urllib_request
+
+from app_config import CONFIG_PATH, AppConfig, ConfigChange, ConfigError, config_store
+from keynote_generator_main import (AppleScriptController, LayoutSelector, ScriptResult,
+                                    SlideData, create_slide_structure, generate_presentation)
+from image_assignment import DEFAULT_IMAGE_POSITIONS, ImageAssigner
+from output_sink import OutputSink, RetentionPolicy
+from slide_library import SlideLibrary
+from text_fitting import TextFitter
+
+# 요청 본문 최대 크기 (이미지 포함)
+MAX_REQUEST_BYTES = 50 * 1024 * 1024
+
+# 완료된 작업을 병합/조회용으로 보관하는 시간(초)
+FINISHED_JOB_TTL = 3600
+
+
+class ServiceError(Exception):
+    """요청 오류 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class JobTimeout(Exception):
+    """작업 시간 제한 초과"""
+
+
+class StubController:
+    """Keynote 없이 생성 파이프라인을 돌리는 가짜 컨트롤러 (Linux 테스트/부하 테스트용)
+
+    AppleScriptController 와 같은 메서드를 가지며, 저장 시 슬라이드 목록을 JSON 으로 씁니다.
+    """
+
+    def __init__(self, slide_latency: float = 0.01):
+        self.slide_latency = slide_latency
+        self.slides: List[Dict] = []
+
+    def create_presentation_from_template(self, template_path: str, output_path: str) -> ScriptResult:
+        self.slides = []
+        return ScriptResult(True, operation='create_presentation',
+                            labels={'template': template_path})
+
+    def add_slide_with_layout(self, slide_data: SlideData) -> ScriptResult:
+        time.sleep(self.slide_latency)
+        self.slides.append({'layout': slide_data.layout, 'title': slide_data.title,
+                            'image': None})
+        return ScriptResult(True, operation='add_slide', labels={'layout': slide_data.layout})
+
+    def add_image_to_current_slide(self, image_path: str, position: str = "right",
+                                   box: Optional[Tuple[int, int, int, int]] = None) -> ScriptResult:
+        time.sleep(self.slide_latency / 2)
+        if self.slides:
+            self.slides[-1]['image'] = image_path
+        return ScriptResult(True, operation='add_image', labels={'position': position})
+
+    def add_images_to_current_slide(self, images: List[Tuple[str, Tuple[int, int, int, int]]]
+                                    ) -> ScriptResult:
+        time.sleep(self.slide_latency / 2)
+        if self.slides:
+            self.slides[-1]['gallery'] = [image_path for image_path, _ in images]
+        return ScriptResult(True, operation='add_images', labels={'count': str(len(images))})
+
+    def annotate_slides(self, annotations: List[Tuple[int, SlideData]], added_count: int
+                        ) -> ScriptResult:
+        time.sleep(self.slide_latency / 2)
+        base = len(self.slides) - added_count
+        for position, slide_data in annotations:
+            self.slides[base + position - 1]['notes'] = slide_data.notes
+        return ScriptResult(True, operation='annotate_slides', output='0',
+                            labels={'slides': str(len(annotations))})
+
+    def import_library_slides(self, library_path: str, slide_numbers: List[int]) -> ScriptResult:
+        time.sleep(self.slide_latency / 2)
+        for number in slide_numbers:
+            self.slides.append({'layout': 'Library', 'title': f"{library_path}#{number}",
+                                'image': None})
+        return ScriptResult(True, operation='import_library_slides',
+                            output=','.join('1' for _ in slide_numbers),
+                            labels={'count': str(len(slide_numbers))})
+
+    def save_presentation(self, output_path: str) -> ScriptResult:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({'slides': self.slides}, f, ensure_ascii=False)
+        return ScriptResult(True, operation='save')
+
+
+@dataclass
+class GenerationJob:
+    """생성 작업"""
+    job_id: str
+    payload_key: str
+    text: str
+    template_path: str
+    images: List[Dict]
+    timeout: float
+    output_path: str
+    status: str = 'queued'  # queued, running, done, failed, timeout
+    error: Optional[str] = None
+    slide_count: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    events: List[Dict] = field(default_factory=list)
+    changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'timeout')
+
+    def add_event(self, message: str, **extra):
+        """진행 이벤트 추가 후 스트리밍 대기자 깨우기"""
+        with self.changed:
+            self.events.append({'time': time.time(), 'status': self.status,
+                                'message': message, **extra})
+            self.changed.notify_all()
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'error': self.error,
+            'slide_count': self.slide_count,
+            'output_path': self.output_path if self.status == 'done' else None,
+            'created_at': self.created_at,
+            'queue_time': (self.started_at or time.time()) - self.created_at,
+            'run_time': ((self.finished_at or time.time()) - self.started_at
+                         if self.started_at else 0.0),
+            'last_event': self.events[-1]['message'] if self.events else None
+        }
+
+
+class GenerationService:
+    """생성 작업 큐와 워커 풀
+
+    실제 Keynote 백엔드는 front document 하나를 다루므로 워커 1개로 실행해야 하고,
+    StubController 백엔드는 여러 워커로 부하 테스트할 수 있습니다.
+    """
+
+    def __init__(self, templates: Dict[str, str], output_dir: str = 'output',
+                 workers: int = 1, queue_size: int = 100, job_timeout: float = 300.0,
+                 controller_factory: Callable[[], object] = lambda: AppleScriptController,
+                 slide_delay: float = 0.5, output_sink: Optional[OutputSink] = None,
+                 slide_library: Optional[SlideLibrary] = None):
+        self.templates = templates
+        self.output_dir = output_dir
+        self.output_sink = output_sink or OutputSink(output_dir)
+        self.upload_dir = os.path.join(output_dir, '.uploads')
+        self.job_timeout = job_timeout
+        self.controller_factory = controller_factory
+        self.slide_delay = slide_delay
+        self.slide_library = slide_library
+        self.workers = workers
+        self.text_fitter = TextFitter()
+        self.image_assigner = ImageAssigner(self.text_fitter)
+
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._jobs_by_key: Dict[str, str] = {}
+        self._upload_refs: Dict[str, int] = {}  # 업로드 경로 → 사용 중인 작업 수
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._counters = {'submitted': 0, 'coalesced': 0, 'rejected': 0,
+                          'done': 0, 'failed': 0, 'timeout': 0}
+        self._run_time_total = 0.0
+        self._busy_workers = 0
+
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, name=f'generation-{i}', daemon=True).start()
+
+    # ------------------------------------------------------------------ 제출
+
+    def submit(self, payload: Dict) -> Tuple[GenerationJob, bool]:
+        """작업 제출 (동일한 요청이 진행 중이거나 완료되었으면 그 작업을 반환)"""
+        text = payload.get('text')
+        if not isinstance(text, str) or not text.strip():
+            raise ServiceError(400, "text 가 필요합니다")
+
+        template_id = str(payload.get('template', ''))
+        if template_id not in self.templates:
+            raise ServiceError(400, f"알 수 없는 템플릿: {template_id}")
+        template_path = self.templates[template_id]
+
+        timeout = payload.get('timeout', self.job_timeout)
+        if (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                or not math.isfinite(timeout) or timeout <= 0):
+            raise ServiceError(400, f"timeout 은 0 보다 큰 숫자(초)여야 합니다: {timeout!r}")
+        timeout = float(timeout)
+
+        # 업로드는 검사만 하고, 저장은 병합/큐 확인 뒤 새 작업을 만들 때만 함
+        uploads = payload.get('images', [])
+        if not isinstance(uploads, list):
+            raise ServiceError(400, "images 는 목록이어야 합니다")
+        decoded = [self._decode_image(image) for image in uploads]
+
+        key_source = json.dumps({'text': text, 'template': template_id,
+                                 'images': [digest for _, _, digest in decoded]},
+                                sort_keys=True, ensure_ascii=False)
+        payload_key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            self._expire_finished()
+            existing = self._coalesce(payload_key)
+            if existing:
+                return existing, True
+            if self._queue.full():
+                self._counters['rejected'] += 1
+                raise ServiceError(503, "작업 큐가 가득 찼습니다")
+            # 저장 전에 참조를 잡아 두어 같은 이미지를 쓰던 작업이 끝나도 지워지지 않게 함
+            paths = [self._upload_path(name, digest) for _, name, digest in decoded]
+            self._acquire_uploads(paths)
+
+        try:
+            images = [self._store_image(*image) for image in decoded]
+        except OSError:
+            with self._lock:
+                self._release_uploads(paths)
+            raise
+
+        with self._lock:
+            existing = self._coalesce(payload_key)
+            if existing:
+                self._release_uploads(paths)
+                return existing, True
+
+            job_id = uuid.uuid4().hex[:12]
+            job = GenerationJob(job_id=job_id, payload_key=payload_key, text=text,
+                                template_path=template_path, images=images, timeout=timeout,
+                                output_path=os.path.abspath(
+                                    os.path.join(self.output_dir, f"{job_id}.key")))
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._counters['rejected'] += 1
+                self._release_uploads(paths)
+                raise ServiceError(503, "작업 큐가 가득 찼습니다")
+
+            self._jobs[job_id] = job
+            self._jobs_by_key[payload_key] = job_id
+            self._counters['submitted'] += 1
+
+        job.add_event("대기 중")
+        return job, False
+
+    def apply_config(self, config: AppConfig, change: ConfigChange):
+        """config.json 변경 반영 (ConfigStore.subscribe 용)
+
+        템플릿 경로가 바뀐 작업과, 계획이 달라질 수 있는 변경(레이아웃 규칙, 이미지 위치,
+        한도, 슬라이드 라이브러리)이면 완료된 작업의 병합 기록만 버립니다. 진행 중인 작업과 출력 파일은 그대로이며,
+        출력 파일은 계획/템플릿 내용 해시로 이름이 붙으므로 따로 무효화할 필요가 없습니다.
+        """
+        if change.rules_changed:
+            LayoutSelector.configure(config.effective_layout_rules)
+        if change.positions_changed:
+            self.image_assigner.positions = config.image.positions or DEFAULT_IMAGE_POSITIONS
+        library_changed = 'slide_library' in change.sections
+        if library_changed:
+            self.slide_library = SlideLibrary.from_config(config.raw)
+
+        with self._lock:
+            changed_paths = {self.templates[template_id] for template_id in change.templates
+                             if template_id in self.templates}
+            if change.templates:
+                self.templates = {template_id: template.path
+                                  for template_id, template in config.templates.items()}
+            for job_id, job in list(self._jobs.items()):
+                if not job.finished or self._jobs_by_key.get(job.payload_key) != job_id:
+                    continue
+                if (change.plans_changed or library_changed or
+                        job.template_path in changed_paths):
+                    del self._jobs_by_key[job.payload_key]
+
+    def _coalesce(self, payload_key: str) -> Optional[GenerationJob]:
+        """같은 요청의 진행 중/완료 작업 (잠금 안에서 호출, 있으면 병합 수 증가)"""
+        existing = self._jobs.get(self._jobs_by_key.get(payload_key, ''))
+        if existing and existing.status not in ('failed', 'timeout'):
+            self._counters['coalesced'] += 1
+            return existing
+        return None
+
+    @staticmethod
+    def _decode_image(image: Dict) -> Tuple[bytes, str, str]:
+        """업로드 이미지 → (내용, 파일 이름, sha256)"""
+        try:
+            data = base64.b64decode(image['data'], validate=True)
+        except (KeyError, TypeError, ValueError):
+            raise ServiceError(400, "이미지는 base64 data 가 필요합니다")
+        name = os.path.basename(str(image.get('name', 'image.png')))
+        return data, name, hashlib.sha256(data).hexdigest()
+
+    def _upload_path(self, name: str, digest: str) -> str:
+        """업로드 이미지의 내용 해시 경로"""
+        extension = os.path.splitext(name)[1].lower() or '.png'
+        return os.path.abspath(os.path.join(self.upload_dir, digest + extension))
+
+    def _store_image(self, data: bytes, name: str, digest: str) -> Dict:
+        """업로드 이미지를 내용 해시 이름으로 저장 (같은 이미지는 한 번만 저장)"""
+        path = self._upload_path(name, digest)
+        if not os.path.exists(path):
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return {'path': path, 'name': name, 'sha256': digest}
+
+    def _acquire_uploads(self, paths: List[str]):
+        """업로드 참조 수 증가 (잠금 안에서 호출)"""
+        for path in paths:
+            self._upload_refs[path] = self._upload_refs.get(path, 0) + 1
+
+    def _release_uploads(self, paths: List[str]):
+        """업로드 참조 수 감소, 더 쓰는 작업이 없으면 파일 삭제 (잠금 안에서 호출)"""
+        for path in paths:
+            count = self._upload_refs.get(path, 0) - 1
+            if count > 0:
+                self._upload_refs[path] = count
+                continue
+            self._upload_refs.pop(path, None)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _expire_finished(self):
+        """오래된 완료 작업 정리 (잠금 안에서 호출)"""
+        now = time.time()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.finished_at > FINISHED_JOB_TTL]:
+            job = self._jobs.pop(job_id)
+            if self._jobs_by_key.get(job.payload_key) == job_id:
+                del self._jobs_by_key[job.payload_key]
+
+    # ------------------------------------------------------------------ 실행
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self._busy_workers += 1
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._busy_workers -= 1
+                    # 끝난 작업은 업로드를 다시 읽지 않음 (재시도는 새 작업으로 다시 업로드)
+                    self._release_uploads([image['path'] for image in job.images])
+                    self._counters[job.status] = self._counters.get(job.status, 0) + 1
+                    self._run_time_total += job.finished_at - job.started_at
+                self._queue.task_done()
+
+    def _run(self, job: GenerationJob):
+        job.started_at = time.time()
+        job.status = 'running'
+        deadline = time.monotonic() + job.timeout
+
+        def progress(message: str):
+            # 단계 사이마다 시간 제한 확인 (실행 중인 osascript 는 SCRIPT_TIMEOUT 으로 제한됨)
+            if time.monotonic() > deadline:
+                raise JobTimeout(f"{job.timeout:.0f}초 시간 제한 초과")
+            job.add_event(message)
+
+        try:
+            job.add_event("슬라이드 구성 중")
+            slides = create_slide_structure(job.text, job.images, self.text_fitter,
+                                            self.image_assigner)
+            job.slide_count = len(slides)
+            
+            # 같은 계획/템플릿/이미지로 이미 만든 결과가 있으면 그대로 사용
+            library = self.slide_library
+            output_key = self.output_sink.content_key(slides, job.template_path, library)
+            existing = self.output_sink.existing(output_key)
+            if existing:
+                job.output_path = existing
+                job.add_event("기존 결과 사용")
+                job.status = 'done'
+                return
+            
+            temp_path = self.output_sink.reserve(output_key)
+            try:
+                result = generate_presentation(job.template_path, temp_path, slides,
+                                               controller=self.controller_factory(),
+                                               progress=progress, slide_delay=self.slide_delay,
+                                               library=library)
+                if result:
+                    job.output_path = self.output_sink.commit(output_key, temp_path)
+                    job.status = 'done'
+                    self.output_sink.maybe_cleanup()
+                else:
+                    job.status, job.error = 'failed', result.describe()
+            finally:
+                self.output_sink.discard(temp_path)
+        except JobTimeout as e:
+            job.status, job.error = 'timeout', str(e)
+        except Exception as e:
+            job.status, job.error = 'failed', f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+            job.add_event(job.error or "완료", finished=True)
+
+    # ------------------------------------------------------------------ 조회
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def health(self) -> Dict:
+        return {'status': 'ok', 'workers': self.workers,
+                'busy_workers': self._busy_workers, 'queue_depth': self._queue.qsize()}
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            finished = counters['done'] + counters['failed'] + counters['timeout']
+            statuses: Dict[str, int] = {}
+            for job in self._jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            return {
+                'counters': counters,
+                'jobs_by_status': statuses,
+                'queue_depth': self._queue.qsize(),
+                'busy_workers': self._busy_workers,
+                'average_run_time': self._run_time_total / finished if finished else 0.0,
+                'controller': AppleScriptController.telemetry.summary()['operations']
+            }
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP 요청 처리
+
+    POST /jobs, GET /jobs/<id>, GET /jobs/<id>/events (Server-Sent Events),
+    GET /health, GET /metrics
+    """
+
+    server_version = 'KeynoteGenerationService/1.0'
+
+    @property
+    def service(self) -> GenerationService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise ServiceError(400, "Content-Length 가 잘못되었습니다")
+            if length > MAX_REQUEST_BYTES:
+                raise ServiceError(413, "요청이 너무 큽니다")
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+            if not isinstance(payload, dict):
+                raise ServiceError(400, "JSON 객체가 필요합니다")
+            job, coalesced = self.service.submit(payload)
+        except ServiceError as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': f"잘못된 JSON: {e}"})
+            return
+
+        self._send_json(200 if coalesced else 202, {**job.to_dict(), 'coalesced': coalesced})
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+
+        if parts == ['health']:
+            self._send_json(200, self.service.health())
+        elif parts == ['metrics']:
+            self._send_json(200, self.service.metrics())
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {'error': '작업 없음'})
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif parts[2] == 'events':
+                self._stream_events(job)
+            else:
+                self._send_json(404, {'error': 'not found'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _stream_events(self, job: GenerationJob):
+        """진행 이벤트를 Server-Sent Events 로 스트리밍 (작업이 끝나면 종료)"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        sent = 0
+        try:
+            while True:
+                with job.changed:
+                    while sent == len(job.events) and not job.finished:
+                        job.changed.wait(timeout=15)
+                        if sent == len(job.events):
+                            break  # keep-alive
+                    events = job.events[sent:]
+                    finished = job.finished
+
+                if not events:
+                    self.wfile.write(b': keep-alive\n\n')
+                for event in events:
+                    data = json.dumps(event, ensure_ascii=False)
+                    self.wfile.write(f"data: {data}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                sent += len(events)
+
+                if finished and sent == len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+class GenerationHTTPServer(ThreadingHTTPServer):
+    """요청마다 스레드를 쓰는 HTTP 서버 (동시 접속이 몰려도 연결이 끊기지 않도록 listen 대기열 확대)"""
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def create_server(service: GenerationService, host: str = '127.0.0.1', port: int = 8765,
+                  verbose: bool = False) -> GenerationHTTPServer:
+    """HTTP 서버 생성 (port=0 이면 임의 포트)"""
+    server = GenerationHTTPServer((host, port), GenerationRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def load_templates(config_path: str = CONFIG_PATH) -> Dict[str, str]:
+    """config.json 의 템플릿 id → 경로 (검증된 설정 캐시 사용)"""
+    templates = config_store(config_path).get().templates
+    return {template_id: template.path for template_id, template in templates.items()}
+
+
+def run_load_test(base_url: str, total_jobs: int = 100, concurrency: int = 10,
+                  unique_payloads: int = 20, template: str = '1') -> Dict:
+    """부하 테스트: 작업을 동시에 제출하고 완료될 때까지 기다려 처리량/지연을 측정"""
+
+    def call(method: str, path: str, body: Optional[Dict] = None) -> Dict:
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib_request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib_request.urlopen(req, timeout=60) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def one_job(index: int) -> Tuple[float, bool, str]:
+        start = time.perf_counter()
+        text = f"부하 테스트 {index % unique_payloads}\n\n본문 문단입니다\n• 항목 1\n• 항목 2\n• 항목 3"
+        job = call('POST', '/jobs', {'text': text, 'template': template})
+        while job['status'] in ('queued', 'running'):
+            time.sleep(0.02)
+            job = call('GET', f"/jobs/{job['job_id']}")
+        return time.perf_counter() - start, job.get('coalesced', False), job['status']
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_job, range(total_jobs)))
+    elapsed = time.perf_counter() - start_time
+
+    latencies = sorted(latency for latency, _, _ in results)
+    return {
+        'jobs': total_jobs,
+        'elapsed': elapsed,
+        'throughput': total_jobs / elapsed if elapsed else 0.0,
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'statuses': {status: sum(1 for _, _, s in results if s == status)
+                     for status in {s for _, _, s in results}},
+        'server_metrics': call('GET', '/metrics')
+    }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Keynote 생성 HTTP 서비스")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="서비스 실행")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--workers', type=int, default=1, help="워커 수 (Keynote 백엔드는 1)")
+    serve.add_argument('--queue-size', type=int, default=100)
+    serve.add_argument('--timeout', type=float, default=300.0, help="작업별 시간 제한(초)")
+    serve.add_argument('--output-dir', default='output')
+    serve.add_argument('--config', default=CONFIG_PATH, help="설정 파일 (바뀌면 재시작 없이 반영)")
+    serve.add_argument('--keep-files', type=int, help="보관할 최대 결과 수 (넘으면 오래 안 쓴 것부터 삭제)")
+    serve.add_argument('--keep-days', type=float, help="결과 보관 기간(일)")
+    serve.add_argument('--stub', action='store_true', help="Keynote 대신 가짜 렌더 백엔드 사용")
+    serve.add_argument('--stub-latency', type=float, default=0.01, help="가짜 백엔드 슬라이드당 지연(초)")
+    serve.add_argument('--verbose', action='store_true')
+
+    load_test = subparsers.add_parser('load-test', help="실행 중인 서비스에 부하 테스트")
+    load_test.add_argument('--url', default='http://127.0.0.1:8765')
+    load_test.add_argument('--jobs', type=int, default=100)
+    load_test.add_argument('--concurrency', type=int, default=10)
+    load_test.add_argument('--unique', type=int, default=20, help="서로 다른 요청 수 (나머지는 병합)")
+
+    args = parser.parse_args()
+
+    if args.command == 'load-test':
+        report = run_load_test(args.url, args.jobs, args.concurrency, args.unique)
+        print(f"📊 {report['jobs']}개 작업, {report['elapsed']:.2f}초, "
+              f"{report['throughput']:.1f} jobs/s, p50 {report['p50']:.3f}초, "
+              f"p95 {report['p95']:.3f}초, 상태 {report['statuses']}")
+        print(json.dumps(report['server_metrics']['counters'], ensure_ascii=False))
+        return True
+
+    if args.stub:
+        def controller_factory():
+            return StubController(args.stub_latency)
+        slide_delay = 0.0
+    else:
+        def controller_factory():
+            return AppleScriptController
+        slide_delay = 0.5
+        if args.workers != 1:
+            # Keynote 는 front document 하나를 다루므로 워커가 여럿이면 서로의 문서를 바꿈
+            print(f"⚠️ Keynote 백엔드는 워커 1개로만 실행합니다 (--workers {args.workers} 무시)")
+            args.workers = 1
+
+    store = config_store(args.config)
+    try:
+        config = store.get()
+    except (OSError, ConfigError) as e:
+        print(f"❌ {args.config} 로딩 실패:\n{e}")
+        return False
+    service = GenerationService(load_templates(args.config), output_dir=args.output_dir,
+                                workers=args.workers, queue_size=args.queue_size,
+                                job_timeout=args.timeout,
+                                controller_factory=controller_factory, slide_delay=slide_delay,
+                                output_sink=OutputSink(args.output_dir, retention=RetentionPolicy(
+                                    max_files=args.keep_files, max_age_days=args.keep_days)))
+    service.apply_config(config, AppConfig.parse({}).diff(config))
+    store.subscribe(service.apply_config)
+    store.watch()
+    server = create_server(service, args.host, args.port, args.verbose)
+    print(f"🌐 http://{args.host}:{server.server_address[1]} 에서 대기 중 "
+          f"(워커 {args.workers}개, {'stub' if args.stub else 'Keynote'} 백엔드)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서비스 종료")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 이미지 배정 엔진
+모든 이미지를 한 번에 분석하고, 문단과 이미지를 비용 행렬의 최소 비용 매칭
+(헝가리안 알고리즘)으로 짝지은 뒤 image_settings.positions 에서 위치/크기를 결정
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from text_fitting import TextFitter
+
+# Keynote 기본 슬라이드 좌표계 (applescript_controller.scpt getThemeInfo 기본값)
+SLIDE_SIZE = (1024, 768)
+
+# config.json 의 image_settings.positions 가 없을 때 사용하는 기본값
+DEFAULT_IMAGE_POSITIONS = {
+    'left': {'x': 50, 'y': 150, 'width': 280, 'height': 180},
+    'right': {'x': 500, 'y': 150, 'width': 280, 'height': 180},
+    'center': {'x': 250, 'y': 200, 'width': 400, 'height': 300}
+}
+
+# image_size 별 배율 (addImageToCurrentSlide 의 small/large 크기와 비슷하게)
+IMAGE_SIZE_SCALE = {'small': 0.7, 'medium': 1.0, 'large': 1.6}
+
+# 이미지가 들어가는 레이아웃 (본문 용량 계산용)
+PHOTO_LAYOUT = 'Title, Bullets & Photo'
+
+# 문서 순서(문단 위치 ↔ 이미지 추가 순서)를 유지하려는 비용 가중치
+ORDER_WEIGHT = 0.5
+
+# 사진 레이아웃 본문에 들어가지 않는 문단에 이미지를 붙일 때의 비용
+OVERFLOW_COST = 1.0
+
+# 이 크기보다 큰 배정 문제는 문서 순서 구간으로 나눠 풂 (구간당 O(n³))
+ASSIGNMENT_BLOCK = 150
+
+# 짧은 문단으로 보는 본문 채움 비율 (이미지를 가운데에 크게 배치)
+SHORT_FILL = 0.25
+
+
+def solve_assignment(cost: List[List[float]]) -> List[int]:
+    """최소 비용 매칭 (헝가리안 알고리즘, 포텐셜 + 최단 증가 경로, O(n²m))
+
+    행마다 배정된 열 번호 목록을 반환합니다. 행이 열보다 많으면 일부 행은 -1 입니다.
+    """
+    rows = len(cost)
+    columns = len(cost[0]) if rows else 0
+    if not rows or not columns:
+        return [-1] * rows
+
+    if rows > columns:
+        transposed = [list(column) for column in zip(*cost)]
+        result = [-1] * rows
+        for column, row in enumerate(solve_assignment(transposed)):
+            result[row] = column
+        return result
+
+    infinity = float('inf')
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    owner = [0] * (columns + 1)  # 열에 배정된 행 (1부터, 0 은 비어 있음)
+    way = [0] * (columns + 1)
+
+    for row in range(1, rows + 1):
+        owner[0] = row
+        current_column = 0
+        min_values = [infinity] * (columns + 1)
+        free_columns = list(range(1, columns + 1))  # 아직 트리에 들어가지 않은 열
+        tree_columns = [0]
+        while True:
+            current_row = owner[current_column]
+            row_costs = cost[current_row - 1]
+            row_potential = u[current_row]
+            delta = infinity
+            next_index = 0
+            for index, column in enumerate(free_columns):
+                reduced = row_costs[column - 1] - row_potential - v[column]
+                if reduced < min_values[column]:
+                    min_values[column] = reduced
+                    way[column] = current_column
+                if min_values[column] < delta:
+                    delta = min_values[column]
+                    next_index = index
+            for column in tree_columns:
+                u[owner[column]] += delta
+                v[column] -= delta
+            for column in free_columns:
+                min_values[column] -= delta
+            current_column = free_columns.pop(next_index)
+            tree_columns.append(current_column)
+            if owner[current_column] == 0:
+                break
+
+        # 증가 경로를 따라 배정 갱신
+        while current_column:
+            previous = way[current_column]
+            owner[current_column] = owner[previous]
+            current_column = previous
+
+    result = [-1] * rows
+    for column in range(1, columns + 1):
+        if owner[column]:
+            result[owner[column] - 1] = column - 1
+    return result
+
+
+def image_frame(position_box: Dict, image_size: str, aspect_ratio: float) -> Tuple[int, int, int, int]:
+    """위치 상자를 크기 배율로 키운 뒤 이미지 비율을 유지해 맞춘 영역 (x, y, width, height)
+
+    상자의 왼쪽 위를 기준으로 키우고(Keynote 의 크기 지정과 같게), 이미지는 상자 가로 중앙에
+    두며 슬라이드 밖으로 나가지 않게 조정합니다.
+    """
+    scale = IMAGE_SIZE_SCALE.get(image_size, 1.0)
+    box_width = position_box['width'] * scale
+    box_height = position_box['height'] * scale
+    if aspect_ratio > 0 and box_width / box_height > aspect_ratio:
+        width, height = box_height * aspect_ratio, box_height
+    elif aspect_ratio > 0:
+        width, height = box_width, box_width / aspect_ratio
+    else:
+        width, height = box_width, box_height
+
+    width = min(width, SLIDE_SIZE[0])
+    height = min(height, SLIDE_SIZE[1])
+    x = min(max(0, position_box['x'] + (box_width - width) / 2), SLIDE_SIZE[0] - width)
+    y = min(max(0, position_box['y']), SLIDE_SIZE[1] - height)
+    return int(x), int(y), int(width), int(height)
+
+
+class ImageAssigner:
+    """문단 ↔ 이미지 배정기
+
+    비용은 문서 순서 차이, 이미지 모양과 문단 길이의 궁합(넓은 이미지는 짧은 문단,
+    세로로 긴 이미지는 긴 문단 옆), 사진 레이아웃 본문 용량 초과 여부로 정합니다.
+    """
+
+    def __init__(self, text_fitter: "TextFitter", positions: Optional[Dict] = None,
+                 analyze_image: Optional[Callable[[str], Dict]] = None, max_workers: int = 8):
+        self.text_fitter = text_fitter
+        self.positions = positions or DEFAULT_IMAGE_POSITIONS
+        self.analyze_image = analyze_image
+        self.max_workers = max_workers
+        self._analysis_cache: Dict[Tuple, Dict] = {}
+
+    def analyze_images(self, paths: List[str]) -> List[Dict]:
+        """이미지 일괄 분석 (스레드 풀, 파일 상태가 같으면 캐시 사용)"""
+        if self.analyze_image is None:
+            from keynote_generator_main import ContentAnalyzer
+            self.analyze_image = ContentAnalyzer.analyze_image
+
+        def cache_key(path):
+            try:
+                stat = os.stat(path)
+                return path, stat.st_size, stat.st_mtime_ns
+            except OSError:
+                return path, None, None
+
+        keys = [cache_key(path) for path in paths]
+        missing = list({key for key in keys if key not in self._analysis_cache})
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for key, analysis in zip(missing, executor.map(
+                        lambda key: self.analyze_image(key[0]), missing)):
+                    self._analysis_cache[key] = analysis
+        return [self._analysis_cache[key] for key in keys]
+
+    def body_fill(self, content: str) -> float:
+        """사진 레이아웃 본문을 채우는 비율 (1 보다 크면 넘침)"""
+        placeholder = self.text_fitter.body_placeholder(PHOTO_LAYOUT)
+        font_size = placeholder['font_size']
+        lines = len(self.text_fitter.wrap(content, font_size, placeholder['width']))
+        return lines / self.text_fitter.max_lines(placeholder, font_size)
+
+    @staticmethod
+    def pair_cost(fill: float, paragraph_rank: float, analysis: Dict, image_rank: float) -> float:
+        """문단 하나와 이미지 하나를 짝지을 때의 비용"""
+        image_type = analysis.get('type')
+        if image_type == 'wide_chart':
+            shape = fill  # 넓은 이미지는 본문이 짧을수록 좋음
+        elif image_type == 'tall_infographic':
+            shape = max(0.0, 0.6 - fill)  # 세로 이미지는 긴 본문 옆에 둠
+        elif image_type == 'square_icon':
+            shape = 0.1
+        else:
+            shape = abs(fill - 0.4) * 0.5
+        overflow = OVERFLOW_COST if fill > 1 else 0.0
+        return shape + overflow + ORDER_WEIGHT * abs(paragraph_rank - image_rank)
+
+    def placement(self, fill: float, analysis: Dict) -> Tuple[str, str]:
+        """이미지 위치와 크기 선택 (positions 에 있는 이름 중에서)"""
+        image_type = analysis.get('type')
+        if fill <= SHORT_FILL and image_type in ('wide_chart', 'standard_photo') \
+                and 'center' in self.positions:
+            return 'center', 'large' if fill <= SHORT_FILL / 2 else 'medium'
+        position = 'right' if 'right' in self.positions else next(iter(self.positions))
+        if image_type == 'square_icon':
+            return position, 'small'
+        if image_type == 'tall_infographic' or analysis.get('size') == 'large':
+            return position, 'large'
+        return position, 'medium'
+
+    def assign(self, contents: List[str], images: List[Dict]) -> Dict[int, Dict]:
+        """문단 번호 → 배정 정보 {'image', 'analysis', 'position', 'size', 'box'}
+
+        이미지가 문단보다 많으면 비용이 낮은 이미지만 배정되고 나머지는 남습니다.
+        """
+        if not contents or not images:
+            return {}
+
+        analyses = self.analyze_images([image['path'] for image in images])
+        fills = [self.body_fill(content) for content in contents]
+
+        def rank(index, count):
+            return index / (count - 1) if count > 1 else 0.0
+
+        paragraph_ranks = [rank(i, len(contents)) for i in range(len(contents))]
+        image_ranks = [rank(j, len(images)) for j in range(len(images))]
+
+        # 순서 비용 때문에 멀리 떨어진 문단/이미지는 짝이 될 일이 거의 없으므로
+        # 큰 입력은 문서 순서대로 같은 비율의 구간으로 나눠 구간별로 정확히 풂
+        matches: List[Tuple[int, int]] = []
+        blocks = max(1, -(-max(len(contents), len(images)) // ASSIGNMENT_BLOCK))
+        for block in range(blocks):
+            first_paragraph = block * len(contents) // blocks
+            last_paragraph = (block + 1) * len(contents) // blocks
+            first_image = block * len(images) // blocks
+            last_image = (block + 1) * len(images) // blocks
+            cost = [[self.pair_cost(fills[i], paragraph_ranks[i], analyses[j], image_ranks[j])
+                     for j in range(first_image, last_image)]
+                    for i in range(first_paragraph, last_paragraph)]
+            matches.extend((first_paragraph + i, first_image + j)
+                           for i, j in enumerate(solve_assignment(cost)) if j >= 0)
+
+        assignment = {}
+        for paragraph, image_index in matches:
+            analysis = analyses[image_index]
+            position, size = self.placement(fills[paragraph], analysis)
+            box = image_frame(self.positions[position], size, analysis.get('aspect_ratio', 0))
+            assignment[paragraph] = {'image': images[image_index], 'analysis': analysis,
+                                     'position': position, 'size': size, 'box': box}
+        return assignment
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ 다중 이미지 슬라이드 배치
+덱 전체의 이미지를 문단별로 모아 한 슬라이드에 여러 장씩 묶고,
+이미지 비율을 유지하는 행 단위 사각형 배치(justified rows)로 슬라이드 안에 배치
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from text_fitting import LAYOUT_PLACEHOLDERS
+
+MULTI_IMAGE_LAYOUT = 'Photo - 3 Up'
+
+# 한 슬라이드에 묶는 최대 이미지 수 (레이아웃 이름의 "3 Up")
+MAX_IMAGES_PER_SLIDE = 3
+
+# 이미지 사이 간격 (포인트)
+IMAGE_GAP = 12
+
+Box = Tuple[int, int, int, int]
+
+
+def row_partitions(count: int):
+    """이미지 count 개를 순서대로 행에 나누는 모든 방법 (행별 개수 목록)"""
+    if count == 0:
+        yield []
+        return
+    for first in range(1, count + 1):
+        for rest in row_partitions(count - first):
+            yield [first] + rest
+
+
+def pack_images(aspect_ratios: List[float], region: Dict, gap: int = IMAGE_GAP
+                ) -> Tuple[List[Box], float]:
+    """이미지 비율을 유지하며 영역 안에 행 단위로 배치
+
+    각 행은 영역 너비를 채우도록 높이를 정하고(행 높이 = 너비 / 비율 합), 전체 높이가
+    영역보다 크면 모든 행을 같은 비율로 줄입니다. 모든 행 분할 중 이미지가 덮는 면적이
+    가장 큰 배치를 고르며, (영역 좌표의 상자 목록, 덮는 면적 비율) 을 반환합니다.
+    """
+    if not aspect_ratios:
+        return [], 0.0
+
+    ratios = [ratio if ratio > 0 else 1.0 for ratio in aspect_ratios]
+    best: Optional[Tuple[float, List[int], List[float], float]] = None
+    for partition in row_partitions(len(ratios)):
+        heights = []
+        start = 0
+        for size in partition:
+            row = ratios[start:start + size]
+            heights.append((region['width'] - gap * (size - 1)) / sum(row))
+            start += size
+
+        gaps = gap * (len(partition) - 1)
+        scale = min(1.0, (region['height'] - gaps) / sum(heights))
+        area = 0.0
+        start = 0
+        for size, height in zip(partition, heights):
+            area += sum(ratio * (height * scale) ** 2 for ratio in ratios[start:start + size])
+            start += size
+        if best is None or area > best[0]:
+            best = (area, partition, heights, scale)
+
+    area, partition, heights, scale = best
+    total_height = sum(heights) * scale + gap * (len(partition) - 1)
+    y = region['y'] + (region['height'] - total_height) / 2
+    boxes = []
+    start = 0
+    for size, height in zip(partition, heights):
+        row_height = height * scale
+        row = ratios[start:start + size]
+        row_width = sum(ratio * row_height for ratio in row) + gap * (size - 1)
+        x = region['x'] + (region['width'] - row_width) / 2
+        for ratio in row:
+            boxes.append((int(x), int(y), int(ratio * row_height), int(row_height)))
+            x += ratio * row_height + gap
+        y += row_height + gap
+        start += size
+    return boxes, area / (region['width'] * region['height'])
+
+
+class SlidePacker:
+    """문단별 이미지 묶음을 다중 이미지 슬라이드로 나누고 배치"""
+
+    def __init__(self, region: Optional[Dict] = None,
+                 max_per_slide: int = MAX_IMAGES_PER_SLIDE, gap: int = IMAGE_GAP):
+        self.region = region or LAYOUT_PLACEHOLDERS[MULTI_IMAGE_LAYOUT]['photos']
+        self.max_per_slide = max_per_slide
+        self.gap = gap
+        self._pack_cache: Dict[Tuple[float, ...], Tuple[List[Box], float]] = {}
+
+    def pack(self, aspect_ratios: List[float]) -> Tuple[List[Box], float]:
+        """영역 안 배치 (비율 조합별로 캐시)"""
+        key = tuple(round(ratio, 2) for ratio in aspect_ratios)
+        if key not in self._pack_cache:
+            self._pack_cache[key] = pack_images(list(key), self.region, self.gap)
+        return self._pack_cache[key]
+
+    @staticmethod
+    def distribute(paragraph_count: int, image_count: int,
+                   assignment: Dict[int, int]) -> List[List[int]]:
+        """문단별 이미지 번호 목록 (배정되지 않은 이미지는 순서상 바로 앞 배정 이미지의 문단에)
+
+        assignment 는 문단 번호 → 이미지 번호입니다.
+        """
+        groups: List[List[int]] = [[] for _ in range(paragraph_count)]
+        if not paragraph_count:
+            return groups
+
+        by_image = sorted((image, paragraph) for paragraph, image in assignment.items())
+        assigned_images = [image for image, _ in by_image]
+        for image in range(image_count):
+            index = bisect_right(assigned_images, image) - 1
+            if index >= 0:
+                paragraph = by_image[index][1]
+            else:
+                # 앞에 배정된 이미지가 없으면 문서에서 비슷한 위치의 문단으로
+                paragraph = image * (paragraph_count - 1) // max(1, image_count - 1)
+            groups[paragraph].append(image)
+        return groups
+
+    def group(self, aspect_ratios: List[float]) -> List[Tuple[List[int], List[Box]]]:
+        """이미지를 순서대로 슬라이드 묶음으로 나눔
+
+        슬라이드 수가 가장 적은 분할 중 덮는 면적이 가장 큰 것을 동적 계획법으로 고르고,
+        (이미지 번호 목록, 배치 상자 목록) 을 슬라이드마다 반환합니다.
+        """
+        count = len(aspect_ratios)
+        # best[i] = (슬라이드 수, -면적 합, 이전 분할 위치)
+        best: List[Optional[Tuple[int, float, int]]] = [None] * (count + 1)
+        best[0] = (0, 0.0, 0)
+        for end in range(1, count + 1):
+            for size in range(1, min(self.max_per_slide, end) + 1):
+                previous = best[end - size]
+                _, coverage = self.pack(aspect_ratios[end - size:end])
+                candidate = (previous[0] + 1, previous[1] - coverage, end - size)
+                if best[end] is None or candidate[:2] < best[end][:2]:
+                    best[end] = candidate
+
+        groups = []
+        end = count
+        while end:
+            start = best[end][2]
+            indexes = list(range(start, end))
+            groups.append((indexes, self.pack(aspect_ratios[start:end])[0]))
+            end = start
+        return groups[::-1]
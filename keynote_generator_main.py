@@ -8,18 +8,103 @@ Author: AI Assistant
 Version: 1.0.0
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import subprocess
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import json
 import os
-import time
-from PIL import Image, ImageTk
+import sys
 import re
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+import itertools
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple
 import threading
 
+if TYPE_CHECKING:
+    from image_assignment import ImageAssigner
+    from image_packing import SlidePacker
+    from resource_limits import ResourceLimits
+    from text_fitting import TextFitter
+
+# tkinter/PIL 은 무거우므로 실제로 필요할 때 로드 (헤드리스 경로는 임포트하지 않음)
+# 슬라이드 계획 모듈(이미지 배정/묶음, 자원 한도, 텍스트 맞춤/분할)도 import 예산을 지키도록
+# 계획을 만들 때 로드 (subprocess 도 osascript 를 처음 실행할 때 로드)
+tk = ttk = filedialog = messagebox = scrolledtext = None
+
+# 시작 시간 예산 (밀리초)
+STARTUP_BUDGET_MS = {
+    'import': 80,          # import keynote_generator_main (tkinter/PIL 제외)
+    'first_paint': 500,    # 프로세스 시작 → 첫 화면 표시
+    'settings_loaded': 800  # 설정/템플릿 목록 로드 완료
+}
+
+def _load_tkinter():
+    """tkinter 지연 로드"""
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox, scrolledtext
+
+@dataclass
+class StyleRun:
+    """텍스트 서식 구간 (text_item 1 은 제목, 2 는 본문)
+    
+    start/end 는 1 부터 세는 글자 위치(end 포함)이며 end 가 None 이면 텍스트 전체입니다.
+    font/size/color 중 None 인 항목은 템플릿 서식을 그대로 둡니다. color 는 (r, g, b) 0~255.
+    """
+    text_item: int = 2
+    start: int = 1
+    end: Optional[int] = None
+    font: Optional[str] = None
+    size: Optional[float] = None
+    color: Optional[Tuple[int, int, int]] = None
+    
+    def __post_init__(self):
+        # 값이 AppleScript 문장에 그대로 들어가므로 형식을 맞추고 범위를 검사 (잘못되면 ValueError)
+        self.text_item = _checked_int(self.text_item, 'text_item', 1, 2)
+        self.start = _checked_int(self.start, 'start', 1)
+        if self.end is not None:
+            self.end = _checked_int(self.end, 'end', self.start)
+        if self.font is not None and not isinstance(self.font, str):
+            raise ValueError(f"서식 구간 font 는 문자열이어야 합니다: {self.font!r}")
+        if self.size is not None:
+            try:
+                size = float(self.size) if not isinstance(self.size, bool) else None
+            except (TypeError, ValueError):
+                size = None
+            if size is None or not 0 < size < 10000:
+                raise ValueError(f"서식 구간 size 는 0 보다 큰 숫자여야 합니다: {self.size!r}")
+            self.size = size
+        if self.color is not None:
+            if not isinstance(self.color, (list, tuple)) or len(self.color) != 3:
+                raise ValueError(f"서식 구간 color 는 (r, g, b) 여야 합니다: {self.color!r}")
+            self.color = tuple(_checked_int(channel, 'color', 0, 255) for channel in self.color)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StyleRun":
+        """계획 JSON 의 딕셔너리로 생성 (알 수 없는 키나 잘못된 값은 ValueError)"""
+        if not isinstance(data, dict):
+            raise ValueError(f"서식 구간은 객체여야 합니다: {data!r}")
+        unknown = set(data) - {item.name for item in fields(cls)}
+        if unknown:
+            raise ValueError(f"알 수 없는 서식 구간 키: {', '.join(sorted(map(str, unknown)))}")
+        return cls(**data)
+
+def _checked_int(value, name: str, minimum: int, maximum: Optional[int] = None) -> int:
+    """정수 값 검사 (정수로 떨어지는 실수/숫자 문자열은 정수로 바꿈)"""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"서식 구간 {name} 는 정수여야 합니다: {value!r}")
+    try:
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"서식 구간 {name} 는 정수여야 합니다: {value!r}") from None
+    if number < minimum or (maximum is not None and number > maximum):
+        raise ValueError(f"서식 구간 {name} 범위 오류: {value!r}")
+    return number
+
 @dataclass
 class SlideData:
     """슬라이드 데이터 구조"""
@@ -30,36 +115,155 @@ class SlideData:
     image_path: Optional[str] = None
     image_position: str = "right"
     image_size: str = "medium"
+    body_font_size: Optional[float] = None  # None 이면 레이아웃 기본 크기
+    image_box: Optional[Tuple[int, int, int, int]] = None  # (x, y, width, height), None 이면 위치 기본값
+    gallery: List[Tuple[str, Tuple[int, int, int, int]]] = field(default_factory=list)  # 다중 이미지 (경로, 영역)
+    notes: str = ""  # 발표자 노트
+    style_runs: List[StyleRun] = field(default_factory=list)  # 텍스트 서식 구간
+    library_slide: Optional[str] = None  # 슬라이드 라이브러리 이름 (있으면 만들지 않고 복제)
+    
+    @property
+    def has_annotations(self) -> bool:
+        """슬라이드를 모두 추가한 뒤 한 번에 적용할 노트/서식이 있는지"""
+        return bool(self.notes or self.style_runs)
+    
+    def to_json(self) -> str:
+        """한 줄 JSON (슬라이드 계획 저장/전송용)"""
+        data = vars(self)
+        if self.style_runs:
+            data = dict(data, style_runs=[vars(run) for run in self.style_runs])
+        return json.dumps(data, ensure_ascii=False)
+    
+    def approx_bytes(self) -> int:
+        """메모리 사용량 추정 (문자열은 글자당 최대 2바이트로 계산)"""
+        text_length = len(self.title) + len(self.content) + len(self.image_path or '') + len(self.notes)
+        text_length += sum(len(path) for path, _ in self.gallery)
+        return 200 + 2 * text_length + 100 * (len(self.gallery) + len(self.style_runs))
+    
+    @classmethod
+    def from_json(cls, line: str) -> "SlideData":
+        data = json.loads(line)
+        if data.get('image_box'):
+            data['image_box'] = tuple(data['image_box'])
+        data['gallery'] = [(path, tuple(box)) for path, box in data.get('gallery', [])]
+        data['style_runs'] = [StyleRun.from_dict(run) for run in data.get('style_runs', [])]
+        return cls(**data)
 
-class ContentAnalyzer:
-    """AI 기반 컨텐츠 분석기"""
+@dataclass
+class TextFeatures:
+    """문단 특징 벡터 (ContentAnalyzer.extract_features 가 한 번 계산하고 레이아웃 규칙이 재사용)"""
+    length: int = 0
+    line_count: int = 0
+    colon_count: int = 0
+    symbol_bullets: int = 0   # •·▪▫- 로 시작하는 줄
+    number_bullets: int = 0   # 1. 2. ...
+    letter_bullets: int = 0   # a. b. ...
+    hangul_chars: int = 0     # 한글 음절 수 (근사, ContentAnalyzer.extract_features 참고)
+    latin_chars: int = 0      # 영문자 수
+    blank: bool = False
     
-    @staticmethod
-    def detect_text_type(text: str) -> str:
-        """텍스트 유형 감지"""
-        if not text.strip():
+    @property
+    def bullet_count(self) -> int:
+        return self.symbol_bullets + self.number_bullets + self.letter_bullets
+    
+    @property
+    def script(self) -> str:
+        """주 문자 체계 힌트: korean, english, mixed, none"""
+        letters = self.hangul_chars + self.latin_chars
+        if not letters:
+            return 'none'
+        if self.hangul_chars >= letters * 0.8:
+            return 'korean'
+        if self.latin_chars >= letters * 0.8:
+            return 'english'
+        return 'mixed'
+    
+    @property
+    def text_type(self) -> str:
+        """텍스트 유형"""
+        if self.blank:
             return 'empty'
-        
-        # 불릿 포인트 감지
-        bullet_patterns = [r'^\s*[•·▪▫-]\s', r'^\s*\d+\.\s', r'^\s*[a-zA-Z]\.\s']
-        bullet_count = sum(len(re.findall(pattern, text, re.MULTILINE)) 
-                          for pattern in bullet_patterns)
-        
-        if bullet_count >= 3:
+        if self.bullet_count >= 3:
             return 'bullet_list'
-        elif len(text.split('\n')) <= 2 and len(text) < 100:
+        elif self.line_count <= 2 and self.length < 100:
             return 'title_subtitle'
-        elif len(text) > 500:
+        elif self.length > 500:
             return 'long_content'
-        elif text.count(':') >= 2:
+        elif self.colon_count >= 2:
             return 'definition_list'
         else:
             return 'standard_content'
     
+    def as_analysis(self, image_count: int = 0) -> Dict:
+        """LayoutSelector 규칙에 넘기는 분석 dict"""
+        return {
+            'text_length': self.length,
+            'text_type': self.text_type,
+            'image_count': image_count,
+            'line_count': self.line_count,
+            'colon_count': self.colon_count,
+            'bullet_count': self.bullet_count,
+            'symbol_bullets': self.symbol_bullets,
+            'number_bullets': self.number_bullets,
+            'letter_bullets': self.letter_bullets,
+            'script': self.script
+        }
+
+class ContentAnalyzer:
+    """AI 기반 컨텐츠 분석기"""
+    
+    # 줄 머리 불릿 (종류별 이름 그룹 하나의 패턴으로 한 번만 훑음)
+    # ^ + MULTILINE 대신 줄바꿈 리터럴로 시작해야 정규식 엔진이 줄 시작만 빠르게 찾아감
+    BULLET_PATTERN = re.compile(
+        r'\n\s*(?:(?P<symbol>[•·▪▫-])|(?P<number>\d+\.)|(?P<letter>[a-zA-Z]\.))(?=\s)')
+    
+    # UTF-8 에서 U+A000~U+DFFF 의 첫 바이트(0xEA~0xED) - 이 범위의 글자는 사실상 한글 음절뿐
+    _NOT_HANGUL_LEAD = bytes(b for b in range(256) if not 0xEA <= b <= 0xED)
+    _NOT_LATIN = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+    
+    @classmethod
+    def extract_features(cls, text: str) -> TextFeatures:
+        """문단 특징을 한 번에 계산
+        
+        파이썬 수준에서 글자마다 도는 대신 C 수준 스캔만 사용합니다. 불릿은 컴파일된 패턴
+        하나로 한 번 훑고, 줄/콜론 수는 str.count, 문자 체계는 UTF-8 바이트에서 한글 첫 바이트와
+        영문자를 bytes.translate 로 셉니다. 중간 목록(split 결과 등)을 만들지 않습니다.
+        """
+        if not text or text.isspace():
+            return TextFeatures(length=len(text), line_count=text.count('\n') + 1, blank=True)
+        
+        bullets = {'symbol': 0, 'number': 0, 'letter': 0}
+        for match in cls.BULLET_PATTERN.finditer('\n' + text):
+            bullets[match.lastgroup] += 1
+        
+        if text.isascii():
+            data = text.encode('ascii')
+            hangul_chars = 0
+        else:
+            data = text.encode('utf-8', 'surrogatepass')
+            hangul_chars = len(data.translate(None, cls._NOT_HANGUL_LEAD))
+        
+        return TextFeatures(
+            length=len(text),
+            line_count=text.count('\n') + 1,
+            colon_count=text.count(':'),
+            symbol_bullets=bullets['symbol'],
+            number_bullets=bullets['number'],
+            letter_bullets=bullets['letter'],
+            hangul_chars=hangul_chars,
+            latin_chars=len(data.translate(None, cls._NOT_LATIN))
+        )
+    
+    @classmethod
+    def detect_text_type(cls, text: str) -> str:
+        """텍스트 유형 감지"""
+        return cls.extract_features(text).text_type
+    
     @staticmethod
     def analyze_image(image_path: str) -> Dict:
         """이미지 분석"""
         try:
+            from PIL import Image
             with Image.open(image_path) as img:
                 width, height = img.size
                 aspect_ratio = width / height
@@ -108,7 +312,7 @@ class LayoutSelector:
         
         'image_focus': {
             'condition': lambda analysis: (
-                analysis['image_count'] >= 1 and 
+                analysis['image_count'] == 1 and 
                 analysis['text_length'] < 150
             ),
             'keynote_layout': 'Title, Bullets & Photo',
@@ -139,6 +343,22 @@ class LayoutSelector:
             'priority': 5
         }
     }
+    DEFAULT_LAYOUT_RULES = LAYOUT_RULES
+    
+    @classmethod
+    def configure(cls, rules: Optional[Dict] = None):
+        """config.json layout_rules 로 규칙 교체 (app_config.LayoutRule dict, None 이면 기본 규칙)
+        
+        dict 를 통째로 바꾸므로 선택 중인 다른 스레드는 이전 규칙이나 새 규칙 중 하나를 봅니다.
+        """
+        if rules is None:
+            cls.LAYOUT_RULES = cls.DEFAULT_LAYOUT_RULES
+            return
+        cls.LAYOUT_RULES = {
+            name: {'condition': rule.predicate, 'keynote_layout': rule.keynote_layout,
+                   'priority': rule.priority}
+            for name, rule in rules.items()
+        }
     
     @classmethod
     def select_optimal_layout(cls, analysis: Dict) -> Dict:
@@ -165,17 +385,222 @@ class LayoutSelector:
             'priority': 1
         }
 
+@dataclass
+class ScriptResult:
+    """AppleScript 실행 결과
+    
+    bool 로 평가하면 성공 여부이므로 기존 `if not controller.xxx(...)` 코드가 그대로 동작합니다.
+    """
+    success: bool
+    status: str = 'ok'                 # ok, script_error, osascript_error, timeout, launch_error
+    error_class: Optional[str] = None  # missing_layout, missing_object, permission, timeout, ...
+    message: str = ""                  # Keynote/osascript 오류 메시지
+    error_number: Optional[int] = None
+    output: str = ""
+    operation: str = ""
+    labels: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    attempts: int = 1
+    
+    def __bool__(self) -> bool:
+        return self.success
+    
+    def describe(self) -> str:
+        """사용자에게 보여줄 한 줄 설명"""
+        if self.success:
+            return f"{self.operation} 성공 ({self.latency:.2f}초)"
+        return (f"{self.operation} 실패 [{self.error_class}] {self.message} "
+                f"(시도 {self.attempts}회, {self.latency:.2f}초)")
+
+class ControllerTelemetry:
+    """컨트롤러 호출 결과 집계 (실행 단위로 JSON Lines 에 내보냄)"""
+    
+    # 집계 기준이 되는 레이블 (레이아웃/템플릿별로 느리거나 실패하는 항목 찾기)
+    GROUP_LABELS = ('layout', 'template')
+    # 레이블 값 종류가 이보다 많으면 나머지는 OTHER_LABEL 하나로 모음 (집계 크기 제한)
+    MAX_LABEL_VALUES = 1000
+    OTHER_LABEL = '(기타)'
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def record(self, result: ScriptResult):
+        """결과 기록 (결과 목록을 쌓지 않고 작업별, 레이아웃/템플릿별 집계에 바로 더함)"""
+        errors = {} if result.success else {result.error_class or 'unknown': 1}
+        with self._lock:
+            self.count += 1
+            groups = [self._summary['operations'].setdefault(result.operation, self._empty_stats())]
+            for label in self.GROUP_LABELS:
+                if label in result.labels:
+                    values, value = self._summary[label], result.labels[label]
+                    if value not in values and len(values) >= self.MAX_LABEL_VALUES:
+                        value = self.OTHER_LABEL
+                    groups.append(values.setdefault(value, self._empty_stats()))
+            for stats in groups:
+                self._add(stats, 1, 0 if result.success else 1, result.attempts,
+                          result.latency, result.latency, errors)
+    
+    def reset(self):
+        """기록 비우기 (새 실행 시작)"""
+        with self._lock:
+            self.count = 0
+            self._summary = {'operations': {}, **{label: {} for label in self.GROUP_LABELS}}
+    
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'count': 0, 'failures': 0, 'attempts': 0,
+                'latency_total': 0.0, 'latency_max': 0.0, 'errors': {}}
+    
+    @staticmethod
+    def _add(stats: Dict, count: int, failures: int, attempts: int,
+             latency_total: float, latency_max: float, errors: Dict[str, int]):
+        stats['count'] += count
+        stats['failures'] += failures
+        stats['attempts'] += attempts
+        stats['latency_total'] += latency_total
+        stats['latency_max'] = max(stats['latency_max'], latency_max)
+        for error_class, error_count in errors.items():
+            stats['errors'][error_class] = stats['errors'].get(error_class, 0) + error_count
+    
+    def summary(self) -> Dict:
+        """작업별, 레이아웃/템플릿별 집계 (복사본)"""
+        with self._lock:
+            return {group: {key: dict(stats, errors=dict(stats['errors']))
+                            for key, stats in groups.items()}
+                    for group, groups in self._summary.items()}
+    
+    def export_run(self, path: str, run_info: Optional[Dict] = None):
+        """이번 실행의 집계를 JSON Lines 파일에 한 줄로 추가"""
+        record = {'timestamp': time.time(), 'run': run_info or {}, 'summary': self.summary()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    
+    @classmethod
+    def aggregate(cls, path: str) -> Dict:
+        """여러 실행의 집계를 합침"""
+        total = {'runs': 0, 'operations': {}, **{label: {} for label in cls.GROUP_LABELS}}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                summary = json.loads(line)['summary']
+                total['runs'] += 1
+                for group in ('operations',) + cls.GROUP_LABELS:
+                    for key, stats in summary.get(group, {}).items():
+                        cls._add(total[group].setdefault(key, cls._empty_stats()),
+                                 stats['count'], stats['failures'], stats['attempts'],
+                                 stats['latency_total'], stats['latency_max'], stats['errors'])
+        return total
+
 class AppleScriptController:
     """AppleScript 컨트롤러"""
     
+    # 스크립트 안에서 잡은 오류는 "error|번호|메시지" 로 반환
+    ERROR_PREFIX = 'error|'
+    SCRIPT_TIMEOUT = 120
+    
+    # 작업별 → 오류 유형별 재시도 횟수 (없는 작업/유형은 재시도하지 않음)
+    # 시간 초과 전에 Keynote 가 첫 시도를 이미 적용했을 수 있으므로 다시 실행해도 결과가 같은
+    # 작업만 재시도함 (슬라이드/이미지 추가, 라이브러리 복제, 문서 생성은 재시도하면 중복됨)
+    TRANSIENT_RETRIES = {'timeout': 1, 'app_not_running': 1}
+    RETRY_POLICY = {'save': TRANSIENT_RETRIES, 'export': TRANSIENT_RETRIES,
+                    'annotate_slides': TRANSIENT_RETRIES}
+    
+    # Apple Event 오류 번호 → 오류 유형
+    ERROR_CLASSES = {
+        -1743: 'permission',       # Not authorized to send Apple events
+        -1719: 'permission',       # 보조 접근 권한 없음
+        -1712: 'timeout',          # AppleEvent timed out
+        -600: 'app_not_running',
+        -609: 'app_not_running',   # Connection is invalid
+        -43: 'file_not_found',
+        -1728: 'missing_object',   # Can't get ...
+        -10000: 'keynote_error'
+    }
+    
+    telemetry = ControllerTelemetry()
+    
+    @staticmethod
+    def _escape(text: str) -> str:
+        """AppleScript 문자열 리터럴 이스케이프 (백슬래시를 먼저 처리)"""
+        return text.replace('\\', '\\\\').replace('"', '\\"')
+    
+    @classmethod
+    def _classify_error(cls, error_number: Optional[int], message: str) -> str:
+        """오류 번호/메시지로 오류 유형 분류"""
+        error_class = cls.ERROR_CLASSES.get(error_number, 'unknown')
+        if error_class == 'missing_object' and 'layout' in message.lower():
+            return 'missing_layout'
+        return error_class
+    
+    @classmethod
+    def _parse_error(cls, text: str) -> Tuple[Optional[int], str]:
+        """osascript 오류 출력 "... execution error: 메시지 (-1728)" 파싱"""
+        match = re.search(r'execution error: (.*) \((-?\d+)\)\s*$', text.strip(), re.DOTALL)
+        if match:
+            return int(match.group(2)), match.group(1)
+        return None, text.strip()
+    
+    @classmethod
+    def _run_once(cls, script: str) -> ScriptResult:
+        import subprocess
+        try:
+            result = subprocess.run(['osascript', '-e', script], 
+                                  capture_output=True, text=True, timeout=cls.SCRIPT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return ScriptResult(False, 'timeout', 'timeout',
+                                f"{cls.SCRIPT_TIMEOUT}초 안에 응답 없음")
+        except OSError as e:
+            return ScriptResult(False, 'launch_error', 'launch_error', str(e))
+        
+        output = result.stdout.strip()
+        if result.returncode != 0:
+            error_number, message = cls._parse_error(result.stderr)
+            return ScriptResult(False, 'osascript_error',
+                                cls._classify_error(error_number, message),
+                                message, error_number, output)
+        
+        if output.startswith(cls.ERROR_PREFIX):
+            _, number, message = output.split('|', 2)
+            error_number = int(number) if number.lstrip('-').isdigit() else None
+            return ScriptResult(False, 'script_error',
+                                cls._classify_error(error_number, message),
+                                message, error_number, output)
+        
+        return ScriptResult(True, output=output)
+    
+    @classmethod
+    def run_script(cls, operation: str, script: str,
+                   labels: Optional[Dict[str, str]] = None) -> ScriptResult:
+        """스크립트 실행 (RETRY_POLICY 에 따라 재시도하고 결과를 telemetry 에 기록)"""
+        start_time = time.perf_counter()
+        retries = cls.RETRY_POLICY.get(operation, {})
+        attempts = 0
+        while True:
+            attempts += 1
+            result = cls._run_once(script)
+            if result.success or attempts > retries.get(result.error_class, 0):
+                break
+        
+        result.operation = operation
+        result.labels = labels or {}
+        result.latency = time.perf_counter() - start_time
+        result.attempts = attempts
+        cls.telemetry.record(result)
+        return result
+    
     @staticmethod
-    def create_presentation_from_template(template_path: str, output_path: str) -> bool:
+    def create_presentation_from_template(template_path: str, output_path: str) -> ScriptResult:
         """템플릿에서 프레젠테이션 생성"""
         script = f'''
         tell application "Keynote"
             activate
             try
-                open POSIX file "{template_path}"
+                open POSIX file "{AppleScriptController._escape(template_path)}"
                 set currentPres to front document
                 
                 -- 기존 슬라이드 삭제 (첫 번째 제외)
@@ -184,25 +609,27 @@ class AppleScriptController:
                 end repeat
                 
                 return true
-            on error
-                return false
+            on error errMsg number errNum
+                return "error|" & errNum & "|" & errMsg
             end try
         end tell
         '''
         
-        try:
-            result = subprocess.run(['osascript', '-e', script], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return AppleScriptController.run_script(
+            'create_presentation', script, {'template': template_path})
     
     @staticmethod
-    def add_slide_with_layout(slide_data: SlideData) -> bool:
+    def add_slide_with_layout(slide_data: SlideData) -> ScriptResult:
         """레이아웃으로 슬라이드 추가"""
         # 특수 문자 이스케이프
-        title = slide_data.title.replace('"', '\\"').replace('\\', '\\\\')
-        content = slide_data.content.replace('"', '\\"').replace('\\', '\\\\')
+        title = AppleScriptController._escape(slide_data.title)
+        content = AppleScriptController._escape(slide_data.content)
+        
+        # 텍스트 맞춤 단계에서 줄인 본문 글꼴 크기
+        font_size_line = ''
+        if slide_data.body_font_size:
+            font_size_line = (f'set size of object text of text item 2 of newSlide '
+                              f'to {slide_data.body_font_size}')
         
         script = f'''
         tell application "Keynote"
@@ -221,35 +648,32 @@ class AppleScriptController:
                     if "{content}" is not "" then
                         try
                             set object text of text item 2 of newSlide to "{content}"
+                            {font_size_line}
                         end try
                     end if
                     
                     return true
-                on error
-                    return false
+                on error errMsg number errNum
+                    return "error|" & errNum & "|" & errMsg
                 end try
             end tell
         end tell
         '''
         
-        try:
-            result = subprocess.run(['osascript', '-e', script], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return AppleScriptController.run_script(
+            'add_slide', script, {'layout': slide_data.layout})
     
     @staticmethod
-    def add_image_to_current_slide(image_path: str, position: str = "right") -> bool:
-        """현재 슬라이드에 이미지 추가"""
-        script = f'''
-        tell application "Keynote"
-            tell front document
-                try
-                    set currentSlide to slide -1
-                    set imageFile to POSIX file "{image_path}"
-                    set newImage to make new image at currentSlide with properties {{file:imageFile}}
-                    
+    def add_image_to_current_slide(image_path: str, position: str = "right",
+                                   box: Optional[Tuple[int, int, int, int]] = None) -> ScriptResult:
+        """현재 슬라이드에 이미지 추가 (box 가 있으면 그 영역에, 없으면 position 기본 위치에)"""
+        if box:
+            x, y, width, height = box
+            placement = f'''
+                    set position of newImage to {{{x}, {y}}}
+                    set size of newImage to {{{width}, {height}}}'''
+        else:
+            placement = f'''
                     -- 이미지 위치 조정 (간단 버전)
                     if "{position}" is "right" then
                         set position of newImage to {{400, 150}}
@@ -257,62 +681,660 @@ class AppleScriptController:
                     else if "{position}" is "center" then
                         set position of newImage to {{250, 200}}
                         set size of newImage to {{400, 300}}
-                    end if
+                    end if'''
+        
+        script = f'''
+        tell application "Keynote"
+            tell front document
+                try
+                    set currentSlide to slide -1
+                    set imageFile to POSIX file "{AppleScriptController._escape(image_path)}"
+                    set newImage to make new image at currentSlide with properties {{file:imageFile}}
+                    {placement}
                     
                     return true
-                on error
-                    return false
+                on error errMsg number errNum
+                    return "error|" & errNum & "|" & errMsg
                 end try
             end tell
         end tell
         '''
         
-        try:
-            result = subprocess.run(['osascript', '-e', script], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return AppleScriptController.run_script(
+            'add_image', script, {'position': position})
+    
+    @staticmethod
+    def add_images_to_current_slide(images: List[Tuple[str, Tuple[int, int, int, int]]]) -> ScriptResult:
+        """현재 슬라이드에 여러 이미지를 한 번에 추가 (이미지마다 (경로, (x, y, width, height)))"""
+        image_lines = []
+        for image_path, (x, y, width, height) in images:
+            image_lines.append(f'''
+                    set newImage to make new image at currentSlide with properties {{file:POSIX file "{AppleScriptController._escape(image_path)}"}}
+                    set position of newImage to {{{x}, {y}}}
+                    set size of newImage to {{{width}, {height}}}''')
+        
+        script = f'''
+        tell application "Keynote"
+            tell front document
+                try
+                    set currentSlide to slide -1
+                    {''.join(image_lines)}
+                    
+                    return true
+                on error errMsg number errNum
+                    return "error|" & errNum & "|" & errMsg
+                end try
+            end tell
+        end tell
+        '''
+        
+        return AppleScriptController.run_script(
+            'add_images', script, {'count': str(len(images))})
     
     @staticmethod
-    def save_presentation(output_path: str) -> bool:
+    def import_library_slides(library_path: str, slide_numbers: List[int]) -> ScriptResult:
+        """라이브러리 문서의 슬라이드들을 현재 문서 끝에 한 번에 복제
+        
+        라이브러리 문서를 열어 복제한 뒤 닫으므로 이후 스크립트의 front document 는 그대로입니다.
+        output 은 슬라이드마다 성공 1 / 실패 0 을 쉼표로 이은 값입니다.
+        """
+        numbers = ', '.join(str(number) for number in slide_numbers)
+        script = f'''
+        tell application "Keynote"
+            try
+                set targetDoc to front document
+                set libraryDoc to open POSIX file "{AppleScriptController._escape(library_path)}"
+                set flags to {{}}
+                repeat with slideNumber in {{{numbers}}}
+                    try
+                        duplicate slide (slideNumber as integer) of libraryDoc to end of slides of targetDoc
+                        set end of flags to "1"
+                    on error
+                        set end of flags to "0"
+                    end try
+                end repeat
+                close libraryDoc saving no
+                set AppleScript's text item delimiters to ","
+                return flags as text
+            on error errMsg number errNum
+                return "error|" & errNum & "|" & errMsg
+            end try
+        end tell
+        '''
+        
+        return AppleScriptController.run_script(
+            'import_library_slides', script, {'count': str(len(slide_numbers))})
+    
+    # osascript -e 인자 길이 제한을 넘지 않도록 노트/서식 스크립트 하나의 최대 크기 (바이트)
+    ANNOTATION_SCRIPT_BYTES = 256 * 1024
+    
+    @staticmethod
+    def _style_run_lines(run: StyleRun) -> List[str]:
+        """서식 구간 → AppleScript 문장 (숫자는 다시 숫자로 바꿔 넣고 글꼴 이름은 이스케이프)"""
+        target = f'object text of text item {int(run.text_item)}'
+        if run.start > 1 or run.end is not None:
+            end = int(run.end) if run.end is not None else -1
+            target = f'characters {int(run.start)} thru {end} of {target}'
+        lines = []
+        if run.font:
+            lines.append(f'set font of {target} to "{AppleScriptController._escape(str(run.font))}"')
+        if run.size:
+            lines.append(f'set size of {target} to {float(run.size):g}')
+        if run.color:
+            # Keynote 색상은 채널당 0~65535
+            red, green, blue = (min(max(int(channel), 0), 255) * 257 for channel in run.color)
+            lines.append(f'set color of {target} to {{{red}, {green}, {blue}}}')
+        return lines
+    
+    @staticmethod
+    def annotate_slides(annotations: List[Tuple[int, SlideData]], added_count: int) -> ScriptResult:
+        """이번에 추가한 슬라이드들의 발표자 노트와 텍스트 서식을 한 번에 적용
+        
+        annotations 는 (이번 실행에서 추가된 순서 1부터, 슬라이드) 목록이고, added_count 는
+        이번 실행에서 추가한 슬라이드 수입니다 (템플릿에 남긴 슬라이드 뒤에 붙어 있음).
+        슬라이드마다 오류를 따로 잡아 나머지는 계속 적용하고, 실패한 슬라이드 수를 output 으로
+        반환합니다. 스크립트가 ANNOTATION_SCRIPT_BYTES 를 넘으면 그 크기씩 나눠 실행합니다.
+        """
+        escape = AppleScriptController._escape
+        blocks = []
+        for position, slide in annotations:
+            lines = []
+            if slide.notes:
+                lines.append(f'set presenter notes to "{escape(slide.notes)}"')
+            for run in slide.style_runs:
+                lines.extend(AppleScriptController._style_run_lines(run))
+            if not lines:
+                continue
+            body = '\n                            '.join(lines)
+            blocks.append(f'''
+                    try
+                        tell slide (baseIndex + {position})
+                            {body}
+                        end tell
+                    on error
+                        set failedSlides to failedSlides + 1
+                    end try''')
+        
+        chunks, current, size = [], [], 0
+        for block in blocks:
+            block_size = len(block.encode('utf-8'))
+            if current and size + block_size > AppleScriptController.ANNOTATION_SCRIPT_BYTES:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(block)
+            size += block_size
+        if current:
+            chunks.append(current)
+        
+        result = ScriptResult(True, operation='annotate_slides', output='0')
+        failed = 0
+        for chunk in chunks:
+            script = f'''
+        tell application "Keynote"
+            tell front document
+                try
+                    set baseIndex to (count of slides) - {added_count}
+                    set failedSlides to 0
+                    {''.join(chunk)}
+                    
+                    return failedSlides as text
+                on error errMsg number errNum
+                    return "error|" & errNum & "|" & errMsg
+                end try
+            end tell
+        end tell
+        '''
+            result = AppleScriptController.run_script(
+                'annotate_slides', script, {'slides': str(len(chunk))})
+            if not result:
+                return result
+            failed += int(result.output) if result.output.isdigit() else 0
+        result.output = str(failed)
+        return result
+    
+    @staticmethod
+    def save_presentation(output_path: str) -> ScriptResult:
         """프레젠테이션 저장"""
         script = f'''
         tell application "Keynote"
             tell front document
                 try
-                    save in POSIX file "{output_path}"
+                    save in POSIX file "{AppleScriptController._escape(output_path)}"
                     return true
-                on error
-                    return false
+                on error errMsg number errNum
+                    return "error|" & errNum & "|" & errMsg
                 end try
             end tell
         end tell
         '''
         
-        try:
-            result = subprocess.run(['osascript', '-e', script], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except Exception:
-            return False
+        return AppleScriptController.run_script('save', script)
+
+    # 내보내기 형식 → Keynote export 형식 이름
+    EXPORT_FORMATS = {
+        'pdf': 'PDF',
+        'pptx': 'Microsoft PowerPoint'
+    }
+
+    @staticmethod
+    def export_presentation(exports: Dict[str, str], source_path: Optional[str] = None) -> ScriptResult:
+        """여러 형식으로 한 번에 내보내기
+
+        exports 는 {형식: 출력 경로} 입니다. source_path 가 없으면 현재 열린
+        front document 를 내보내고, 있으면 한 번만 열어 모든 형식을 내보낸 뒤 닫습니다.
+        """
+        escape = AppleScriptController._escape
+        export_lines = []
+        for export_format, output_path in exports.items():
+            keynote_format = AppleScriptController.EXPORT_FORMATS[export_format]
+            export_lines.append(
+                f'export targetDoc to POSIX file "{escape(output_path)}" as {keynote_format}')
+        export_block = '\n                '.join(export_lines)
+
+        if source_path:
+            open_block = f'set targetDoc to open POSIX file "{escape(source_path)}"'
+            close_block = 'close targetDoc saving no'
+        else:
+            open_block = 'set targetDoc to front document'
+            close_block = ''
+
+        script = f'''
+        tell application "Keynote"
+            try
+                {open_block}
+                {export_block}
+                {close_block}
+                return true
+            on error errMsg number errNum
+                return "error|" & errNum & "|" & errMsg
+            end try
+        end tell
+        '''
+
+        return AppleScriptController.run_script(
+            'export', script, {'formats': ','.join(sorted(exports))})
+
+def create_slide_structure(text: str, images: List[Dict],
+                           text_fitter: Optional['TextFitter'] = None,
+                           image_assigner: Optional['ImageAssigner'] = None,
+                           slide_packer: Optional['SlidePacker'] = None,
+                           limits: Optional['ResourceLimits'] = None) -> List[SlideData]:
+    """슬라이드 구조 생성 (GUI 없이도 사용)
+    
+    images 는 GUI 의 self.images 와 같은 {'path', 'name'} 목록입니다.
+    이미지는 문단 순서대로가 아니라 ImageAssigner 의 매칭 결과로 배정하고,
+    배정되지 않은 이미지는 문단별로 모아 다중 이미지 슬라이드로 배치합니다.
+    limits 를 주면 슬라이드 수를 제한하고(넘으면 ResourceLimitError), 계획이
+    메모리 한도를 넘으면 디스크로 내려보내는 SpillList 로 반환합니다.
+    """
+    from image_assignment import ImageAssigner
+    from image_packing import SlidePacker
+    from resource_limits import ResourceLimitError, SpillList
+    from text_fitting import TextFitter
+    from text_segmentation import iter_blocks, split_title
+    
+    text_fitter = text_fitter or TextFitter()
+    image_assigner = image_assigner or ImageAssigner(
+        text_fitter, analyze_image=ContentAnalyzer.analyze_image)
+    slide_packer = slide_packer or SlidePacker()
+    if limits:
+        if len(images) > limits.max_images:
+            raise ResourceLimitError(f"이미지가 {len(images)}개로 한도 {limits.max_images}개를 넘습니다")
+        slides = SpillList(limits.plan_memory_bytes, SlideData.to_json, SlideData.from_json,
+                           limits.make_spill_dir(), SlideData.approx_bytes)
+    else:
+        slides = []
+    
+    def add_slides(new_slides: List[SlideData]):
+        # 자리표시자를 넘치는 문단은 작은 글꼴로 맞추거나 이어지는 슬라이드로 분할
+        slides.extend(text_fitter.fit_slides(new_slides))
+        if limits and len(slides) > limits.max_slides:
+            if isinstance(slides, SpillList):
+                slides.close()
+            raise ResourceLimitError(
+                f"슬라이드가 한도 {limits.max_slides}장을 넘습니다 (config.json resource_limits)")
+    
+    # 제목/문단 블록으로 흘려 읽고, 첫 원문 문단(제목 줄로 나뉜 블록 포함)은 제목 슬라이드로
+    blocks = iter_blocks(text)
+    title_blocks = list(itertools.islice(blocks, 1))
+    for block in blocks:
+        if not block.joined:
+            blocks = itertools.chain([block], blocks)
+            break
+        title_blocks.append(block)
+    
+    add_slides([SlideData(
+        slide_type='title',
+        layout='Title & Subtitle',
+        title=split_title(title_blocks[0].text)[0] if title_blocks else '',
+        content='AI Assistant가 생성한 프레젠테이션'
+    )])
+    
+    # 내용 슬라이드들 (문단 원문은 보관하지 않고 특징 벡터만 기록)
+    # 제목 블록은 바로 뒤 문단의 슬라이드 제목이 되고, 뒤에 문단이 없으면 제목만 있는 슬라이드
+    # "[[이름]]" 문단은 슬라이드 라이브러리 참조로, 그 위치(뒤따르는 문단 번호)만 기록
+    parts = []
+    library_refs: Dict[int, List[str]] = {}
+    
+    def collect_parts(blocks):
+        heading = None
+        for block in blocks:
+            if block.kind == 'heading':
+                if heading is not None:
+                    parts.append(_paragraph_part('', heading))
+                heading = block.text
+                continue
+            match = LIBRARY_PATTERN.fullmatch(block.text)
+            if match:
+                if heading is not None:
+                    parts.append(_paragraph_part('', heading))
+                    heading = None
+                library_refs.setdefault(len(parts), []).append(match.group(1))
+            else:
+                parts.append(_paragraph_part(block.text, heading))
+                heading = None
+        if heading is not None:
+            parts.append(_paragraph_part('', heading))
+    
+    collect_parts(blocks)
+    if not parts and not library_refs:
+        collect_parts(title_blocks)
+    
+    def add_library_slides(index: int):
+        add_slides([SlideData(slide_type='library', layout=LIBRARY_LAYOUT, title=name,
+                              library_slide=name)
+                    for name in library_refs.get(index, ())])
+    
+    # 모든 이미지를 한 번에 분석해 문단과 매칭하고, 남는 이미지는 문단별로 모음
+    assignment = image_assigner.assign([content for _, _, content, _ in parts], images)
+    image_indexes = {id(image): index for index, image in enumerate(images)}
+    groups = slide_packer.distribute(
+        len(parts), len(images),
+        {i: image_indexes[id(placed['image'])] for i, placed in assignment.items()})
+    analyses = image_assigner.analyze_images([image['path'] for image in images])
+    
+    for i, (features, title, content, notes) in enumerate(parts):
+        add_library_slides(i)
+        placed = assignment.get(i)
+        
+        # AI 분석으로 레이아웃 결정 (문단 특징 벡터 재사용)
+        analysis = features.as_analysis(image_count=len(groups[i]))
+        
+        if len(groups[i]) > 1:
+            add_slides(_pack_paragraph_images(
+                title, content, analysis, placed,
+                [(images[j]['path'], analyses[j]) for j in groups[i]],
+                text_fitter, slide_packer, notes))
+            continue
+        
+        layout_info = LayoutSelector.select_optimal_layout(analysis)
+        
+        slide = SlideData(
+            slide_type='content',
+            layout=layout_info['keynote_layout'],
+            title=title,
+            content=content,
+            image_path=placed['image']['path'] if placed else None,
+            image_position=placed['position'] if placed else 'right',
+            image_size=placed['size'] if placed else 'medium',
+            image_box=placed['box'] if placed else None,
+            notes=notes
+        )
+        
+        add_slides([slide])
+    
+    add_library_slides(len(parts))
+    return slides
+
+# 문단 전체가 "[[이름]]" 이면 슬라이드 라이브러리의 미리 만든 슬라이드를 복제
+LIBRARY_PATTERN = re.compile(r'\[\[\s*([^\[\]\n]+?)\s*\]\]')
+LIBRARY_LAYOUT = 'Library'  # 라이브러리 슬라이드는 원래 레이아웃을 그대로 가져옴
+
+# 줄 맨 앞이 "노트:" 또는 "Notes:" 인 줄은 본문이 아니라 발표자 노트
+# ("Note: ...", "메모: ..." 처럼 본문에 흔히 쓰는 줄은 그대로 본문)
+NOTES_PATTERN = re.compile(r'^(?:노트|Notes):[ \t]*(.*)(?:\n|$)', re.MULTILINE)
+
+def _split_notes(paragraph: str) -> Tuple[str, str]:
+    """문단 → (노트 줄을 뺀 문단, 발표자 노트) - 노트만 있는 문단은 그대로 본문으로 둠"""
+    if ':' not in paragraph:
+        return paragraph, ''
+    notes = NOTES_PATTERN.findall(paragraph)
+    if not notes:
+        return paragraph, ''
+    body = NOTES_PATTERN.sub('', paragraph).strip('\n')
+    if not body.strip():
+        return paragraph, ''
+    return body, '\n'.join(notes)
+
+def _paragraph_part(paragraph: str, heading: Optional[str] = None
+                    ) -> Tuple[TextFeatures, str, str, str]:
+    """문단 → (특징 벡터, 제목, 본문, 발표자 노트)
+    
+    heading 이 있으면 제목이고 문단 전체가 본문이며, 없으면 문단 첫 줄(길면 첫 문장)이 제목입니다.
+    """
+    from text_segmentation import split_title
+    
+    paragraph, notes = _split_notes(paragraph)
+    if heading is None:
+        title, content = split_title(paragraph)
+        return ContentAnalyzer.extract_features(paragraph), title, content, notes
+    title = split_title(heading)[0]
+    body = f"{heading}\n{paragraph}" if paragraph else heading
+    return ContentAnalyzer.extract_features(body), title, paragraph, notes
+
+def _pack_paragraph_images(title: str, content: str, analysis: Dict, placed: Optional[Dict],
+                           images: List[Tuple[str, Dict]], text_fitter: 'TextFitter',
+                           slide_packer: 'SlidePacker', notes: str = '') -> List[SlideData]:
+    """이미지가 여러 장인 문단을 다중 이미지 슬라이드로 나눔
+    
+    images 는 문단에 모인 (경로, 이미지 분석) 목록이고 placed 는 배정기가 고른 대표 이미지입니다.
+    다중 이미지 레이아웃이 선택되고 본문이 그 레이아웃에 들어가면 첫 슬라이드부터 이미지를 묶고,
+    아니면 본문 슬라이드에 대표 이미지 한 장을 두고 나머지를 이어지는 슬라이드에 묶습니다.
+    발표자 노트는 첫 슬라이드에만 둡니다.
+    """
+    from image_packing import MULTI_IMAGE_LAYOUT
+    from text_fitting import CONTINUATION_SUFFIX
+    
+    slides = []
+    layout = LayoutSelector.select_optimal_layout(analysis)['keynote_layout']
+    if layout != MULTI_IMAGE_LAYOUT or not text_fitter.fits(content, MULTI_IMAGE_LAYOUT):
+        single = dict(analysis, image_count=1 if placed else 0)
+        slides.append(SlideData(
+            slide_type='content',
+            layout=LayoutSelector.select_optimal_layout(single)['keynote_layout'],
+            title=title,
+            content=content,
+            image_path=placed['image']['path'] if placed else None,
+            image_position=placed['position'] if placed else 'right',
+            image_size=placed['size'] if placed else 'medium',
+            image_box=placed['box'] if placed else None,
+            notes=notes
+        ))
+        if placed:
+            rest = [image for image in images if image[0] != placed['image']['path']]
+            images = rest if len(rest) < len(images) else images[1:]
+    
+    for indexes, boxes in slide_packer.group([image_analysis.get('aspect_ratio', 1.0)
+                                              for _, image_analysis in images]):
+        slides.append(SlideData(
+            slide_type='content',
+            layout=MULTI_IMAGE_LAYOUT,
+            title=title if not slides else title + CONTINUATION_SUFFIX,
+            content=content if not slides else '',
+            gallery=[(images[index][0], box) for index, box in zip(indexes, boxes)],
+            notes=notes if not slides else ''
+        ))
+    return slides
+
+def generate_presentation(template_path: str, output_path: str, slides: List[SlideData],
+                          controller=AppleScriptController,
+                          progress: Optional[Callable[[str], None]] = None,
+                          slide_delay: float = 0.5, library=None) -> ScriptResult:
+    """템플릿으로 프레젠테이션을 만들고 슬라이드를 추가한 뒤 저장
+    
+    controller 는 AppleScriptController 와 같은 메서드를 가진 객체이며,
+    render_backend.ControllerBackend 로 감싸 render_presentation 으로 실행합니다.
+    library 는 라이브러리 참조 슬라이드를 복제해 올 slide_library.SlideLibrary 입니다.
+    템플릿 열기/저장에 실패하면 해당 ScriptResult 를, 성공하면 저장 결과를 반환합니다.
+    슬라이드/이미지 추가 실패는 기록만 하고 계속 진행합니다.
+    """
+    from render_backend import ControllerBackend, render_presentation
+    return render_presentation(ControllerBackend(controller, slide_delay),
+                               template_path, output_path, slides, progress, library)
 
 class KeynoteGenerator:
     """메인 Keynote 생성기 GUI"""
     
+    PREVIEW_THUMBNAIL_SIZE = (192, 144)
+    PREVIEW_MAX_SLIDES = 200
+    
+    # 템플릿 선택 창 격자 (칸 크기에 썸네일 + 이름)
+    PICKER_THUMBNAIL_SIZE = (160, 120)
+    PICKER_CELL_SIZE = (180, 150)
+    PICKER_COLUMNS = 4
+    PICKER_VISIBLE_ROWS = 3
+    
+    # 분석 → 생성처럼 같은 입력을 다시 계획하지 않도록 최근 계획 보관 수
+    PLAN_CACHE_SIZE = 4
+    
     def __init__(self, root):
+        _load_tkinter()
+        from app_config import AppConfig
+        from image_assignment import ImageAssigner
+        from image_packing import SlidePacker
+        from resource_limits import ResourceLimits
+        from text_fitting import TextFitter
         self.root = root
         self.root.title("🍎 Keynote 자동 생성기 v1.0")
         self.root.geometry("1200x900")
         self.root.configure(bg='#f0f0f0')
         
-        # 데이터 초기화
+        # 데이터 초기화 (설정/템플릿은 첫 화면 이후 _load_settings 에서 로드)
         self.images = []
-        self.templates = self._load_templates()
-        self.progress_var = tk.StringVar(value="준비 완료")
+        self.image_paths = set()  # 중복 확인용
+        self.limits = ResourceLimits()
+        self.config = None
+        self.config_store = None
+        self.app_config = AppConfig.parse({})  # config.json 을 읽기 전에는 기본값
+        self.templates = {}
+        self.progress_var = tk.StringVar(value="불러오는 중...")
+        self.startup_times = {}
+        
+        # 글자 폭 테이블과 이미지 분석 결과는 실행 중에 계속 재사용
+        self.text_fitter = TextFitter()
+        self.image_assigner = ImageAssigner(self.text_fitter,
+                                            analyze_image=ContentAnalyzer.analyze_image)
+        self.slide_packer = SlidePacker()
+        
+        # (텍스트, 이미지 파일 상태) → 슬라이드 계획 (레이아웃 규칙/이미지 위치/한도가 바뀌면 비움)
+        self.plan_cache = OrderedDict()
+        self.plan_cache_lock = threading.Lock()
+        
+        # 미리보기 렌더러, 렌더 백엔드, 내보내기 큐는 처음 사용할 때 생성
+        self.preview_renderer = None
+        self.preview_photos = []
+        self.render_backend = None
+        self.output_sink = None
+        self.export_queue = None
+        self.template_catalog = None
+        self.template_picker = None
         
         self._setup_styles()
         self._create_widgets()
+        self.startup_times['widgets'] = time.perf_counter() - _PROCESS_START
+        
+        self.root.after_idle(self._load_settings)
+    
+    def _load_settings(self):
+        """첫 화면 표시 후 설정과 템플릿 목록 로드"""
+        self.startup_times['first_paint'] = time.perf_counter() - _PROCESS_START
+        from resource_limits import ResourceLimits
+        
+        self.config = self._load_config()
+        self.templates = self._load_templates()
+        self.limits = ResourceLimits.from_config(self.config)
+        LayoutSelector.configure(self.app_config.effective_layout_rules)
+        if self.app_config.image.positions:
+            self.image_assigner.positions = self.app_config.image.positions
+        self._apply_ui_settings(self.app_config.ui, initial=True)
+        
+        self._refresh_template_list()
+        
+        self.progress_var.set("준비 완료")
+        self.startup_times['settings_loaded'] = time.perf_counter() - _PROCESS_START
+        
+        # config.json 변경 감시 (Tk 위젯을 갱신하므로 메인 스레드에서 확인)
+        from app_config import WATCH_INTERVAL
+        self.root.after(int(WATCH_INTERVAL * 1000), self._poll_config)
+    
+    def _poll_config(self):
+        """config.json 이 바뀌었으면 다시 읽기 (변경 반영은 _on_config_change)"""
+        self.config_store.check()
+        from app_config import WATCH_INTERVAL
+        self.root.after(int(WATCH_INTERVAL * 1000), self._poll_config)
+    
+    def _on_config_change(self, config, change):
+        """바뀐 설정에 의존하는 캐시만 무효화하고 다시 적용"""
+        self.app_config, self.config = config, config.raw
+        applied = []
+        
+        if change.templates:
+            self._reload_templates(change.templates)
+            applied.append(f"템플릿 {len(change.templates)}개")
+        if change.rules_changed:
+            LayoutSelector.configure(config.effective_layout_rules)
+            applied.append("레이아웃 규칙")
+        if change.positions_changed:
+            # 미리보기 캐시 키에 위치가 들어가므로 영향받는 슬라이드만 다시 그려짐
+            from image_assignment import DEFAULT_IMAGE_POSITIONS
+            self.image_assigner.positions = config.image.positions or DEFAULT_IMAGE_POSITIONS
+            if self.preview_renderer is not None:
+                self.preview_renderer.image_positions = self.image_assigner.positions
+            applied.append("이미지 위치")
+        if change.limits_changed:
+            from resource_limits import ResourceLimits
+            self.limits = ResourceLimits.from_config(config.raw)
+            applied.append("자원 한도")
+        if change.plans_changed:
+            with self.plan_cache_lock:
+                self.plan_cache.clear()
+        
+        if 'output' in change.sections:
+            self.output_sink = None
+            applied.append("출력 폴더")
+        if 'app_settings' in change.sections:
+            backend = self.render_backend
+            if backend is not None and getattr(backend, 'name', None) != config.app.render_backend:
+                # 내보내기 큐는 백엔드의 export 를 쓰므로 함께 새로 만듦
+                self.render_backend = self.export_queue = None
+                applied.append("렌더 백엔드")
+            catalog = self.template_catalog
+            if catalog is not None and catalog.cache_dir != self._thumbnail_cache_dir():
+                catalog.shutdown()
+                self.template_catalog = None
+        if 'ui_settings' in change.sections:
+            self._apply_ui_settings(config.ui)
+        
+        self.progress_var.set("설정 다시 읽음" + (f": {', '.join(applied)}" if applied else ""))
+    
+    def _apply_ui_settings(self, ui, initial: bool = False):
+        """ui_settings 적용 (창 크기는 시작할 때만 - 사용자가 바꾼 크기를 덮어쓰지 않음)"""
+        if initial:
+            self.root.geometry(f"{ui.window_width}x{ui.window_height}")
+        self.text_area.configure(font=('SF Pro Display', ui.font_size))
+    
+    def _refresh_template_list(self):
+        """템플릿 콤보박스 갱신 (선택한 템플릿이 남아 있으면 유지)"""
+        template_names = list(self.templates.keys())
+        self.template_combo.configure(values=template_names)
+        if not template_names:
+            self.template_var.set("")
+            self.template_desc.config(text="템플릿 없음")
+            return
+        if self.template_var.get() not in self.templates:
+            self.template_var.set(template_names[0])
+        self.on_template_change(None)
+    
+    def _reload_templates(self, template_ids):
+        """바뀐 템플릿만 썸네일 대기 작업을 버리고 목록 갱신"""
+        def paths(templates):
+            return {info['path'] for info in templates.values()
+                    if info.get('template_id') in template_ids}
+        
+        old_paths = paths(self.templates)
+        self.templates = self._load_templates()
+        if self.template_catalog is not None:
+            self.template_catalog.forget(old_paths | paths(self.templates))
+        self._refresh_template_list()
+        
+        # 열려 있는 선택 창은 칸 배치가 바뀌므로 다시 엶 (바뀌지 않은 썸네일은 캐시에서 바로 읽음)
+        if self.template_picker and self.template_picker['window'].winfo_exists():
+            self.template_picker['window'].destroy()
+            self.template_picker = None
+            self.open_template_picker()
+    
+    def _get_preview_renderer(self):
+        """미리보기 렌더러 (PIL 을 사용하므로 처음 사용할 때 생성)"""
+        if self.preview_renderer is None:
+            from slide_preview import SlidePreviewRenderer
+            self.preview_renderer = SlidePreviewRenderer(
+                self.app_config.image.positions or None, self.PREVIEW_THUMBNAIL_SIZE,
+                cache_bytes=self.limits.image_cache_bytes, spill_dir=self.limits.spill_dir)
+        return self.preview_renderer
+    
+    def _get_output_sink(self):
+        """config.json output 항목의 출력 폴더 관리자"""
+        if self.output_sink is None:
+            from output_sink import OutputSink
+            self.output_sink = OutputSink.from_config(self.config)
+        return self.output_sink
+    
+    def _get_render_backend(self):
+        """config.json app_settings.render_backend 로 고른 렌더 백엔드 (기본 applescript)"""
+        if self.render_backend is None:
+            from render_backend import create_backend
+            self.render_backend = create_backend(self.app_config.app.render_backend)
+        return self.render_backend
         
     def _setup_styles(self):
         """스타일 설정"""
@@ -324,31 +1346,34 @@ class KeynoteGenerator:
         style.configure('Header.TLabel', font=('SF Pro Display', 14, 'bold'))
         style.configure('Generate.TButton', font=('SF Pro Display', 12, 'bold'))
         
+    def _load_config(self) -> Optional[Dict]:
+        """config.json 로드 및 검증 (실패 시 None - 파일을 고치면 변경 감시가 다시 읽음)"""
+        from app_config import ConfigError, config_store
+        if self.config_store is None:
+            self.config_store = config_store()
+            self.config_store.subscribe(self._on_config_change)
+        try:
+            self.app_config = self.config_store.get()
+        except (OSError, ConfigError) as e:
+            print(f"config.json 로딩 실패: {e}")
+            return None
+        return self.app_config.raw
+    
     def _load_templates(self) -> Dict:
         """config.json에서 템플릿 로드"""
         templates = {}
         
-        try:
-            # config.json에서 템플릿 정보 읽기
-            with open('config.json', 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            config_templates = config.get('templates', {})
-            
+        if self.config is not None:
             # 각 템플릿을 GUI에서 사용할 형태로 변환
-            for template_id, template_info in config_templates.items():
-                template_name = f"템플릿 {template_id}"
-                if template_info.get('category'):
-                    template_name += f" ({template_info['category']})"
-                
-                templates[template_name] = {
-                    'path': template_info['path'],
-                    'description': template_info.get('description', f'템플릿 {template_id}'),
-                    'category': template_info.get('category', 'basic')
+            for template in self.app_config.templates.values():
+                templates[template.display_name] = {
+                    'path': template.path,
+                    'description': template.description,
+                    'category': template.category or 'basic',
+                    'template_id': template.template_id
                 }
         
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"config.json 로딩 실패: {e}")
+        else:
             # 폴백: 기존 방식으로 템플릿 스캔
             templates_dir = "templates"
             if os.path.exists(templates_dir):
@@ -372,7 +1397,7 @@ class KeynoteGenerator:
         # 제목
         title_label = ttk.Label(main_frame, text="🍎 Keynote 자동 생성기", 
                                style='Title.TLabel')
-        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
+        title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
         
         # 왼쪽 패널 - 입력
         input_frame = ttk.LabelFrame(main_frame, text="📝 컨텐츠 입력", padding="15")
@@ -444,28 +1469,21 @@ AI는 우리의 파트너가 될 것입니다.
         ttk.Label(settings_frame, text="템플릿 선택:", 
                  style='Header.TLabel').grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
         
+        # 템플릿 목록은 _load_settings 에서 채움
         self.template_var = tk.StringVar()
-        template_names = list(self.templates.keys())
-        if template_names:
-            self.template_var.set(template_names[0])
+        self.template_combo = ttk.Combobox(settings_frame, textvariable=self.template_var,
+                                          values=[], state='readonly')
+        self.template_combo.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        template_combo = ttk.Combobox(settings_frame, textvariable=self.template_var,
-                                     values=template_names, state='readonly')
-        template_combo.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        ttk.Button(settings_frame, text="🖼️ 보기",
+                  command=self.open_template_picker).grid(row=1, column=1, padx=(5, 0), pady=(0, 10))
         
         # 템플릿 설명
-        if template_names:
-            initial_desc = self.templates[template_names[0]]['description']
-            initial_category = self.templates[template_names[0]].get('category', 'basic')
-            display_text = f"{initial_desc} [{initial_category}]"
-        else:
-            display_text = "템플릿 없음"
-            
-        self.template_desc = ttk.Label(settings_frame, text=display_text,
+        self.template_desc = ttk.Label(settings_frame, text="불러오는 중...",
                                       font=('SF Pro Display', 10), foreground='gray')
         self.template_desc.grid(row=2, column=0, sticky=tk.W, pady=(0, 15))
         
-        template_combo.bind('<<ComboboxSelected>>', self.on_template_change)
+        self.template_combo.bind('<<ComboboxSelected>>', self.on_template_change)
         
         # AI 분석 결과
         ttk.Label(settings_frame, text="AI 분석 결과:", 
@@ -483,14 +1501,42 @@ AI는 우리의 파트너가 될 것입니다.
         ttk.Button(settings_frame, text="🧠 컨텐츠 분석", 
                   command=self.analyze_content).grid(row=5, column=0, pady=(0, 15))
         
+        # 저장 후 내보내기 형식
+        export_frame = ttk.Frame(settings_frame)
+        export_frame.grid(row=6, column=0, sticky=tk.W)
+        ttk.Label(export_frame, text="함께 내보내기:").grid(row=0, column=0, sticky=tk.W)
+        
+        self.export_vars = {}
+        for column, (export_format, label) in enumerate([('pdf', 'PDF'), ('pptx', 'PowerPoint')]):
+            self.export_vars[export_format] = tk.BooleanVar(value=False)
+            ttk.Checkbutton(export_frame, text=label, 
+                           variable=self.export_vars[export_format]).grid(
+                               row=0, column=column + 1, padx=(10, 0))
+        
         # 생성 버튼
         generate_btn = ttk.Button(settings_frame, text="🚀 Keynote 생성", 
                                  command=self.generate_keynote, style='Generate.TButton')
-        generate_btn.grid(row=6, column=0, pady=(10, 0), sticky=(tk.W, tk.E))
+        generate_btn.grid(row=7, column=0, pady=(10, 0), sticky=(tk.W, tk.E))
+        
+        # 미리보기 패널 - 분석 결과 옆에 슬라이드 썸네일 표시
+        preview_frame = ttk.LabelFrame(main_frame, text="🖼️ 미리보기", padding="10")
+        preview_frame.grid(row=1, column=2, sticky=(tk.W, tk.E, tk.N, tk.S), 
+                          padx=(10, 0))
+        
+        thumb_width, thumb_height = self.PREVIEW_THUMBNAIL_SIZE
+        self.preview_canvas = tk.Canvas(preview_frame, width=thumb_width + 10,
+                                        height=thumb_height * 4, bg='#e8e8e8',
+                                        highlightthickness=0)
+        preview_scroll = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL,
+                                       command=self.preview_canvas.yview)
+        self.preview_canvas.configure(yscrollcommand=preview_scroll.set)
+        self.preview_canvas.grid(row=0, column=0, sticky=(tk.N, tk.S))
+        preview_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        preview_frame.rowconfigure(0, weight=1)
         
         # 하단 상태바
         status_frame = ttk.Frame(main_frame)
-        status_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), 
+        status_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), 
                          pady=(20, 0))
         
         ttk.Label(status_frame, text="상태:").grid(row=0, column=0, sticky=tk.W)
@@ -646,15 +1692,28 @@ AI는 우리의 파트너가 될 것입니다.
             ]
         )
         
+        skipped = []
         for path in file_paths:
-            if path not in [img['path'] for img in self.images]:
-                self.images.append({
-                    'path': path,
-                    'name': os.path.basename(path)
-                })
-                self.image_listbox.insert(tk.END, os.path.basename(path))
+            if path in self.image_paths:
+                continue
+            if len(self.images) >= self.limits.max_images:
+                skipped.append(f"{os.path.basename(path)}: 이미지 수 한도 {self.limits.max_images}개")
+                continue
+            reason = self.limits.check_image(path)
+            if reason:
+                skipped.append(f"{os.path.basename(path)}: {reason}")
+                continue
+            self.image_paths.add(path)
+            self.images.append({
+                'path': path,
+                'name': os.path.basename(path)
+            })
+            self.image_listbox.insert(tk.END, os.path.basename(path))
         
         self.progress_var.set(f"이미지 {len(self.images)}개 추가됨")
+        if skipped:
+            messagebox.showwarning("경고", "추가하지 않은 이미지:\n" + '\n'.join(skipped[:20]) +
+                                   (f"\n... 외 {len(skipped) - 20}개" if len(skipped) > 20 else ""))
         
     def analyze_content(self):
         """컨텐츠 분석"""
@@ -664,28 +1723,31 @@ AI는 우리의 파트너가 될 것입니다.
             return
         
         self.progress_var.set("컨텐츠 분석 중...")
+        from resource_limits import ResourceLimitError
         
-        # 텍스트 분석
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        # 생성할 슬라이드 구성 그대로 분석 (이미지 배정/다중 이미지 묶음 포함)
+        try:
+            slides = self._create_slide_structure(text)
+        except ResourceLimitError as e:
+            self.progress_var.set("분석 중단")
+            messagebox.showwarning("경고", str(e))
+            return
         
         analysis_results = []
-        total_slides = len(paragraphs) + 1  # +1 for title slide
-        
-        for i, paragraph in enumerate(paragraphs):
-            analysis = {
-                'text_length': len(paragraph),
-                'text_type': ContentAnalyzer.detect_text_type(paragraph),
-                'image_count': 1 if i < len(self.images) else 0,
-                'slide_number': i + 2  # +2 because first is title slide
-            }
-            
-            optimal_layout = LayoutSelector.select_optimal_layout(analysis)
-            analysis_results.append({
-                'slide': f"슬라이드 {analysis['slide_number']}",
-                'text_type': analysis['text_type'],
-                'layout': optimal_layout['keynote_layout'],
-                'text_length': analysis['text_length']
-            })
+        total_slides = len(slides)
+        
+        for i, slide in enumerate(itertools.islice(slides, 1, None)):
+            if slide.library_slide:
+                analysis_results.append(dict(slide=f"슬라이드 {i + 2}",
+                                             library_slide=slide.library_slide))
+                continue
+            body = f"{slide.title}\n{slide.content}"
+            image_count = len(slide.gallery) + (1 if slide.image_path else 0)
+            analysis_results.append(dict(
+                ContentAnalyzer.extract_features(body).as_analysis(image_count),
+                slide=f"슬라이드 {i + 2}",  # +2 because first is title slide
+                layout=slide.layout
+            ))
         
         # 분석 결과 표시
         self.analysis_text.delete("1.0", tk.END)
@@ -694,14 +1756,163 @@ AI는 우리의 파트너가 될 것입니다.
         self.analysis_text.insert(tk.END, f"이미지: {len(self.images)}개\n\n")
         
         for result in analysis_results:
+            if 'library_slide' in result:
+                self.analysis_text.insert(tk.END,
+                    f"{result['slide']}\n  라이브러리: {result['library_slide']}\n\n")
+                continue
             self.analysis_text.insert(tk.END, 
                 f"{result['slide']}\n"
                 f"  타입: {result['text_type']}\n"
                 f"  레이아웃: {result['layout']}\n"
-                f"  텍스트 길이: {result['text_length']}자\n\n"
+                f"  텍스트 길이: {result['text_length']}자 ({result['script']})\n"
+                f"  이미지: {result['image_count']}개\n\n"
             )
         
+        self._update_previews(slides)
+        
         self.progress_var.set("분석 완료!")
+    
+    def _update_previews(self, slides: List[SlideData]):
+        """슬라이드 미리보기를 백그라운드에서 렌더링"""
+        # 앞쪽 슬라이드만 그림 (수천 장 계획도 미리보기 메모리/시간이 일정하도록)
+        slides = list(itertools.islice(slides, self.PREVIEW_MAX_SLIDES))
+        
+        self.preview_canvas.delete('all')
+        self.preview_photos = [None] * len(slides)
+        thumb_height = self.PREVIEW_THUMBNAIL_SIZE[1]
+        self.preview_canvas.configure(
+            scrollregion=(0, 0, 0, len(slides) * (thumb_height + 10)))
+        
+        # Tk 위젯은 메인 스레드에서만 갱신하므로 완료된 작업을 after 로 폴링
+        futures = self._get_preview_renderer().render_async(slides)
+        self._poll_previews(list(enumerate(futures)), self.preview_photos)
+    
+    def _poll_previews(self, pending, photos):
+        """완료된 미리보기를 캔버스에 표시"""
+        if photos is not self.preview_photos:
+            return  # 새 분석이 시작되어 이전 결과는 무시
+        
+        from PIL import ImageTk
+        
+        thumb_height = self.PREVIEW_THUMBNAIL_SIZE[1]
+        still_pending = []
+        for index, future in pending:
+            if not future.done():
+                still_pending.append((index, future))
+                continue
+            if future.exception() is not None:
+                continue
+            photos[index] = ImageTk.PhotoImage(future.result())
+            self.preview_canvas.create_image(5, index * (thumb_height + 10),
+                                             image=photos[index], anchor=tk.NW)
+        
+        if still_pending:
+            self.root.after(50, self._poll_previews, still_pending, photos)
+        
+    def open_template_picker(self):
+        """템플릿 썸네일 격자 창 (보이는 칸만 그리고, 썸네일은 캐시에서 백그라운드로 로드)"""
+        if self.template_picker and self.template_picker['window'].winfo_exists():
+            self.template_picker['window'].lift()
+            return
+        
+        if self.template_catalog is None:
+            from template_catalog import TemplateCatalog
+            self.template_catalog = TemplateCatalog(self._thumbnail_cache_dir(),
+                                                    self.PICKER_THUMBNAIL_SIZE)
+        
+        names = list(self.templates.keys())
+        cell_width, cell_height = self.PICKER_CELL_SIZE
+        rows = -(-len(names) // self.PICKER_COLUMNS)
+        
+        window = tk.Toplevel(self.root)
+        window.title("템플릿 선택")
+        canvas = tk.Canvas(window, width=cell_width * self.PICKER_COLUMNS,
+                           height=cell_height * self.PICKER_VISIBLE_ROWS, bg='white',
+                           scrollregion=(0, 0, cell_width * self.PICKER_COLUMNS, rows * cell_height))
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL,
+                                  command=lambda *args: (canvas.yview(*args),
+                                                         self._draw_visible_templates()))
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        
+        self.template_picker = {'window': window, 'canvas': canvas, 'names': names,
+                                'drawn': set(), 'photos': {}}
+        
+        def on_scroll(event):
+            canvas.yview_scroll(-1 if event.delta > 0 else 1, 'units')
+            self._draw_visible_templates()
+        
+        def on_click(event):
+            column = int(canvas.canvasx(event.x) // cell_width)
+            index = int(canvas.canvasy(event.y) // cell_height) * self.PICKER_COLUMNS + column
+            if column < self.PICKER_COLUMNS and 0 <= index < len(names):
+                self.template_var.set(names[index])
+                self.on_template_change(None)
+                window.destroy()
+        
+        canvas.bind('<Configure>', lambda event: self._draw_visible_templates())
+        canvas.bind('<MouseWheel>', on_scroll)
+        canvas.bind('<Button-1>', on_click)
+    
+    def _thumbnail_cache_dir(self) -> str:
+        from template_catalog import DEFAULT_CACHE_DIR
+        return self.app_config.app.thumbnail_cache or DEFAULT_CACHE_DIR
+    
+    def _draw_visible_templates(self):
+        """격자에서 화면에 보이는 칸만 그림 (이미 그린 칸은 건너뜀)"""
+        picker = self.template_picker
+        if not picker or not picker['window'].winfo_exists():
+            return
+        
+        canvas = picker['canvas']
+        cell_width, cell_height = self.PICKER_CELL_SIZE
+        first_row = int(canvas.canvasy(0) // cell_height)
+        last_row = int(canvas.canvasy(canvas.winfo_height()) // cell_height)
+        first = first_row * self.PICKER_COLUMNS
+        last = min(len(picker['names']), (last_row + 1) * self.PICKER_COLUMNS)
+        
+        pending = []
+        for index in range(first, last):
+            if index in picker['drawn']:
+                continue
+            picker['drawn'].add(index)
+            
+            name = picker['names'][index]
+            x = (index % self.PICKER_COLUMNS) * cell_width + 10
+            y = (index // self.PICKER_COLUMNS) * cell_height + 5
+            canvas.create_rectangle(x, y, x + self.PICKER_THUMBNAIL_SIZE[0],
+                                    y + self.PICKER_THUMBNAIL_SIZE[1], outline='#dddddd')
+            canvas.create_text(x, y + self.PICKER_THUMBNAIL_SIZE[1] + 4, text=name,
+                               anchor=tk.NW, font=('SF Pro Display', 10))
+            
+            path = self.templates[name]['path']
+            if os.path.exists(path):
+                pending.append((index, x, y, self.template_catalog.thumbnail_async(path)))
+        
+        if pending:
+            self._poll_template_thumbnails(pending, picker)
+    
+    def _poll_template_thumbnails(self, pending, picker):
+        """준비된 템플릿 썸네일을 격자에 표시 (PNG 는 Tk 가 직접 읽으므로 PIL 불필요)"""
+        if picker is not self.template_picker or not picker['window'].winfo_exists():
+            return
+        
+        still_pending = []
+        for index, x, y, future in pending:
+            if not future.done():
+                still_pending.append((index, x, y, future))
+                continue
+            if future.exception() is not None or future.result() is None:
+                continue
+            photo = tk.PhotoImage(file=future.result())
+            picker['photos'][index] = photo
+            picker['canvas'].create_image(x, y, image=photo, anchor=tk.NW)
+        
+        if still_pending:
+            self.root.after(50, self._poll_template_thumbnails, still_pending, picker)
         
     def generate_keynote(self):
         """Keynote 생성"""
@@ -717,11 +1928,11 @@ AI는 우리의 파트너가 될 것입니다.
         
     def _generate_keynote_async(self, text):
         """비동기 Keynote 생성"""
+        template_name = self.template_var.get()
         try:
             self.progress_var.set("Keynote 생성 중...")
             
             # 1. 템플릿 확인
-            template_name = self.template_var.get()
             if template_name not in self.templates:
                 messagebox.showerror("오류", f"선택된 템플릿을 찾을 수 없습니다: {template_name}")
                 return
@@ -735,95 +1946,278 @@ AI는 우리의 파트너가 될 것입니다.
                     f"templates/ 폴더에 Keynote 템플릿을 추가해주세요!")
                 return
             
-            # 2. 출력 경로 설정
-            timestamp = int(time.time())
-            output_path = os.path.expanduser(f"~/Desktop/auto_presentation_{timestamp}.key")
-            
-            # 3. 슬라이드 구조 생성
+            # 2. 슬라이드 구조 생성
+            plan_start = time.perf_counter()
             slides = self._create_slide_structure(text)
+            plan_time = time.perf_counter() - plan_start
             
-            # 4. Keynote 생성
-            if not AppleScriptController.create_presentation_from_template(
-                template_path, output_path):
-                messagebox.showerror("오류", "Keynote 앱을 열 수 없습니다!")
+            # 3. 출력 경로 (계획/템플릿/이미지 내용 해시로 이름을 붙이고, 같은 결과가 있으면 재사용)
+            output_sink = self._get_output_sink()
+            from slide_library import SlideLibrary
+            library = SlideLibrary.from_config(self.config)
+            output_key = output_sink.content_key(slides, template_path, library)
+            existing = output_sink.existing(output_key)
+            if existing:
+                exported = self._export_saved_presentation(existing, document_open=False)
+                self.progress_var.set("기존 파일 사용")
+                messagebox.showinfo("완료",
+                    f"같은 내용의 Keynote 파일이 이미 있습니다!\n{existing}" +
+                    ''.join(f"\n{path}" for path in exported))
                 return
+            # Keynote 는 임시 경로에 저장하고, 검사 후 최종 경로로 원자적으로 옮김
+            output_path = output_sink.reserve(output_key)
             
-            # 5. 슬라이드 추가
-            for i, slide in enumerate(slides):
-                self.progress_var.set(f"슬라이드 {i+1}/{len(slides)} 생성 중...")
-                
-                if not AppleScriptController.add_slide_with_layout(slide):
-                    print(f"슬라이드 {i+1} 생성 실패")
-                
-                # 이미지 추가
-                if slide.image_path and os.path.exists(slide.image_path):
-                    AppleScriptController.add_image_to_current_slide(
-                        slide.image_path, slide.image_position)
-                
-                time.sleep(0.5)  # Keynote 처리 시간
+            # 재현 번들 기록 (app_settings.replay_dir 이 있을 때만)
+            from render_backend import ControllerBackend, render_presentation
+            backend = self._get_render_backend()
+            replay_dir = self.app_config.app.replay_dir
+            recorder = None
+            if replay_dir:
+                from replay import RecordingController
+                if isinstance(backend, ControllerBackend):
+                    # 재실행과 비교할 수 있도록 컨트롤러 호출 단위로 기록
+                    recorder = RecordingController(backend.controller)
+                    backend = ControllerBackend(recorder, backend.slide_delay)
+                else:
+                    backend = recorder = RecordingController(backend)
             
-            # 6. 저장
-            if AppleScriptController.save_presentation(output_path):
+            # 4~6. Keynote 생성, 슬라이드 추가, 저장
+            AppleScriptController.telemetry.reset()
+            generate_start = time.perf_counter()
+            result = render_presentation(backend, template_path, output_path, slides,
+                                         progress=self.progress_var.set, library=library)
+            if recorder is not None:
+                self._write_replay_bundle(
+                    os.path.join(replay_dir, f"replay_{int(time.time())}_{output_key[:8]}.zip"),
+                    text, template_path,
+                    output_path, slides, recorder.calls,
+                    {'plan': plan_time, 'generate': time.perf_counter() - generate_start},
+                    library)
+            if not result:
+                output_sink.discard(output_path)
+            if not result and result.operation == 'create_presentation':
+                messagebox.showerror("오류", f"Keynote 앱을 열 수 없습니다!\n{result.describe()}")
+                return
+            
+            if result:
+                output_path = output_sink.commit(output_key, output_path)
+                exported = self._export_saved_presentation(output_path)
+                output_sink.maybe_cleanup()
                 self.progress_var.set("생성 완료!")
                 messagebox.showinfo("완료", 
-                    f"Keynote 파일이 생성되었습니다!\n{output_path}")
+                    f"Keynote 파일이 생성되었습니다!\n{output_path}" + 
+                    ''.join(f"\n{path}" for path in exported))
             else:
                 self.progress_var.set("저장 실패")
-                messagebox.showerror("오류", "파일 저장에 실패했습니다!")
+                messagebox.showerror("오류", f"파일 저장에 실패했습니다!\n{result.describe()}")
                 
         except Exception as e:
             self.progress_var.set("생성 실패")
             messagebox.showerror("오류", f"생성 중 오류 발생:\n{str(e)}")
+        finally:
+            self._export_telemetry(template_name)
+    
+    def _write_replay_bundle(self, bundle_path: str, text: str, template_path: str,
+                             output_path: str, slides, calls: List[Dict], timings: Dict,
+                             library=None):
+        """이번 실행의 입력, 슬라이드 계획, 컨트롤러 호출 순서를 재현 번들로 저장"""
+        from replay import write_bundle
+        include_images = self.app_config.app.replay_include_images
+        try:
+            write_bundle(bundle_path, text, self.images, template_path, output_path,
+                         slides, calls, timings, include_images=include_images,
+                         library=library, config=self.app_config.raw)
+        except OSError as e:
+            print(f"재현 번들 기록 실패: {e}")
+    
+    def _export_telemetry(self, template_name: str):
+        """이번 실행의 컨트롤러 호출 집계를 로그 파일에 추가"""
+        if not AppleScriptController.telemetry.count:
+            return
+        telemetry_log = self.app_config.app.telemetry_log
+        if not telemetry_log:
+            return
+        try:
+            AppleScriptController.telemetry.export_run(
+                telemetry_log, {'template': template_name, 'source': 'gui'})
+        except OSError as e:
+            print(f"telemetry 기록 실패: {e}")
+    
+    def _export_saved_presentation(self, output_path: str, document_open: bool = True) -> List[str]:
+        """저장 직후 열려 있는 문서(document_open=False 면 output_path 파일)를 선택한 형식으로 한 번에 내보내기"""
+        formats = [f for f, var in self.export_vars.items() if var.get()]
+        if not formats:
+            return []
+        
+        from export_pipeline import ExportJob, ExportQueue
+        if self.export_queue is None:
+            self.export_queue = ExportQueue(concurrency=1,
+                                            export_func=self._get_render_backend().export)
+        
+        self.progress_var.set(f"내보내기 중... ({', '.join(formats)})")
+        job = ExportJob(source_path=output_path, formats=formats, document_open=document_open)
+        # 다음 생성이 front document 를 바꾸기 전에 내보내기가 끝나야 하므로 대기
+        job = self.export_queue.submit(job).result()
+        if not job.success:
+            print(f"내보내기 실패: {output_path} {job.result.describe() if job.result else ''}")
+            return []
+        return list(job.outputs.values())
     
     def _create_slide_structure(self, text: str) -> List[SlideData]:
-        """슬라이드 구조 생성"""
-        slides = []
-        
-        # 제목 슬라이드
-        first_line = text.split('\n')[0]
-        slides.append(SlideData(
-            slide_type='title',
-            layout='Title & Subtitle',
-            title=first_line,
-            content='AI Assistant가 생성한 프레젠테이션'
-        ))
-        
-        # 내용 슬라이드들
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        
-        for i, paragraph in enumerate(paragraphs[1:] if len(paragraphs) > 1 else paragraphs):
-            lines = paragraph.split('\n')
-            title = lines[0][:50] + ('...' if len(lines[0]) > 50 else '')
-            content = '\n'.join(lines[1:]) if len(lines) > 1 else lines[0]
-            
-            # AI 분석으로 레이아웃 결정
-            analysis = {
-                'text_length': len(paragraph),
-                'text_type': ContentAnalyzer.detect_text_type(paragraph),
-                'image_count': 1 if i < len(self.images) else 0
-            }
-            
-            layout_info = LayoutSelector.select_optimal_layout(analysis)
-            
-            slide = SlideData(
-                slide_type='content',
-                layout=layout_info['keynote_layout'],
-                title=title,
-                content=content,
-                image_path=self.images[i]['path'] if i < len(self.images) else None,
-                image_position='right',
-                image_size='medium'
-            )
-            
-            slides.append(slide)
-        
-        return slides
+        """슬라이드 구조 생성 (같은 텍스트/이미지면 최근 계획 재사용)"""
+        digest = hashlib.sha1(text.encode('utf-8'))
+        for image in self.images:
+            try:
+                stat = os.stat(image['path'])
+                digest.update(f"\0{image['path']}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+            except OSError:
+                digest.update(f"\0{image['path']}|missing".encode('utf-8'))
+        key = digest.hexdigest()
+        
+        with self.plan_cache_lock:
+            plan = self.plan_cache.get(key)
+            if plan is not None:
+                self.plan_cache.move_to_end(key)
+        
+        if plan is None:
+            slides = create_slide_structure(text, self.images, self.text_fitter,
+                                            self.image_assigner, self.slide_packer, self.limits)
+            # 캐시는 Tk 스레드와 작업 스레드가 함께 쓰므로 메모리에 든 계획은 바꿀 수 없는 튜플로
+            # 보관하고, 디스크로 내려간 계획은 읽을 때마다 파일을 따로 여는 SpillList 를 그대로 둠
+            from resource_limits import SpillList
+            plan = slides if isinstance(slides, SpillList) and slides.spilled else tuple(slides)
+            with self.plan_cache_lock:
+                self.plan_cache[key] = plan
+                while len(self.plan_cache) > self.PLAN_CACHE_SIZE:
+                    self.plan_cache.popitem(last=False)
+        return list(plan) if isinstance(plan, tuple) else plan
+
+def measure_import_time(module_name: str) -> List[Tuple[int, int, str]]:
+    """`python -X importtime` 으로 새 프로세스에서 모듈 임포트 시간 측정
+    
+    (self 마이크로초, 누적 마이크로초, 모듈 이름) 목록을 누적 시간 역순으로 반환
+    """
+    import subprocess
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((int(self_us), int(cumulative_us), name.strip()))
+    
+    return sorted(entries, key=lambda entry: entry[1], reverse=True)
+
+def print_startup_report(startup_times: Dict[str, float], top: int = 10) -> bool:
+    """임포트/시작 시간 보고서 출력 (예산 초과 시 False)"""
+    within_budget = True
+    
+    entries = measure_import_time('keynote_generator_main')
+    print("📦 import keynote_generator_main (-X importtime, 누적 기준)")
+    for self_us, cumulative_us, name in entries[:top]:
+        print(f"  {cumulative_us / 1000:8.1f}ms  (self {self_us / 1000:6.1f}ms)  {name}")
+    
+    heavy = [name for _, _, name in entries if name in ('tkinter', 'PIL', 'PIL.Image')]
+    if heavy:
+        print(f"⚠️  헤드리스 임포트에 무거운 모듈 포함: {', '.join(heavy)}")
+        within_budget = False
+    
+    timings = dict(startup_times)
+    if entries:
+        timings['import'] = entries[0][1] / 1_000_000
+    
+    print("\n⏱️ 시작 시간")
+    for phase, seconds in timings.items():
+        budget = STARTUP_BUDGET_MS.get(phase)
+        elapsed_ms = seconds * 1000
+        if budget is None:
+            print(f"  {phase:16} {elapsed_ms:8.1f}ms")
+            continue
+        status = "✅" if elapsed_ms <= budget else "❌"
+        within_budget = within_budget and elapsed_ms <= budget
+        print(f"  {phase:16} {elapsed_ms:8.1f}ms / {budget}ms {status}")
+    
+    return within_budget
+
+def print_telemetry_report(aggregate: Dict, top: int = 10):
+    """telemetry 집계 출력 (실패율, 평균 지연 순)"""
+    print(f"📊 컨트롤러 telemetry ({aggregate['runs']}회 실행)")
+    
+    for group in ('operations',) + ControllerTelemetry.GROUP_LABELS:
+        rows = []
+        for key, stats in aggregate[group].items():
+            failure_rate = stats['failures'] / stats['count'] if stats['count'] else 0.0
+            average = stats['latency_total'] / stats['count'] if stats['count'] else 0.0
+            rows.append((failure_rate, average, key, stats))
+        if not rows:
+            continue
+        
+        print(f"\n[{group}]")
+        for failure_rate, average, key, stats in sorted(rows, reverse=True)[:top]:
+            errors = ', '.join(f"{name}:{count}" for name, count in stats['errors'].items())
+            print(f"  {key:40} {stats['count']:6}회  실패 {failure_rate:6.1%}  "
+                  f"평균 {average:6.2f}초  최대 {stats['latency_max']:6.2f}초  "
+                  f"시도 {stats['attempts']}  {errors}")
 
 def main():
     """메인 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Keynote 자동 생성기")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="창을 띄워 시작 시간을 측정하고 보고서를 출력한 뒤 종료")
+    parser.add_argument('--import-report', action='store_true',
+                        help="GUI 없이 임포트 시간 보고서만 출력")
+    parser.add_argument('--telemetry-report', metavar='PATH',
+                        help="컨트롤러 telemetry 로그(JSON Lines)를 집계해 출력")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="메인 루프 프로파일링: 핸들러별 시간과 멈춤 구간 스택(folded)을 "
+                             "종료 시 PATH 에 저장")
+    args = parser.parse_args()
+    
+    if args.import_report:
+        sys.exit(0 if print_startup_report({}) else 1)
+    
+    if args.telemetry_report:
+        print_telemetry_report(ControllerTelemetry.aggregate(args.telemetry_report))
+        return
+    
+    _load_tkinter()
+    profiler = None
+    if args.profile:
+        # 위젯/콜백을 만들기 전에 설치해야 모든 핸들러가 측정됨
+        from ui_profiler import MainLoopProfiler
+        profiler = MainLoopProfiler().install()
     root = tk.Tk()
     app = KeynoteGenerator(root)
-    root.mainloop()
+    if profiler is not None:
+        profiler.install(root)
+    
+    if args.startup_report:
+        report = {}
+        
+        def wait_for_settings():
+            if 'settings_loaded' not in app.startup_times:
+                root.after(10, wait_for_settings)
+                return
+            report['within_budget'] = print_startup_report(app.startup_times)
+            root.destroy()
+        
+        root.after(10, wait_for_settings)
+        root.mainloop()
+        sys.exit(0 if report.get('within_budget') else 1)
+    
+    try:
+        root.mainloop()
+    finally:
+        if profiler is not None:
+            profiler.uninstall()
+            profiler.print_report()
+            print(f"📁 {profiler.write_folded(args.profile)}")
 
 if __name__ == "__main__":
     main()
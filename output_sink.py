@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+💾 출력 관리
+생성 결과를 임시 경로에 쓴 뒤 원자적으로 이름을 바꿔 출력 폴더에 두고, 슬라이드 계획/템플릿/
+이미지 내용 해시로 이름을 붙여 같은 요청은 기존 파일을 그대로 사용하며, 보관 정책으로 정리
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from asset_index import AssetIndex
+
+# 생성 방식이 바뀌어 같은 계획이라도 결과가 달라지면 올려서 기존 파일을 쓰지 않게 함
+OUTPUT_FORMAT_VERSION = 1
+
+# 출력 파일 옆에 두는 완료 표시 (이 파일이 있어야 완전히 쓰인 결과로 인정)
+MANIFEST_SUFFIX = '.manifest.json'
+
+# 작업 중 임시 폴더 (출력 폴더 안에 두어 같은 파일 시스템에서 rename)
+TEMP_DIR_NAME = '.tmp'
+
+# 이 시간보다 오래된 임시 폴더는 중단된 실행의 잔여물로 보고 정리(초)
+STALE_TEMP_SECONDS = 6 * 3600
+
+# 생성할 때마다 정리하지 않도록 maybe_cleanup 의 최소 간격(초)
+CLEANUP_INTERVAL = 60.0
+
+MB = 1024 * 1024
+
+
+@dataclass
+class RetentionPolicy:
+    """보관 정책 (None 이면 제한 없음)"""
+    max_files: Optional[int] = None
+    max_age_days: Optional[float] = None
+    max_total_mb: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "RetentionPolicy":
+        config = config or {}
+        return cls(config.get('max_files'), config.get('max_age_days'), config.get('max_total_mb'))
+
+
+def path_size(path: str) -> int:
+    """파일 또는 패키지 폴더 전체 크기"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def remove_path(path: str):
+    """파일 또는 폴더 삭제 (없으면 무시)"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class OutputSink:
+    """출력 폴더 관리자
+
+    reserve → (백엔드가 임시 경로에 저장) → commit 순서로 쓰며, commit 은 결과를 검사한 뒤
+    os.replace 로 최종 경로에 옮기고 마지막에 manifest 를 씁니다. manifest 가 없거나 크기가
+    맞지 않는 출력은 중간에 끊긴 것으로 보고 사용하지 않습니다.
+    """
+
+    def __init__(self, root: str, prefix: str = 'auto_presentation', extension: str = '.key',
+                 retention: Optional[RetentionPolicy] = None):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.prefix = prefix
+        self.extension = extension
+        self.retention = retention or RetentionPolicy()
+        self.temp_root = os.path.join(self.root, TEMP_DIR_NAME)
+        self.asset_index = AssetIndex()
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], default_root: str = '~/Desktop') -> "OutputSink":
+        """config.json 의 output 항목으로 생성"""
+        output = (config or {}).get('output', {})
+        return cls(output.get('root') or default_root,
+                   output.get('prefix', 'auto_presentation'),
+                   retention=RetentionPolicy.from_config(output.get('retention')))
+
+    # ------------------------------------------------------------------ 이름
+
+    def content_key(self, slides, template_path: str, library=None) -> str:
+        """슬라이드 계획 + 템플릿/이미지 내용으로 만든 출력 키 (경로가 달라도 내용이 같으면 같음)
+
+        library(slide_library.SlideLibrary)를 주면 라이브러리 문서 내용과 이름 → 번호도 포함합니다.
+        """
+        digest = hashlib.sha256(f"v{OUTPUT_FORMAT_VERSION}|{self.extension}|".encode('utf-8'))
+
+        def content(path: Optional[str]) -> Optional[str]:
+            if path and os.path.isfile(path):
+                return self.asset_index.key(path)
+            return path
+
+        digest.update(str(content(template_path)).encode('utf-8'))
+        for slide in slides:
+            data = json.loads(slide.to_json())
+            data['image_path'] = content(data['image_path'])
+            data['gallery'] = [(content(path), box) for path, box in data['gallery']]
+            digest.update(json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+            digest.update(b'\n')
+        if library is not None:
+            digest.update(str(content(library.path)).encode('utf-8'))
+            digest.update(json.dumps(library.slides, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, f"{self.prefix}_{key[:16]}{self.extension}")
+
+    @staticmethod
+    def manifest_path(output_path: str) -> str:
+        return output_path + MANIFEST_SUFFIX
+
+    # ------------------------------------------------------------------ 조회
+
+    def existing(self, key: str) -> Optional[str]:
+        """같은 키로 완전히 쓰인 출력이 있으면 그 경로 (사용 시각을 갱신해 정리 순서를 늦춤)"""
+        path = self.path_for(key)
+        manifest_path = self.manifest_path(path)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('key') != key or not os.path.exists(path) \
+                or path_size(path) != manifest.get('size'):
+            return None
+        os.utime(manifest_path)
+        return path
+
+    # ------------------------------------------------------------------ 쓰기
+
+    def reserve(self, key: str) -> str:
+        """이번 실행 전용 임시 경로 (최종 파일 이름과 같은 이름, 출력 폴더와 같은 파일 시스템)"""
+        temp_dir = os.path.join(self.temp_root, uuid.uuid4().hex)
+        os.makedirs(temp_dir)
+        return os.path.join(temp_dir, os.path.basename(self.path_for(key)))
+
+    @staticmethod
+    def verify(path: str) -> Optional[str]:
+        """쓰인 결과 검사 (문제가 있으면 이유, 없으면 None)"""
+        if not os.path.exists(path):
+            return "결과 파일이 없습니다"
+        if os.path.isfile(path):
+            if os.path.getsize(path) == 0:
+                return "결과 파일이 비어 있습니다"
+            # 단일 파일 .key 는 zip 이므로 zip 이면 끝의 중앙 디렉터리까지 쓰였는지 확인
+            with open(path, 'rb') as f:
+                is_zip = f.read(4) == b'PK\x03\x04'
+            if is_zip and not zipfile.is_zipfile(path):
+                return "결과 파일이 끝까지 쓰이지 않았습니다"
+        elif not os.listdir(path):
+            return "결과 패키지가 비어 있습니다"
+        return None
+
+    def commit(self, key: str, temp_path: str) -> str:
+        """임시 결과를 검사하고 최종 경로로 옮긴 뒤 manifest 기록 → 최종 경로
+
+        같은 키의 결과가 이미 있으면(동시에 같은 요청이 끝난 경우) 임시 결과를 버리고
+        기존 결과를 반환합니다. 검사에 실패하면 임시 결과를 지우고 OSError 를 올립니다.
+        """
+        try:
+            problem = self.verify(temp_path)
+            if problem:
+                raise OSError(f"{problem}: {temp_path}")
+
+            final_path = self.path_for(key)
+            with self._lock:
+                existing = self.existing(key)
+                if existing:
+                    return existing
+
+                os.makedirs(self.root, exist_ok=True)
+                remove_path(self.manifest_path(final_path))
+                remove_path(final_path)  # manifest 없는(끊긴) 이전 결과
+                os.replace(temp_path, final_path)
+
+                manifest = {'key': key, 'size': path_size(final_path), 'created_at': time.time(),
+                            'format_version': OUTPUT_FORMAT_VERSION}
+                manifest_temp = f"{self.manifest_path(final_path)}.{uuid.uuid4().hex}.tmp"
+                with open(manifest_temp, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f)
+                os.replace(manifest_temp, self.manifest_path(final_path))
+                return final_path
+        finally:
+            self.discard(temp_path)
+
+    def discard(self, temp_path: str):
+        """임시 결과와 그 폴더 삭제"""
+        temp_dir = os.path.dirname(temp_path)
+        if os.path.dirname(temp_dir) == self.temp_root:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------ 정리
+
+    def outputs(self) -> List[Dict]:
+        """완료된 출력 목록 (최근 사용 순)"""
+        entries = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not name.endswith(MANIFEST_SUFFIX):
+                continue
+            manifest_path = os.path.join(self.root, name)
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                used_at = os.path.getmtime(manifest_path)
+            except (OSError, ValueError):
+                continue
+            entries.append({'path': manifest_path[:-len(MANIFEST_SUFFIX)],
+                            'size': manifest.get('size', 0), 'used_at': used_at})
+        entries.sort(key=lambda entry: entry['used_at'], reverse=True)
+        return entries
+
+    def maybe_cleanup(self) -> List[str]:
+        """마지막 정리 후 CLEANUP_INTERVAL 이 지났을 때만 정리 (대량 생성 중 호출용)"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_cleanup < CLEANUP_INTERVAL:
+                return []
+            self._last_cleanup = now
+        return self.cleanup(now)
+
+    def cleanup(self, now: Optional[float] = None) -> List[str]:
+        """보관 정책에 따라 오래된 출력과 끊긴 임시 결과 삭제 → 삭제한 경로 목록
+
+        manifest 가 있는 출력만 정리하므로 출력 폴더의 다른 파일은 건드리지 않습니다.
+        내보낸 PDF/PPTX 등 같은 이름의 파일도 함께 지웁니다.
+        """
+        now = now or time.time()
+        removed = []
+        policy = self.retention
+        total = 0
+        for index, entry in enumerate(self.outputs()):
+            total += entry['size']
+            expired = (
+                (policy.max_files is not None and index >= policy.max_files) or
+                (policy.max_age_days is not None and
+                 now - entry['used_at'] > policy.max_age_days * 86400) or
+                (policy.max_total_mb is not None and total > policy.max_total_mb * MB)
+            )
+            if not expired:
+                continue
+            base = os.path.splitext(entry['path'])[0]
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if path == entry['path'] or (path.startswith(base + '.')
+                                             and not name.endswith(MANIFEST_SUFFIX)):
+                    remove_path(path)
+                    removed.append(path)
+            remove_path(self.manifest_path(entry['path']))
+            total -= entry['size']
+
+        if os.path.isdir(self.temp_root):
+            for name in os.listdir(self.temp_root):
+                path = os.path.join(self.temp_root, name)
+                try:
+                    if now - os.path.getmtime(path) > STALE_TEMP_SECONDS:
+                        remove_path(path)
+                        removed.append(path)
+                except OSError:
+                    pass
+        return removed
+
+
+def main():
+    """메인 함수 - 출력 폴더 정리"""
+    parser = argparse.ArgumentParser(description="출력 폴더 정리 (config.json output.retention)")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--root', help="출력 폴더 (기본: config.json output.root)")
+    parser.add_argument('--max-files', type=int)
+    parser.add_argument('--max-age-days', type=float)
+    parser.add_argument('--max-total-mb', type=float)
+    args = parser.parse_args()
+
+    from app_config import ConfigError, config_store
+    try:
+        config = config_store(args.config).get().raw
+    except (OSError, ConfigError):
+        config = {}
+    sink = OutputSink.from_config(config)
+    if args.root:
+        sink = OutputSink(args.root, sink.prefix, retention=sink.retention)
+    for name in ('max_files', 'max_age_days', 'max_total_mb'):
+        if getattr(args, name) is not None:
+            setattr(sink.retention, name, getattr(args, name))
+
+    before = sink.outputs()
+    removed = sink.cleanup()
+    print(f"💾 {sink.root}: 출력 {len(before)}개 중 {len(before) - len(sink.outputs())}개 정리, "
+          f"삭제한 경로 {len(removed)}개")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
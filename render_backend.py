@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧱 렌더 백엔드
+슬라이드 계획을 실제 문서로 만드는 백엔드 프로토콜 (템플릿 열기, 슬라이드 일괄 추가,
+이미지 추가, 저장, 내보내기)과 AppleScript 백엔드, 문서를 메모리에 모델링하는 기록 백엔드
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import copy
+import itertools
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from keynote_generator_main import AppleScriptController, ScriptResult, SlideData, StyleRun
+from slide_library import SlideLibrary
+from text_fitting import LAYOUT_PLACEHOLDERS
+
+Box = Tuple[int, int, int, int]
+
+
+class RenderBackend(Protocol):
+    """렌더 백엔드 프로토콜
+
+    add_slides 는 슬라이드마다 (레이아웃, 제목, 본문, 이미지 포함) 결과를 반환하고,
+    add_images 는 마지막으로 추가한 슬라이드에 이미지를 더합니다.
+    annotate_slides 는 슬라이드를 모두 추가한 뒤 발표자 노트와 텍스트 서식을 한 번에 적용하며,
+    위치는 이번 실행에서 추가에 성공한 슬라이드 순서(1부터)입니다.
+    batch_size 는 render_presentation 이 add_slides 한 번에 넘기는 슬라이드 수입니다.
+    add_library_slides 는 연속된 라이브러리 슬라이드를 한 번에 복제합니다 (batch_size 와 무관).
+    """
+    name: str
+    batch_size: int
+
+    def open_template(self, template_path: str, output_path: str) -> ScriptResult: ...
+
+    def add_slides(self, slides: List[SlideData]) -> List[ScriptResult]: ...
+
+    def add_library_slides(self, library: SlideLibrary,
+                           slides: List[SlideData]) -> List[ScriptResult]: ...
+
+    def add_images(self, images: List[Tuple[str, Box]]) -> ScriptResult: ...
+
+    def annotate_slides(self, annotations: List[Tuple[int, SlideData]]) -> ScriptResult: ...
+
+    def save(self, output_path: str) -> ScriptResult: ...
+
+    def export(self, exports: Dict[str, str], source_path: Optional[str] = None) -> ScriptResult: ...
+
+
+class ControllerBackend:
+    """AppleScriptController (또는 같은 메서드를 가진 컨트롤러) 백엔드
+
+    Keynote 는 슬라이드마다 스크립트 한 번이 필요하므로 진행 상황을 슬라이드 단위로 알리도록
+    batch_size 는 1 입니다.
+    """
+    name = 'applescript'
+    batch_size = 1
+
+    def __init__(self, controller=AppleScriptController, slide_delay: float = 0.5):
+        self.controller = controller
+        self.slide_delay = slide_delay
+        self.slide_count = 0
+        self.added_count = 0  # 추가에 성공한 슬라이드 수 (annotate_slides 위치 기준)
+
+    def open_template(self, template_path: str, output_path: str) -> ScriptResult:
+        self.slide_count = self.added_count = 0
+        return self.controller.create_presentation_from_template(template_path, output_path)
+
+    def add_slides(self, slides: List[SlideData]) -> List[ScriptResult]:
+        results = []
+        for slide in slides:
+            self.slide_count += 1
+            result = self.controller.add_slide_with_layout(slide)
+            results.append(result)
+            if result:
+                self.added_count += 1
+            else:
+                print(f"슬라이드 {self.slide_count} 생성 실패: {result.describe()}")
+
+            # 이미지 추가 (다중 이미지는 한 번에)
+            if slide.gallery:
+                image_result = self.add_images(slide.gallery)
+                if not image_result:
+                    print(f"슬라이드 {self.slide_count} 이미지 추가 실패: {image_result.describe()}")
+
+            if slide.image_path and os.path.exists(slide.image_path):
+                image_result = self.controller.add_image_to_current_slide(
+                    slide.image_path, slide.image_position, slide.image_box)
+                if not image_result:
+                    print(f"슬라이드 {self.slide_count} 이미지 추가 실패: {image_result.describe()}")
+
+            if self.slide_delay:
+                time.sleep(self.slide_delay)  # Keynote 처리 시간
+        return results
+
+    def add_library_slides(self, library: SlideLibrary,
+                           slides: List[SlideData]) -> List[ScriptResult]:
+        """라이브러리 문서에서 슬라이드를 스크립트 한 번으로 복제 (결과는 슬라이드마다)"""
+        results: List[Optional[ScriptResult]] = [None] * len(slides)
+        numbers, indexes = [], []
+        for i, slide in enumerate(slides):
+            number = library.slide_number(slide.library_slide)
+            if number is None:
+                results[i] = _library_error(f"라이브러리에 없는 슬라이드: {slide.library_slide}")
+            else:
+                numbers.append(number)
+                indexes.append(i)
+
+        if numbers:
+            result = self.controller.import_library_slides(library.path, numbers)
+            flags = result.output.split(',') if result and result.output else []
+            for k, i in enumerate(indexes):
+                if not result:
+                    results[i] = result
+                elif k < len(flags) and flags[k].strip() != '1':
+                    results[i] = _library_error(f"복제 실패: {slides[i].library_slide}")
+                else:
+                    results[i] = ScriptResult(True, operation='import_library_slides',
+                                              labels={'library_slide': slides[i].library_slide})
+            if self.slide_delay:
+                time.sleep(self.slide_delay)
+
+        for slide, result in zip(slides, results):
+            self.slide_count += 1
+            if result:
+                self.added_count += 1
+            else:
+                print(f"슬라이드 {self.slide_count} 라이브러리 복제 실패: {result.describe()}")
+        return results
+
+    def add_images(self, images: List[Tuple[str, Box]]) -> ScriptResult:
+        return self.controller.add_images_to_current_slide(images)
+
+    def annotate_slides(self, annotations: List[Tuple[int, SlideData]]) -> ScriptResult:
+        return self.controller.annotate_slides(annotations, self.added_count)
+
+    def save(self, output_path: str) -> ScriptResult:
+        return self.controller.save_presentation(output_path)
+
+    def export(self, exports: Dict[str, str], source_path: Optional[str] = None) -> ScriptResult:
+        return self.controller.export_presentation(exports, source_path)
+
+
+@dataclass
+class RenderedSlide:
+    """메모리 백엔드 문서의 슬라이드"""
+    layout: str
+    title: str
+    content: str
+    body_font_size: Optional[float] = None
+    images: List[Tuple[str, Box]] = field(default_factory=list)
+    notes: str = ""
+    style_runs: List[StyleRun] = field(default_factory=list)
+
+
+@dataclass
+class RenderedDocument:
+    """메모리 백엔드 문서"""
+    template_path: str
+    slides: List[RenderedSlide] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class MemoryBackend:
+    """문서를 메모리에 모델링하고 호출을 기록하는 백엔드 (Keynote 없이 계획/스케줄링 검증용)
+
+    Keynote 처럼 열린 문서가 없으면 missing_object, 템플릿에 없는 레이아웃이면 missing_layout
+    오류를 반환합니다. write_files 면 저장/내보내기 경로에 문서 JSON 을 씁니다.
+    slide_latency 를 주면 슬라이드마다 그만큼 기다려 Keynote 처리 시간을 흉내 냅니다.
+    """
+    name = 'memory'
+    batch_size = 500
+
+    # image_box 가 없을 때의 position 별 이미지 영역 (add_image_to_current_slide 기본값과 같음)
+    DEFAULT_IMAGE_BOXES = {
+        'right': (400, 150, 300, 200),
+        'center': (250, 200, 400, 300)
+    }
+
+    def __init__(self, layouts: Optional[Iterable[str]] = None, write_files: bool = False,
+                 slide_latency: float = 0.0):
+        self.layouts = set(layouts or LAYOUT_PLACEHOLDERS)
+        self.write_files = write_files
+        self.slide_latency = slide_latency
+        self.document: Optional[RenderedDocument] = None
+        self.saved: Dict[str, RenderedDocument] = {}
+        self.exported: Dict[str, str] = {}
+        self.calls: List[Tuple[str, int]] = []  # (연산, 항목 수)
+        self.libraries: Dict[str, RenderedDocument] = {}  # 라이브러리 경로 → 문서
+
+    def _error(self, operation: str, error_class: str, message: str) -> ScriptResult:
+        return ScriptResult(False, 'script_error', error_class, message, operation=operation)
+
+    def open_template(self, template_path: str, output_path: str) -> ScriptResult:
+        self.calls.append(('create_presentation', 1))
+        if not os.path.exists(template_path):
+            return self._error('create_presentation', 'file_not_found',
+                               f"템플릿 없음: {template_path}")
+        self.document = RenderedDocument(template_path)
+        return ScriptResult(True, operation='create_presentation',
+                            labels={'template': template_path})
+
+    def add_slides(self, slides: List[SlideData]) -> List[ScriptResult]:
+        self.calls.append(('add_slides', len(slides)))
+        results = []
+        for slide in slides:
+            if self.slide_latency:
+                time.sleep(self.slide_latency)
+            if self.document is None:
+                results.append(self._error('add_slide', 'missing_object', "열린 문서 없음"))
+                continue
+            if slide.layout not in self.layouts:
+                results.append(self._error('add_slide', 'missing_layout',
+                                           f"레이아웃 없음: {slide.layout}"))
+                continue
+            rendered = RenderedSlide(slide.layout, slide.title, slide.content,
+                                     slide.body_font_size, list(slide.gallery))
+            if slide.image_path:
+                box = slide.image_box or self.DEFAULT_IMAGE_BOXES.get(
+                    slide.image_position, self.DEFAULT_IMAGE_BOXES['right'])
+                rendered.images.append((slide.image_path, box))
+            self.document.slides.append(rendered)
+            results.append(ScriptResult(True, operation='add_slide',
+                                        labels={'layout': slide.layout}))
+        return results
+
+    def _load_library(self, path: str) -> Optional[RenderedDocument]:
+        """write_files 로 저장한 문서 JSON 을 라이브러리로 읽기 (경로별 캐시)"""
+        if path not in self.libraries:
+            if not os.path.exists(path):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            slides = [RenderedSlide(**dict(slide,
+                                           images=[(image, tuple(box))
+                                                   for image, box in slide.get('images', [])],
+                                           style_runs=[StyleRun.from_dict(run)
+                                                       for run in slide.get('style_runs', [])]))
+                      for slide in data.get('slides', [])]
+            self.libraries[path] = RenderedDocument(data.get('template_path', ''), slides)
+        return self.libraries[path]
+
+    def add_library_slides(self, library: SlideLibrary,
+                           slides: List[SlideData]) -> List[ScriptResult]:
+        self.calls.append(('import_library_slides', len(slides)))
+        if self.document is None:
+            return [self._error('import_library_slides', 'missing_object', "열린 문서 없음")
+                    for _ in slides]
+        source = self._load_library(library.path)
+        if source is None:
+            return [self._error('import_library_slides', 'file_not_found',
+                                f"라이브러리 없음: {library.path}") for _ in slides]
+        results = []
+        for slide in slides:
+            number = library.slide_number(slide.library_slide)
+            if number is None or not 1 <= number <= len(source.slides):
+                results.append(_library_error(f"라이브러리에 없는 슬라이드: {slide.library_slide}"))
+                continue
+            self.document.slides.append(copy.deepcopy(source.slides[number - 1]))
+            results.append(ScriptResult(True, operation='import_library_slides',
+                                        labels={'library_slide': slide.library_slide}))
+        return results
+
+    def add_images(self, images: List[Tuple[str, Box]]) -> ScriptResult:
+        self.calls.append(('add_images', len(images)))
+        if self.document is None or not self.document.slides:
+            return self._error('add_images', 'missing_object', "이미지를 넣을 슬라이드 없음")
+        self.document.slides[-1].images.extend(images)
+        return ScriptResult(True, operation='add_images', labels={'count': str(len(images))})
+
+    def annotate_slides(self, annotations: List[Tuple[int, SlideData]]) -> ScriptResult:
+        self.calls.append(('annotate_slides', len(annotations)))
+        if self.document is None:
+            return self._error('annotate_slides', 'missing_object', "열린 문서 없음")
+        failed = 0
+        for position, slide in annotations:
+            if not 1 <= position <= len(self.document.slides):
+                failed += 1
+                continue
+            rendered = self.document.slides[position - 1]
+            rendered.notes = slide.notes
+            rendered.style_runs = list(slide.style_runs)
+        return ScriptResult(True, operation='annotate_slides', output=str(failed),
+                            labels={'slides': str(len(annotations))})
+
+    def save(self, output_path: str) -> ScriptResult:
+        self.calls.append(('save', 1))
+        if self.document is None:
+            return self._error('save', 'missing_object', "열린 문서 없음")
+        self.saved[output_path] = copy.deepcopy(self.document)
+        if self.write_files:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.document.to_dict(), f, ensure_ascii=False)
+        return ScriptResult(True, operation='save')
+
+    def export(self, exports: Dict[str, str], source_path: Optional[str] = None) -> ScriptResult:
+        self.calls.append(('export', len(exports)))
+        document = self.saved.get(source_path) if source_path else self.document
+        if document is None:
+            return self._error('export', 'missing_object', "내보낼 문서 없음")
+        for export_format, output_path in exports.items():
+            self.exported[output_path] = export_format
+            if self.write_files:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(dict(document.to_dict(), format=export_format), f,
+                              ensure_ascii=False)
+        return ScriptResult(True, operation='export',
+                            labels={'formats': ','.join(sorted(exports))})
+
+
+# 이름 → 백엔드 생성 함수 (config.json app_settings.render_backend 로 선택)
+RENDER_BACKENDS: Dict[str, Callable[..., RenderBackend]] = {
+    'applescript': ControllerBackend,
+    'memory': MemoryBackend
+}
+
+
+def register_backend(name: str, factory: Callable[..., RenderBackend]):
+    """백엔드 등록 (GUI 수정 없이 새 백엔드 추가)"""
+    RENDER_BACKENDS[name] = factory
+
+
+def create_backend(name: str, **options) -> RenderBackend:
+    """이름으로 백엔드 생성"""
+    if name not in RENDER_BACKENDS:
+        raise ValueError(f"알 수 없는 렌더 백엔드: {name} (사용 가능: {', '.join(RENDER_BACKENDS)})")
+    return RENDER_BACKENDS[name](**options)
+
+
+def _library_error(message: str) -> ScriptResult:
+    return ScriptResult(False, 'script_error', 'missing_object', message,
+                        operation='import_library_slides')
+
+
+def render_presentation(backend: RenderBackend, template_path: str, output_path: str,
+                        slides: Iterable[SlideData],
+                        progress: Optional[Callable[[str], None]] = None,
+                        library: Optional[SlideLibrary] = None) -> ScriptResult:
+    """템플릿을 열고 슬라이드를 backend.batch_size 개씩 추가한 뒤 저장
+
+    연속된 라이브러리 슬라이드(library_slide)는 add_library_slides 한 번으로 복제하며,
+    library 가 없으면 해당 슬라이드는 실패로 기록합니다.
+    발표자 노트/텍스트 서식은 슬라이드를 모두 추가한 뒤 annotate_slides 한 번으로 적용합니다
+    (Keynote 는 슬라이드마다 osascript 를 띄우지 않고 스크립트 하나로 처리).
+    템플릿 열기/저장에 실패하면 해당 ScriptResult 를, 성공하면 저장 결과를 반환합니다.
+    슬라이드/이미지 추가, 노트/서식 적용 실패는 기록하고 계속 진행합니다.
+    """
+    progress = progress or (lambda message: None)
+
+    result = backend.open_template(template_path, output_path)
+    if not result:
+        return result
+
+    total = len(slides) if hasattr(slides, '__len__') else None
+    done = added = 0
+    annotations: List[Tuple[int, SlideData]] = []
+    for from_library, group in itertools.groupby(
+            slides, key=lambda slide: slide.library_slide is not None):
+        while True:
+            batch = list(itertools.islice(
+                group, None if from_library else max(1, backend.batch_size)))
+            if not batch:
+                break
+            progress(f"슬라이드 {done + 1}/{total or '?'} 생성 중...")
+            if not from_library:
+                results = backend.add_slides(batch)
+            elif library is None:
+                results = [_library_error(f"슬라이드 라이브러리가 설정되지 않음: {slide.library_slide}")
+                           for slide in batch]
+                print(f"라이브러리 슬라이드 {len(batch)}장 건너뜀: slide_library 설정 없음")
+            else:
+                results = backend.add_library_slides(library, batch)
+            for slide, slide_result in zip(batch, results):
+                if slide_result:
+                    added += 1
+                    if slide.has_annotations:
+                        annotations.append((added, slide))
+            done += len(batch)
+
+    if annotations:
+        progress(f"발표자 노트/서식 적용 중... ({len(annotations)}장)")
+        annotate_result = backend.annotate_slides(annotations)
+        if not annotate_result:
+            print(f"노트/서식 적용 실패: {annotate_result.describe()}")
+        elif annotate_result.output not in ('', '0'):
+            print(f"노트/서식 적용 실패 슬라이드 {annotate_result.output}장")
+
+    return backend.save(output_path)
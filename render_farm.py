@@ -0,0 +1,829 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏭 원격 Mac 렌더 팜
+Linux 에서 만든 슬라이드 계획을 직렬화해 렌더 에이전트(Keynote 가 있는 Mac)들에 보내는 디스패처
+(에이전트 큐 길이 기준 부하 분산, 에이전트 실패 시 재시도, 이미지/템플릿은 내용 해시로 한 번만 전송)
+
+에이전트와는 단순한 HTTP + JSON 으로 통신합니다:
+    GET  /status                 에이전트 상태 (queue_depth 등)
+    POST /assets/missing         {"keys": [...]} 중 에이전트에 없는 자산 키
+    PUT  /assets/<key>           자산 업로드 (키 = sha256 + 확장자, 내용으로 검증)
+    POST /jobs                   {"job_id", "template", "plan", "output_ext"} 렌더 작업 제출
+    GET  /jobs/<id>              작업 상태
+    GET  /jobs/<id>/output       결과 파일
+    DELETE /jobs/<id>            결과 파일/작업 정리
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib import error as urllib_error
+from urllib import request as urllib_request
+
+from asset_index import ASSET_KEY_PATTERN, AssetIndex
+from keynote_generator_main import SlideData, create_slide_structure
+from render_backend import create_backend, render_presentation
+
+# 계획 안에서 자산(이미지/템플릿)을 가리키는 접두어
+ASSET_PREFIX = 'asset:'
+
+# 요청 본문 최대 크기 (자산 하나 또는 계획 하나)
+MAX_REQUEST_BYTES = 200 * 1024 * 1024
+
+# 실패한 에이전트를 다시 쓰기 전 대기 시간(초)
+AGENT_RETRY_AFTER = 5.0
+
+# 에이전트가 보관하는 끝난 작업 기록/결과 파일 (디스패처가 지우지 못한 작업은 이 한도로 정리)
+AGENT_JOB_TTL = 3600.0
+AGENT_MAX_JOBS = 1000
+
+# 에이전트 자산 폴더 최대 크기 (넘으면 가장 오래 쓰지 않은 자산부터 삭제)
+AGENT_MAX_ASSET_BYTES = 5 * 1024 * 1024 * 1024
+
+# 다른 에이전트에서 다시 시도할 렌더 오류 유형 (Keynote 멈춤/재시작, 자산 유실)
+RETRYABLE_ERRORS = {'timeout', 'app_not_running', 'launch_error', 'missing_asset'}
+
+
+class FarmError(Exception):
+    """에이전트 호출 오류 (retryable 이면 다른 에이전트에서 다시 시도)"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = True,
+                 error_class: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.error_class = error_class  # 에이전트에서 렌더가 실패했을 때의 오류 유형
+
+    @property
+    def agent_fault(self) -> bool:
+        """에이전트를 잠시 빼야 하는 오류인지 (연결 실패, 5xx, 재시도 가능한 렌더 오류)
+
+        큐가 가득 찬 503, 잘못된 요청(4xx), 계획 자체의 렌더 오류는 에이전트 고장이 아닙니다.
+        """
+        if self.error_class is not None:
+            return self.error_class in RETRYABLE_ERRORS
+        if self.status is None:
+            return True
+        return self.status >= 500 and self.status != 503
+
+
+def serialize_plan(slides, asset_key: Callable[[str], str]) -> Tuple[List[str], Dict[str, str]]:
+    """슬라이드 계획 → (JSON 줄 목록, 자산 키 → 로컬 경로), 이미지 경로는 자산 참조로 바꿈"""
+    lines = []
+    assets: Dict[str, str] = {}
+
+    def reference(path: str) -> str:
+        key = asset_key(path)
+        assets[key] = path
+        return ASSET_PREFIX + key
+
+    for slide in slides:
+        data = json.loads(slide.to_json())
+        if data['image_path'] and os.path.exists(data['image_path']):
+            data['image_path'] = reference(data['image_path'])
+        data['gallery'] = [(reference(path) if os.path.exists(path) else path, box)
+                           for path, box in data['gallery']]
+        lines.append(json.dumps(data, ensure_ascii=False))
+    return lines, assets
+
+
+def resolve_plan(lines: List[str], asset_dir: str) -> List[SlideData]:
+    """자산 참조를 에이전트의 자산 파일 경로로 바꿔 슬라이드 계획 복원"""
+    def resolve(path):
+        if isinstance(path, str) and path.startswith(ASSET_PREFIX):
+            key = path[len(ASSET_PREFIX):]
+            local_path = os.path.join(asset_dir, key)
+            if not ASSET_KEY_PATTERN.match(key) or not os.path.exists(local_path):
+                raise FileNotFoundError(key)
+            return local_path
+        return path
+
+    slides = []
+    for line in lines:
+        data = json.loads(line)
+        data['image_path'] = resolve(data.get('image_path'))
+        data['gallery'] = [(resolve(path), box) for path, box in data.get('gallery', [])]
+        slides.append(SlideData.from_json(json.dumps(data)))
+    return slides
+
+
+# ---------------------------------------------------------------------------
+# 렌더 에이전트
+# ---------------------------------------------------------------------------
+
+@dataclass
+class AgentJob:
+    """에이전트 작업"""
+    job_id: str
+    template: str
+    plan: List[str]
+    output_path: str
+    status: str = 'queued'  # queued, running, done, failed
+    error: Optional[str] = None
+    error_class: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'error': self.error,
+            'error_class': self.error_class,
+            'slide_count': len(self.plan),
+            'render_time': self.finished_at - self.started_at if self.finished_at else 0.0
+        }
+
+
+class RenderAgent:
+    """렌더 에이전트 (작업을 한 번에 하나씩 렌더 백엔드로 실행, Keynote 인스턴스는 하나)"""
+
+    def __init__(self, work_dir: str, backend_factory: Callable[[], object],
+                 queue_size: int = 100, agent_id: Optional[str] = None,
+                 job_ttl: float = AGENT_JOB_TTL, max_jobs: int = AGENT_MAX_JOBS,
+                 max_asset_bytes: int = AGENT_MAX_ASSET_BYTES):
+        self.agent_id = agent_id or uuid.uuid4().hex[:8]
+        self.job_ttl = job_ttl
+        self.max_jobs = max_jobs
+        self.max_asset_bytes = max_asset_bytes
+        self.asset_dir = os.path.join(work_dir, 'assets')
+        self.output_dir = os.path.join(work_dir, 'outputs')
+        os.makedirs(self.asset_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.backend_factory = backend_factory
+        self.queue_size = queue_size
+        self._queue: "queue.Queue[AgentJob]" = queue.Queue()
+        self._jobs: Dict[str, AgentJob] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self.completed = 0
+        self.failed = 0
+        self._worker = threading.Thread(target=self._work, name='render-agent', daemon=True)
+        self._worker.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """대기 + 실행 중 작업 수"""
+        return self._queue.qsize() + self._running
+
+    def status(self) -> Dict:
+        return {'agent_id': self.agent_id, 'queue_depth': self.queue_depth,
+                'completed': self.completed, 'failed': self.failed,
+                'assets': len(os.listdir(self.asset_dir))}
+
+    def asset_path(self, key: str) -> str:
+        if not ASSET_KEY_PATTERN.match(key):
+            raise FarmError(f"잘못된 자산 키: {key}", 400, retryable=False)
+        return os.path.join(self.asset_dir, key)
+
+    def missing_assets(self, keys: List[str]) -> List[str]:
+        return [key for key in keys if not os.path.exists(self.asset_path(key))]
+
+    def put_asset(self, key: str, data: bytes):
+        """자산 저장 (내용 해시가 키와 다르면 거부)"""
+        path = self.asset_path(key)
+        if hashlib.sha256(data).hexdigest() != key[:64]:
+            raise FarmError(f"자산 내용이 키와 다름: {key}", 400, retryable=False)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._evict_assets(keep=key)
+
+    def _evict_assets(self, keep: str):
+        """자산 폴더가 max_asset_bytes 를 넘으면 수정 시각(마지막 사용)이 오래된 자산부터 삭제
+
+        지운 자산을 쓰는 작업은 missing_asset 으로 실패하고 디스패처가 다시 올려 재시도합니다.
+        """
+        entries, total = [], 0
+        with os.scandir(self.asset_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith('.tmp') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+                total += stat.st_size
+        if total <= self.max_asset_bytes:
+            return
+        for _, name, size in sorted(entries):
+            if total <= self.max_asset_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.asset_dir, name))
+                total -= size
+            except OSError:
+                pass
+
+    def _touch_assets(self, paths):
+        """작업에 쓴 자산의 수정 시각을 갱신 (자산 정리에서 최근 사용으로 봄)"""
+        for path in paths:
+            if path and os.path.dirname(path) == self.asset_dir:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+
+    def submit(self, payload: Dict) -> AgentJob:
+        self._prune_jobs()
+        if self.queue_depth >= self.queue_size:
+            raise FarmError("에이전트 큐가 가득 찼습니다", 503)
+        job_id = payload.get('job_id') or uuid.uuid4().hex
+        output_ext = payload.get('output_ext', '.key')
+        if not re.match(r'^\.[A-Za-z0-9]{1,8}$', output_ext):
+            raise FarmError(f"잘못된 출력 확장자: {output_ext}", 400, retryable=False)
+        job = AgentJob(job_id=job_id, template=payload['template'], plan=payload['plan'],
+                       output_path=os.path.join(self.output_dir, job_id + output_ext))
+        with self._lock:
+            if job_id in self._jobs:
+                return self._jobs[job_id]
+            self._jobs[job_id] = job
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[AgentJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str):
+        """작업 기록과 결과 파일 삭제 (대기 중이면 실행하지 않고, 실행 중이면 끝난 뒤 결과를 지움)"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job:
+            self._remove_output(job)
+
+    @staticmethod
+    def _remove_output(job: AgentJob):
+        try:
+            os.remove(job.output_path)
+        except OSError:
+            pass
+
+    def _prune_jobs(self):
+        """job_ttl 보다 오래전에 끝난 작업과, 기록이 max_jobs 를 넘으면 가장 먼저 끝난 작업을 삭제"""
+        now = time.time()
+        with self._lock:
+            finished = sorted((job for job in self._jobs.values() if job.finished_at),
+                              key=lambda job: job.finished_at)
+            excess = len(self._jobs) - self.max_jobs
+            expired = [job for index, job in enumerate(finished)
+                       if index < excess or job.finished_at < now - self.job_ttl]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            self._remove_output(job)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                if self._jobs.get(job.job_id) is not job:
+                    continue  # 대기 중에 삭제된 작업
+            self._running = 1
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                self._render(job)
+            except Exception as e:
+                job.status, job.error, job.error_class = 'failed', str(e), 'agent_error'
+            finally:
+                job.finished_at = time.time()
+                if job.status == 'done':
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._running = 0
+            with self._lock:
+                removed = self._jobs.get(job.job_id) is not job
+            if removed:
+                self._remove_output(job)
+            self._prune_jobs()
+
+    def _render(self, job: AgentJob):
+        try:
+            template_path = self.asset_path(job.template)
+            if not os.path.exists(template_path):
+                raise FileNotFoundError(job.template)
+            slides = resolve_plan(job.plan, self.asset_dir)
+        except FileNotFoundError as e:
+            job.status, job.error, job.error_class = 'failed', f"자산 없음: {e}", 'missing_asset'
+            return
+        except ValueError as e:
+            job.status, job.error, job.error_class = 'failed', f"잘못된 계획: {e}", 'invalid_plan'
+            return
+        self._touch_assets([template_path]
+                           + [slide.image_path for slide in slides]
+                           + [path for slide in slides for path, _ in slide.gallery])
+
+        result = render_presentation(self.backend_factory(), template_path, job.output_path, slides)
+        if result:
+            job.status = 'done'
+        else:
+            job.status, job.error, job.error_class = 'failed', result.describe(), result.error_class
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """렌더 에이전트 HTTP 핸들러"""
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def agent(self) -> RenderAgent:
+        return self.server.agent
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length', 0))
+        if length > MAX_REQUEST_BYTES:
+            raise FarmError('요청이 너무 큽니다', 413, retryable=False)
+        return self.rfile.read(length)
+
+    def _parts(self) -> List[str]:
+        return [part for part in self.path.split('?')[0].split('/') if part]
+
+    def _handle(self, action: Callable[[], None]):
+        try:
+            action()
+        except FarmError as e:
+            self._send_json(e.status or 500, {'error': str(e)})
+        except (ValueError, KeyError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': f"잘못된 요청: {e}"})
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+    def do_PUT(self):
+        self._handle(self._put)
+
+    def do_DELETE(self):
+        parts = self._parts()
+        if len(parts) == 2 and parts[0] == 'jobs':
+            self.agent.remove(parts[1])
+            self._send_json(200, {'removed': parts[1]})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _get(self):
+        parts = self._parts()
+        if parts == ['status']:
+            self._send_json(200, self.agent.status())
+            return
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.agent.get(parts[1])
+            if job is None:
+                self._send_json(404, {'error': '작업 없음'})
+            elif len(parts) == 2:
+                self._send_json(200, {**job.to_dict(), 'queue_depth': self.agent.queue_depth})
+            elif parts[2] == 'output' and job.status == 'done' and os.path.isfile(job.output_path):
+                with open(job.output_path, 'rb') as f:
+                    data = f.read()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._send_json(404, {'error': '결과 없음'})
+            return
+        self._send_json(404, {'error': 'not found'})
+
+    def _post(self):
+        parts = self._parts()
+        body = json.loads(self._read_body().decode('utf-8'))
+        if parts == ['assets', 'missing']:
+            self._send_json(200, {'missing': self.agent.missing_assets(body['keys'])})
+        elif parts == ['jobs']:
+            job = self.agent.submit(body)
+            self._send_json(202, {**job.to_dict(), 'queue_depth': self.agent.queue_depth})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _put(self):
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != 'assets':
+            self._send_json(404, {'error': 'not found'})
+            return
+        self.agent.put_asset(parts[1], self._read_body())
+        self._send_json(201, {'key': parts[1]})
+
+
+class AgentHTTPServer(ThreadingHTTPServer):
+    """렌더 에이전트 HTTP 서버"""
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def create_agent_server(agent: RenderAgent, host: str = '127.0.0.1', port: int = 8780,
+                        verbose: bool = False) -> AgentHTTPServer:
+    """에이전트 HTTP 서버 생성 (port=0 이면 임의 포트)"""
+    server = AgentHTTPServer((host, port), AgentRequestHandler)
+    server.agent = agent
+    server.verbose = verbose
+    return server
+
+
+# ---------------------------------------------------------------------------
+# 디스패처
+# ---------------------------------------------------------------------------
+
+@dataclass
+class AgentState:
+    """디스패처가 보는 에이전트 상태"""
+    url: str
+    queue_depth: int = 0       # 에이전트가 마지막으로 알려 준 큐 길이
+    reserved: int = 0          # 골랐지만 아직 제출하지 않은 작업 (자산 전송 중)
+    down_until: float = 0.0
+    assets: Set[str] = field(default_factory=set)  # 에이전트에 있다고 확인한 자산
+    dispatched: int = 0
+    failures: int = 0
+    # 같은 자산을 동시에 두 번 올리지 않도록 에이전트별 자산 전송은 하나씩
+    upload_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def load(self) -> int:
+        return self.queue_depth + self.reserved
+
+
+class RenderFarm:
+    """렌더 팜 디스패처
+
+    작업마다 큐가 가장 짧은 에이전트를 고르고(같으면 보낸 작업이 적은 쪽), 에이전트에 없는
+    자산만 올린 뒤 계획을 제출하고 결과 파일을 받아 output_path 에 씁니다. 연결 실패, 5xx,
+    재시도 가능한 렌더 오류는 그 에이전트를 잠시 빼고 다른 에이전트에서 다시 시도합니다.
+    """
+
+    def __init__(self, agent_urls: List[str], max_attempts: int = 3, poll_interval: float = 0.02,
+                 job_timeout: float = 600.0, max_workers: Optional[int] = None,
+                 request_timeout: float = 30.0):
+        if not agent_urls:
+            raise ValueError("에이전트가 하나 이상 필요합니다")
+        self.agents = [AgentState(url.rstrip('/')) for url in agent_urls]
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self.request_timeout = request_timeout
+        self.asset_index = AssetIndex()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or 4 * len(agent_urls),
+                                            thread_name_prefix='render-farm')
+        self.counters = {'jobs': 0, 'succeeded': 0, 'failed': 0, 'retries': 0,
+                         'assets_uploaded': 0, 'bytes_uploaded': 0, 'asset_cache_hits': 0}
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def _call(self, agent: AgentState, method: str, path: str, body: Optional[Dict] = None,
+              data: Optional[bytes] = None, raw: bool = False):
+        """에이전트 호출 (연결 실패/5xx 는 retryable FarmError)"""
+        headers = {}
+        if body is not None:
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        req = urllib_request.Request(agent.url + path, data=data, method=method, headers=headers)
+        try:
+            with urllib_request.urlopen(req, timeout=self.request_timeout) as response:
+                payload = response.read()
+        except urllib_error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode('utf-8')).get('error', str(e))
+            except ValueError:
+                message = str(e)
+            raise FarmError(f"{agent.url}: {message}", e.code,
+                            retryable=e.code >= 500 or e.code == 503)
+        except (urllib_error.URLError, OSError) as e:
+            raise FarmError(f"{agent.url}: {e}")
+        return payload if raw else json.loads(payload.decode('utf-8'))
+
+    def _choose_agent(self, exclude: Set[str]) -> Optional[AgentState]:
+        """사용 가능한 에이전트 중 큐가 가장 짧은 것 (고른 에이전트는 reserved 증가)"""
+        now = time.time()
+        with self._lock:
+            candidates = [agent for agent in self.agents
+                          if agent.down_until <= now and agent.url not in exclude]
+            if not candidates:
+                return None
+            agent = min(candidates, key=lambda state: (state.load, state.dispatched))
+            agent.reserved += 1
+            agent.dispatched += 1
+            return agent
+
+    def _mark_down(self, agent: AgentState):
+        with self._lock:
+            agent.failures += 1
+            agent.down_until = time.time() + AGENT_RETRY_AFTER
+            agent.assets.clear()  # 다시 살아났을 때 자산이 남아 있는지 모름
+
+    def _ensure_assets(self, agent: AgentState, assets: Dict[str, str]):
+        """에이전트에 없는 자산만 업로드"""
+        with agent.upload_lock:
+            with self._lock:
+                unknown = [key for key in assets if key not in agent.assets]
+            self._count('asset_cache_hits', len(assets) - len(unknown))
+            if not unknown:
+                return
+            missing = self._call(agent, 'POST', '/assets/missing', {'keys': unknown})['missing']
+            self._count('asset_cache_hits', len(unknown) - len(missing))
+            for key in missing:
+                with open(assets[key], 'rb') as f:
+                    data = f.read()
+                self._call(agent, 'PUT', f"/assets/{key}", data=data)
+                self._count('assets_uploaded')
+                self._count('bytes_uploaded', len(data))
+            with self._lock:
+                agent.assets.update(unknown)
+
+    def _run_on(self, agent: AgentState, template_key: str, lines: List[str],
+                assets: Dict[str, str], output_path: str) -> Dict:
+        """에이전트 하나에서 작업 실행 (결과 파일을 output_path 에 씀)"""
+        job_id = uuid.uuid4().hex
+        delete_job = False
+        try:
+            try:
+                self._ensure_assets(agent, assets)
+                delete_job = True
+                job = self._call(agent, 'POST', '/jobs', {
+                    'job_id': job_id, 'template': template_key, 'plan': lines,
+                    'output_ext': os.path.splitext(output_path)[1] or '.key'})
+            finally:
+                with self._lock:
+                    agent.reserved -= 1
+
+            deadline = time.time() + self.job_timeout
+            while True:
+                agent.queue_depth = job.get('queue_depth', agent.queue_depth)
+                if job['status'] not in ('queued', 'running'):
+                    break
+                if time.time() > deadline:
+                    raise FarmError(f"{agent.url}: {self.job_timeout}초 안에 끝나지 않음",
+                                    error_class='timeout')
+                time.sleep(self.poll_interval)
+                job = self._call(agent, 'GET', f"/jobs/{job_id}")
+
+            if job['status'] != 'done':
+                if job.get('error_class') == 'missing_asset':
+                    with self._lock:
+                        agent.assets.clear()
+                error_class = job.get('error_class') or 'agent_error'
+                raise FarmError(f"{agent.url}: {job.get('error')}",
+                                retryable=error_class in RETRYABLE_ERRORS, error_class=error_class)
+
+            data = self._call(agent, 'GET', f"/jobs/{job_id}/output", raw=True)
+        except FarmError as e:
+            # 연결이 끊긴 에이전트는 정리 요청도 실패하므로 에이전트의 보관 한도에 맡김
+            if e.status is None and e.error_class is None:
+                delete_job = False
+            raise
+        finally:
+            if delete_job:
+                self._delete_job(agent, job_id)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        temp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, output_path)
+        return job
+
+    def _delete_job(self, agent: AgentState, job_id: str):
+        """에이전트의 작업 기록/결과 파일 삭제 (실패해도 무시, 에이전트가 한도로 정리)"""
+        try:
+            self._call(agent, 'DELETE', f"/jobs/{job_id}")
+        except FarmError:
+            pass
+
+    def render(self, slides, template_path: str, output_path: str) -> Dict:
+        """슬라이드 계획을 렌더링해 output_path 에 저장 (실패하면 FarmError)"""
+        if os.path.isdir(template_path):
+            raise FarmError(f"패키지 폴더 템플릿은 보낼 수 없습니다: {template_path}", retryable=False)
+        self._count('jobs')
+        start_time = time.perf_counter()
+        lines, assets = serialize_plan(slides, self.asset_index.key)
+        template_key = self.asset_index.key(template_path)
+        assets[template_key] = template_path
+
+        tried: Set[str] = set()
+        last_error: Optional[FarmError] = None
+        for attempt in range(1, self.max_attempts + 1):
+            agent = self._choose_agent(tried) or self._choose_agent(set())
+            if agent is None:
+                # 모든 에이전트가 잠시 빠져 있으면 가장 먼저 돌아오는 에이전트를 기다림
+                time.sleep(max(0.0, min(state.down_until for state in self.agents) - time.time()))
+                agent = self._choose_agent(set())
+                if agent is None:
+                    continue
+            if attempt > 1:
+                self._count('retries')
+            try:
+                job = self._run_on(agent, template_key, lines, assets, output_path)
+            except FarmError as e:
+                last_error = e
+                tried.add(agent.url)
+                if e.agent_fault:
+                    self._mark_down(agent)
+                if not e.retryable:
+                    break
+                continue
+            self._count('succeeded')
+            return {'output_path': output_path, 'agent': agent.url, 'attempts': attempt,
+                    'slides': len(lines), 'render_time': job.get('render_time', 0.0),
+                    'elapsed': time.perf_counter() - start_time}
+
+        self._count('failed')
+        raise last_error or FarmError("사용 가능한 에이전트 없음")
+
+    def submit(self, slides, template_path: str, output_path: str) -> Future:
+        """렌더 작업을 백그라운드로 제출 (결과는 render 의 반환값)"""
+        slides = list(slides)
+        return self._executor.submit(self.render, slides, template_path, output_path)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'agents': [{'url': agent.url, 'dispatched': agent.dispatched,
+                            'failures': agent.failures, 'queue_depth': agent.queue_depth,
+                            'known_assets': len(agent.assets)} for agent in self.agents]
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+# ---------------------------------------------------------------------------
+# 로컬 대역 에이전트 (Linux 한 대에서 스케줄링/전송 개발용)
+# ---------------------------------------------------------------------------
+
+def spawn_local_agents(count: int, work_dir: str, backend: str = 'memory',
+                       slide_latency: float = 0.0) -> List[Tuple[subprocess.Popen, str]]:
+    """로컬 에이전트 프로세스 실행 → [(프로세스, URL)]"""
+    agents = []
+    for index in range(count):
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'agent', '--port', '0',
+             '--work-dir', os.path.join(work_dir, f"agent{index}"), '--backend', backend,
+             '--slide-latency', str(slide_latency), '--agent-id', f"local{index}"],
+            stdout=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        line = process.stdout.readline().strip()
+        if not line.startswith('READY '):
+            process.kill()
+            raise RuntimeError(f"에이전트 시작 실패: {line}")
+        agents.append((process, line.split(' ', 1)[1]))
+    return agents
+
+
+def stop_local_agents(agents: List[Tuple[subprocess.Popen, str]]):
+    for process, _ in agents:
+        if process.poll() is None:
+            process.terminate()
+    for process, _ in agents:
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        if process.stdout:
+            process.stdout.close()
+
+
+def run_benchmark(agent_count: int = 3, jobs: int = 30, slides_per_job: int = 20,
+                  images: int = 10, slide_latency: float = 0.005, kill_one: bool = False) -> Dict:
+    """로컬 대역 에이전트로 디스패처 처리량/부하 분산/자산 캐시 측정"""
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        image_items = []
+        for index in range(images):
+            path = os.path.join(work_dir, f"image{index}.png")
+            Image.new('RGB', (320 + 40 * index, 240), (index * 20 % 256, 90, 160)).save(path)
+            image_items.append({'path': path, 'name': os.path.basename(path)})
+        template_path = os.path.join(work_dir, 'template.key')
+        with open(template_path, 'wb') as f:
+            f.write(os.urandom(256 * 1024))
+
+        plans = []
+        for job in range(jobs):
+            text = f"렌더 팜 {job}\n\n" + "\n\n".join(
+                f"문단 {i}\n• 항목 하나\n• 항목 둘" for i in range(slides_per_job))
+            plans.append(create_slide_structure(text, image_items[:1 + job % images]))
+
+        agents = spawn_local_agents(agent_count, work_dir, slide_latency=slide_latency)
+        farm = RenderFarm([url for _, url in agents])
+        try:
+            start_time = time.perf_counter()
+            futures = [farm.submit(plan, template_path, os.path.join(work_dir, 'out', f"{i}.json"))
+                       for i, plan in enumerate(plans)]
+            if kill_one:
+                time.sleep(slide_latency * slides_per_job)
+                agents[0][0].kill()
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except FarmError as e:
+                    results.append({'error': str(e)})
+            elapsed = time.perf_counter() - start_time
+        finally:
+            farm.shutdown()
+            stop_local_agents(agents)
+
+    return {'jobs': jobs, 'elapsed': elapsed, 'throughput': jobs / elapsed,
+            'failed': sum(1 for result in results if 'error' in result),
+            'retried': sum(1 for result in results if result.get('attempts', 1) > 1),
+            'metrics': farm.metrics()}
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="원격 Mac 렌더 팜")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    agent = subparsers.add_parser('agent', help="렌더 에이전트 실행")
+    agent.add_argument('--host', default='127.0.0.1')
+    agent.add_argument('--port', type=int, default=8780)
+    agent.add_argument('--work-dir', default=os.path.join('cache', 'render_agent'))
+    agent.add_argument('--backend', default='applescript', help="렌더 백엔드 (applescript, memory)")
+    agent.add_argument('--slide-latency', type=float, default=0.0,
+                       help="memory 백엔드 슬라이드당 지연(초)")
+    agent.add_argument('--queue-size', type=int, default=100)
+    agent.add_argument('--agent-id')
+    agent.add_argument('--job-ttl', type=float, default=AGENT_JOB_TTL,
+                       help="끝난 작업 기록/결과 보관 시간(초)")
+    agent.add_argument('--max-asset-mb', type=int, default=AGENT_MAX_ASSET_BYTES // (1024 * 1024),
+                       help="자산 폴더 최대 크기(MB)")
+    agent.add_argument('--verbose', action='store_true')
+
+    bench = subparsers.add_parser('bench', help="로컬 대역 에이전트로 디스패처 벤치마크")
+    bench.add_argument('--agents', type=int, default=3)
+    bench.add_argument('--jobs', type=int, default=30)
+    bench.add_argument('--slides', type=int, default=20, help="작업당 문단 수")
+    bench.add_argument('--images', type=int, default=10)
+    bench.add_argument('--slide-latency', type=float, default=0.005)
+    bench.add_argument('--kill-one', action='store_true', help="실행 중 에이전트 하나를 종료해 재시도 확인")
+
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        report = run_benchmark(args.agents, args.jobs, args.slides, args.images,
+                               args.slide_latency, args.kill_one)
+        counters = report['metrics']['counters']
+        print(f"🏭 {report['jobs']}개 작업 {report['elapsed']:.2f}초 "
+              f"({report['throughput']:.1f} jobs/s), 실패 {report['failed']}, "
+              f"재시도된 작업 {report['retried']}")
+        print(f"📦 자산 업로드 {counters['assets_uploaded']}개 "
+              f"({counters['bytes_uploaded'] / 1024:.0f}KB), 캐시 적중 {counters['asset_cache_hits']}회")
+        for state in report['metrics']['agents']:
+            print(f"   {state['url']}: 작업 {state['dispatched']}개, 실패 {state['failures']}회")
+        return report['failed'] == 0
+
+    if args.backend == 'memory':
+        def backend_factory():
+            return create_backend('memory', write_files=True, slide_latency=args.slide_latency)
+    else:
+        def backend_factory():
+            return create_backend(args.backend)
+    render_agent = RenderAgent(args.work_dir, backend_factory, args.queue_size, args.agent_id,
+                               job_ttl=args.job_ttl, max_asset_bytes=args.max_asset_mb * 1024 * 1024)
+    server = create_agent_server(render_agent, args.host, args.port, args.verbose)
+    # 로컬 대역 에이전트를 띄운 쪽이 포트를 알 수 있도록 첫 줄에 주소 출력
+    print(f"READY http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
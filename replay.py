@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔁 생성 재현 번들
+실행 입력(텍스트, 이미지 해시/경로, 템플릿 해시, 계획에 영향을 주는 설정), 확정된 SlideData 계획,
+컨트롤러 호출 순서와 시간을 zip 번들로 기록하고, 실제 Keynote 또는 가짜 백엔드로 다시 실행해 비교
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from app_config import AppConfig
+from image_assignment import ImageAssigner
+from keynote_generator_main import (AppleScriptController, ContentAnalyzer, LayoutSelector,
+                                    ScriptResult, SlideData, create_slide_structure,
+                                    generate_presentation)
+from resource_limits import ResourceLimits
+from slide_library import SlideLibrary
+from text_fitting import TextFitter
+
+BUNDLE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# 슬라이드 계획을 바꾸는 config.json 섹션 (레이아웃 규칙/layout_optimization, 이미지 위치, 한도)
+PLAN_CONFIG_SECTIONS = ('layout_rules', 'ai_settings', 'image_settings', 'resource_limits')
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """파일 sha256 (없으면 None)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def encode_value(value):
+    """호출 인자를 JSON 으로 저장할 수 있는 값으로 변환"""
+    if isinstance(value, SlideData):
+        return {'__slide__': json.loads(value.to_json())}
+    if isinstance(value, SlideLibrary):
+        return {'__library__': asdict(value)}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    return value
+
+
+class RecordingController:
+    """컨트롤러 호출을 순서대로 기록하는 래퍼 (메서드 이름, 인자, 결과, 시작 시각, 걸린 시간)"""
+
+    def __init__(self, controller=AppleScriptController):
+        self.controller = controller
+        self.calls: List[Dict] = []
+        self._started = time.perf_counter()
+
+    def __getattr__(self, name):
+        target = getattr(self.controller, name)
+        if not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            result = target(*args, **kwargs)
+            self.calls.append({
+                'method': name,
+                'args': encode_value(list(args)),
+                'kwargs': encode_value(kwargs),
+                'start': start - self._started,
+                'duration': time.perf_counter() - start,
+                'success': bool(result),
+                'status': getattr(result, 'status', None),
+                'error_class': getattr(result, 'error_class', None)
+            })
+            return result
+        return call
+
+
+class FakeController:
+    """모든 호출에 성공을 반환하는 가짜 백엔드
+
+    latencies 를 주면 호출 순서대로 그 시간만큼 기다려 기록된 실행 시간을 흉내 냅니다.
+    """
+
+    def __init__(self, latencies: Optional[List[float]] = None):
+        self.latencies = list(latencies or [])
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            if self.latencies:
+                time.sleep(self.latencies.pop(0))
+            return ScriptResult(True, operation=name)
+        return call
+
+
+def write_bundle(bundle_path: str, text: str, images: List[Dict], template_path: str,
+                 output_path: str, plan: List[SlideData], calls: List[Dict],
+                 timings: Dict[str, float], include_images: bool = True,
+                 library: Optional[SlideLibrary] = None, config: Optional[Dict] = None) -> str:
+    """재현 번들(zip) 저장 - include_images 면 이미지 원본도 해시 이름으로 함께 저장
+
+    library 는 이번 실행에 쓴 슬라이드 라이브러리 (경로와 이름 → 번호만 기록),
+    config 는 계획에 쓴 config.json dict (PLAN_CONFIG_SECTIONS 만 기록, 없으면 기본 설정)
+    """
+    image_entries = []
+    for image in images:
+        digest = file_sha256(image['path'])
+        entry = {'path': image['path'], 'name': image.get('name'), 'sha256': digest}
+        if include_images and digest:
+            entry['member'] = f"images/{digest}{os.path.splitext(image['path'])[1].lower()}"
+        image_entries.append(entry)
+
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'created_at': time.time(),
+        'text': text,
+        'images': image_entries,
+        'template': {'path': template_path, 'sha256': file_sha256(template_path)},
+        'output_path': output_path,
+        'plan': [json.loads(slide.to_json()) for slide in plan],
+        'calls': calls,
+        'timings': timings,
+        'library': asdict(library) if library else None,
+        'config': {section: config[section] for section in PLAN_CONFIG_SECTIONS
+                   if section in (config or {})}
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(bundle_path)), exist_ok=True)
+    temp_path = f"{bundle_path}.tmp"
+    with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=1))
+        written = set()
+        for entry in image_entries:
+            member = entry.get('member')
+            if member and member not in written:
+                # 이미지는 이미 압축되어 있으므로 그대로 저장
+                archive.write(entry['path'], member, compress_type=zipfile.ZIP_STORED)
+                written.add(member)
+    os.replace(temp_path, bundle_path)
+    return bundle_path
+
+
+def load_bundle(bundle_path: str) -> Dict:
+    """번들 manifest 읽기"""
+    with zipfile.ZipFile(bundle_path) as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME).decode('utf-8'))
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"지원하지 않는 번들 버전: {manifest.get('version')}")
+    return manifest
+
+
+def resolve_images(bundle_path: str, manifest: Dict, work_dir: str) -> List[Dict]:
+    """재실행에 쓸 이미지 목록 (번들에 들어 있으면 꺼내 쓰고, 없으면 원래 경로)"""
+    images = []
+    with zipfile.ZipFile(bundle_path) as archive:
+        for entry in manifest['images']:
+            path = entry['path']
+            member = entry.get('member')
+            if member:
+                path = os.path.join(work_dir, member)
+                if not os.path.exists(path):
+                    archive.extract(member, work_dir)
+            elif entry.get('sha256') and file_sha256(path) != entry['sha256']:
+                print(f"⚠️  이미지가 기록과 다름: {path}")
+            images.append({'path': path, 'name': entry.get('name'), 'sha256': entry.get('sha256')})
+    return images
+
+
+def plan_slides(manifest: Dict, images: List[Dict]) -> List[SlideData]:
+    """기록된 설정으로 다시 계획 (레이아웃 규칙은 계획하는 동안만 바꿨다가 되돌림)"""
+    config = AppConfig.parse(manifest.get('config') or {})
+    text_fitter = TextFitter()
+    image_assigner = ImageAssigner(text_fitter, config.image.positions or None,
+                                   analyze_image=ContentAnalyzer.analyze_image)
+    previous_rules = LayoutSelector.LAYOUT_RULES
+    LayoutSelector.configure(config.effective_layout_rules)
+    try:
+        return list(create_slide_structure(manifest['text'], images, text_fitter, image_assigner,
+                                           limits=ResourceLimits.from_config(config.raw)))
+    finally:
+        LayoutSelector.LAYOUT_RULES = previous_rules
+
+
+def normalize(value, path_map: Dict[str, str]):
+    """비교용으로 이미지 경로를 해시로 바꾼 값"""
+    if isinstance(value, str):
+        return path_map.get(value, value)
+    if isinstance(value, list):
+        return [normalize(item, path_map) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize(item, path_map) for key, item in value.items()}
+    return value
+
+
+def replay(bundle_path: str, controller=None, use_recorded_plan: bool = False,
+           output_path: Optional[str] = None, slide_delay: float = 0.0) -> Dict:
+    """번들을 다시 실행하고 기록과 비교한 보고서 반환
+
+    controller 가 없으면 FakeController 를 사용합니다. 실제 Keynote 로 재실행하려면
+    AppleScriptController 와 slide_delay=0.5 를 넘기세요.
+    """
+    manifest = load_bundle(bundle_path)
+    work_dir = tempfile.mkdtemp(prefix='replay-')
+    try:
+        images = resolve_images(bundle_path, manifest, work_dir)
+        path_map = {image['path']: f"sha256:{image['sha256']}" for image in images}
+        path_map.update({entry['path']: f"sha256:{entry['sha256']}" for entry in manifest['images']})
+
+        template = manifest['template']
+        template_changed = file_sha256(template['path']) != template['sha256']
+
+        start = time.perf_counter()
+        plan = plan_slides(manifest, images)
+        plan_time = time.perf_counter() - start
+        new_plan = [json.loads(slide.to_json()) for slide in plan]
+        plan_matches = normalize(new_plan, path_map) == normalize(manifest['plan'], path_map)
+
+        if use_recorded_plan:
+            recorded_paths = {entry['path']: image['path']
+                              for entry, image in zip(manifest['images'], images)}
+            plan = [SlideData.from_json(json.dumps(normalize(slide, recorded_paths)))
+                    for slide in manifest['plan']]
+
+        recorder = RecordingController(controller or FakeController())
+        output_path = output_path or os.path.join(work_dir, 'replay.key')
+        path_map.update({manifest['output_path']: 'output', output_path: 'output'})
+        start = time.perf_counter()
+        library = manifest.get('library')
+        result = generate_presentation(template['path'], output_path, plan, controller=recorder,
+                                       slide_delay=slide_delay,
+                                       library=SlideLibrary(**library) if library else None)
+        generate_time = time.perf_counter() - start
+
+        def call_signature(call):
+            return call['method'], normalize(call['args'], path_map)
+
+        recorded_calls = manifest['calls']
+        calls_match = ([call_signature(call) for call in recorder.calls] ==
+                       [call_signature(call) for call in recorded_calls])
+
+        return {
+            'template_changed': template_changed,
+            'plan_matches': plan_matches,
+            'calls_match': calls_match,
+            'success': bool(result),
+            'plan_slides': (len(manifest['plan']), len(new_plan)),
+            'calls': (len(recorded_calls), len(recorder.calls)),
+            'timings': {
+                'plan': (manifest['timings'].get('plan', 0.0), plan_time),
+                'generate': (manifest['timings'].get('generate', 0.0), generate_time)
+            },
+            'slowest_recorded': sorted(recorded_calls, key=lambda call: call['duration'],
+                                       reverse=True)[:5],
+            'replayed_calls': recorder.calls
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_replay_report(report: Dict):
+    """재실행 보고서 출력"""
+    def mark(ok):
+        return "✅" if ok else "❌"
+
+    print(f"{mark(not report['template_changed'])} 템플릿 "
+          f"{'변경됨' if report['template_changed'] else '동일'}")
+    print(f"{mark(report['plan_matches'])} 슬라이드 계획 "
+          f"(기록 {report['plan_slides'][0]}장 / 재실행 {report['plan_slides'][1]}장)")
+    print(f"{mark(report['calls_match'])} 컨트롤러 호출 순서 "
+          f"(기록 {report['calls'][0]}회 / 재실행 {report['calls'][1]}회)")
+    for name, (recorded, replayed) in report['timings'].items():
+        print(f"⏱️  {name:8} 기록 {recorded:.3f}초 → 재실행 {replayed:.3f}초")
+    print("🐢 기록에서 가장 오래 걸린 호출:")
+    for call in report['slowest_recorded']:
+        print(f"   {call['duration']:.3f}초  {call['method']}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="생성 재현 번들 재실행")
+    parser.add_argument('bundle', help="재현 번들 (.zip)")
+    parser.add_argument('--backend', choices=['fake', 'keynote'], default='fake',
+                        help="fake: 호출만 기록하는 가짜 백엔드, keynote: 실제 Keynote")
+    parser.add_argument('--simulate-latency', action='store_true',
+                        help="가짜 백엔드에서 기록된 호출 시간만큼 기다림")
+    parser.add_argument('--recorded-plan', action='store_true',
+                        help="다시 계획하지 않고 기록된 SlideData 계획으로 실행")
+    parser.add_argument('--output', help="재실행 결과 .key 경로 (keynote 백엔드)")
+    args = parser.parse_args()
+
+    if args.backend == 'keynote':
+        controller, slide_delay = AppleScriptController, 0.5
+    else:
+        latencies = None
+        if args.simulate_latency:
+            latencies = [call['duration'] for call in load_bundle(args.bundle)['calls']]
+        controller, slide_delay = FakeController(latencies), 0.0
+
+    report = replay(args.bundle, controller, args.recorded_plan, args.output, slide_delay)
+    print_replay_report(report)
+    return report['success'] and report['plan_matches'] and report['calls_match']
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
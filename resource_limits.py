@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧮 자원 한도와 메모리 제한 처리
+config.json 의 resource_limits 로 슬라이드/이미지 수와 메모리 사용량을 제한하고,
+한도를 넘는 슬라이드 계획과 미리보기 이미지는 디스크로 내려보냄
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import hashlib
+import itertools
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+MB = 1024 * 1024
+
+
+class ResourceLimitError(Exception):
+    """자원 한도 초과"""
+
+
+@dataclass
+class ResourceLimits:
+    """자원 한도 (config.json resource_limits + image_settings.max_file_size_mb)"""
+    max_slides: int = 1000
+    max_images: int = 10000
+    max_image_bytes: int = 50 * MB
+    max_memory_bytes: int = 256 * MB
+    spill_dir: Optional[str] = None  # None 이면 시스템 임시 폴더
+    supported_formats: Tuple[str, ...] = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "ResourceLimits":
+        config = config or {}
+        limits = config.get('resource_limits', {})
+        image_settings = config.get('image_settings', {})
+        defaults = cls()
+
+        def setting(section: Dict, key: str, default):
+            # null 은 항목이 없는 것과 같이 기본값
+            value = section.get(key)
+            return default if value is None else value
+
+        return cls(
+            max_slides=int(setting(limits, 'max_slides', defaults.max_slides)),
+            max_images=int(setting(limits, 'max_images', defaults.max_images)),
+            max_image_bytes=int(setting(image_settings, 'max_file_size_mb',
+                                        defaults.max_image_bytes / MB) * MB),
+            max_memory_bytes=int(setting(limits, 'max_memory_mb', defaults.max_memory_bytes / MB) * MB),
+            spill_dir=limits.get('spill_dir'),
+            supported_formats=tuple(image_settings.get('supported_formats',
+                                                       defaults.supported_formats))
+        )
+
+    @property
+    def plan_memory_bytes(self) -> int:
+        """슬라이드 계획에 쓰는 메모리 한도 (전체의 절반)"""
+        return self.max_memory_bytes // 2
+
+    @property
+    def image_cache_bytes(self) -> int:
+        """미리보기 이미지 캐시에 쓰는 메모리 한도 (전체의 절반)"""
+        return self.max_memory_bytes // 2
+
+    def check_image(self, path: str) -> Optional[str]:
+        """이미지를 추가할 수 없는 이유 (추가할 수 있으면 None)"""
+        if os.path.splitext(path)[1].lower() not in self.supported_formats:
+            return "지원하지 않는 형식"
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return "파일을 읽을 수 없음"
+        if size > self.max_image_bytes:
+            return f"{size / MB:.1f}MB > {self.max_image_bytes / MB:.0f}MB"
+        return None
+
+    def make_spill_dir(self) -> str:
+        """디스크로 내려보낼 파일을 둘 폴더"""
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            return self.spill_dir
+        return tempfile.gettempdir()
+
+
+class SpillList(Generic[T]):
+    """메모리 한도를 넘으면 앞쪽 항목을 디스크(줄 단위 파일)로 내려보내는 추가 전용 목록
+
+    순서대로 추가하고 순서대로 읽는 슬라이드 계획용이며, 항목은 encode/decode 로
+    줄바꿈 없는 한 줄 문자열(JSON 등)과 변환합니다. 한도 안이면 디스크를 전혀 쓰지 않습니다.
+    반복자와 인덱싱은 각자 파일을 따로 열어 읽으므로 여러 스레드가 동시에 읽어도 됩니다.
+    """
+
+    def __init__(self, max_bytes: int, encode: Callable[[T], str], decode: Callable[[str], T],
+                 spill_dir: Optional[str] = None, sizeof: Optional[Callable[[T], int]] = None):
+        self.max_bytes = max_bytes
+        self.encode = encode
+        self.decode = decode
+        # 항목 크기 추정 (없으면 인코딩한 길이로 계산하지만 항목마다 인코딩이 한 번 더 듦)
+        self.sizeof = sizeof or (lambda item: len(encode(item).encode('utf-8')))
+        self.spill_dir = spill_dir or tempfile.gettempdir()
+        self._items: List[T] = []
+        self._item_bytes = 0
+        self._spilled = 0
+        self._spill_file = None
+        self._spill_path: Optional[str] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def append(self, item: T):
+        self._items.append(item)
+        self._item_bytes += self.sizeof(item)
+        if self._item_bytes > self.max_bytes:
+            self._spill()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def _spill(self):
+        """메모리에 있는 항목을 모두 파일 끝에 씀"""
+        if self._spill_file is None:
+            fd, self._spill_path = tempfile.mkstemp(dir=self.spill_dir, prefix='plan-', suffix='.jsonl')
+            self._spill_file = open(fd, 'w', encoding='utf-8', newline='\n')
+            # close() 를 부르지 않고 버려져도 파일은 지움
+            self._finalizer = weakref.finalize(self, _remove_spill_file, self._spill_file, self._spill_path)
+        for item in self._items:
+            self._spill_file.write(self.encode(item) + '\n')
+        self._spill_file.flush()
+        self._spilled += len(self._items)
+        self._items = []
+        self._item_bytes = 0
+
+    @property
+    def spilled(self) -> int:
+        """디스크에 있는 항목 수"""
+        return self._spilled
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iter(self._spilled, self._spill_path, list(self._items))
+
+    def _iter(self, spilled: int, path: Optional[str], items: List[T]) -> Iterator[T]:
+        # 반복을 시작한 시점의 항목만 읽고, 파일은 반복자마다 새로 열어 위치를 공유하지 않음
+        if spilled:
+            with open(path, 'r', encoding='utf-8', newline='\n') as reader:
+                for _ in range(spilled):
+                    yield self.decode(reader.readline()[:-1])
+        yield from items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(itertools.islice(iter(self), *index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return next(itertools.islice(iter(self), index, None))
+
+    def close(self):
+        """디스크 파일 삭제"""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._spill_file = self._spill_path = None
+        self._items = []
+        self._spilled = 0
+
+
+def _remove_spill_file(spill_file, path: str):
+    spill_file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class BoundedImageCache:
+    """바이트 한도가 있는 LRU 이미지 캐시 (밀려난 이미지는 PNG 로 디스크에 보관)"""
+
+    def __init__(self, max_bytes: int, spill_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix='preview-', dir=spill_dir)
+        else:
+            self.spill_dir = tempfile.mkdtemp(prefix='keynote-preview-')
+        self._images: "OrderedDict[str, object]" = OrderedDict()
+        self._bytes = 0
+        # close() 를 부르지 않고 버려지거나 프로그램이 끝나도 폴더는 지움
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.spill_dir, ignore_errors=True)
+
+    @staticmethod
+    def _image_bytes(image) -> int:
+        return image.width * image.height * len(image.getbands())
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def get(self, key: str):
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            return None
+        from PIL import Image
+        with Image.open(path) as spilled:
+            image = spilled.copy()
+        self.put(key, image)
+        return image
+
+    def put(self, key: str, image):
+        if key in self._images:
+            self._bytes -= self._image_bytes(self._images.pop(key))
+        self._images[key] = image
+        self._bytes += self._image_bytes(image)
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            old_key, old_image = self._images.popitem(last=False)
+            self._bytes -= self._image_bytes(old_image)
+            path = self._spill_path(old_key)
+            if self._finalizer.alive and not os.path.exists(path):  # 닫힌 뒤에는 버림
+                old_image.save(path, 'PNG')
+
+    def clear(self):
+        self._images.clear()
+        self._bytes = 0
+        if not self._finalizer.alive:
+            return
+        for name in os.listdir(self.spill_dir):
+            if name.endswith('.png'):
+                try:
+                    os.remove(os.path.join(self.spill_dir, name))
+                except OSError:
+                    pass
+
+    def close(self):
+        """메모리의 이미지를 비우고 디스크 폴더 삭제"""
+        self._images.clear()
+        self._bytes = 0
+        self._finalizer()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📚 슬라이드 라이브러리
+표지/목차/마무리처럼 여러 발표에 쓰는 슬라이드를 라이브러리 .key 에 미리 만들어 두고 이름으로
+참조해, 슬라이드를 새로 만들고 텍스트를 넣는 대신 한 번의 작업으로 복제
+
+문서에서 문단 전체를 "[[이름]]" 으로 쓰면 그 자리에 라이브러리 슬라이드가 들어갑니다.
+이름 → 라이브러리 문서의 슬라이드 번호는 config.json 의 slide_library 에 둡니다.
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class SlideLibrary:
+    """라이브러리 문서 경로와 이름 → 슬라이드 번호(1부터)"""
+    path: str
+    slides: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["SlideLibrary"]:
+        """config.json 의 slide_library 항목으로 생성 (경로가 없으면 None)"""
+        library = (config or {}).get('slide_library') or {}
+        if not library.get('path'):
+            return None
+        return cls(os.path.abspath(os.path.expanduser(library['path'])),
+                   dict(library.get('slides', {})))
+
+    def slide_number(self, name: str) -> Optional[int]:
+        """이름의 슬라이드 번호 (없으면 None)"""
+        return self.slides.get(name)
+
+    def missing(self, names) -> list:
+        """라이브러리에 없는 이름 목록 (계획 검사용)"""
+        return sorted({name for name in names if name not in self.slides})
+
+
+def main():
+    """메인 함수 - 라이브러리 설정과 계획의 참조 검사"""
+    parser = argparse.ArgumentParser(description="슬라이드 라이브러리 확인")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('text', nargs='?', help="참조를 검사할 텍스트 파일")
+    args = parser.parse_args()
+
+    from app_config import config_store
+    library = SlideLibrary.from_config(config_store(args.config).get().raw)
+    if library is None:
+        print("❌ config.json 에 slide_library.path 가 없습니다")
+        return False
+    if not os.path.exists(library.path):
+        print(f"❌ 라이브러리 문서 없음: {library.path}")
+        return False
+    print(f"📚 {library.path}")
+    for name, number in sorted(library.slides.items(), key=lambda item: item[1]):
+        print(f"   [[{name}]] → 슬라이드 {number}")
+
+    if args.text:
+        from keynote_generator_main import create_slide_structure
+        with open(args.text, 'r', encoding='utf-8') as f:
+            slides = create_slide_structure(f.read(), [])
+        names = [slide.library_slide for slide in slides if slide.library_slide]
+        missing = library.missing(names)
+        print(f"참조 {len(names)}개, 라이브러리에 없는 이름 {len(missing)}개"
+              + (f": {', '.join(missing)}" if missing else ""))
+        return not missing
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🖼️ 슬라이드 미리보기 렌더러
+Keynote 없이 SlideData 목록을 저해상도 썸네일로 그려 레이아웃을 빠르게 확인
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from image_assignment import DEFAULT_IMAGE_POSITIONS, IMAGE_SIZE_SCALE, SLIDE_SIZE
+from keynote_generator_main import SlideData
+from resource_limits import BoundedImageCache
+from text_fitting import DEFAULT_LAYOUT, LAYOUT_PLACEHOLDERS, LINE_SPACING, TextFitter
+
+COLORS = {
+    'background': (255, 255, 255),
+    'border': (200, 200, 200),
+    'region': (235, 240, 250),
+    'title': (60, 60, 60),
+    'body': (150, 150, 150),
+    'overflow': (220, 60, 60),
+    'image': (190, 215, 235),
+    'image_border': (90, 140, 190)
+}
+
+
+class SlidePreviewRenderer:
+    """SlideData 썸네일 렌더러 (백그라운드 스레드 풀 + 슬라이드 해시 캐시)"""
+
+    def __init__(self, image_positions: Optional[Dict] = None,
+                 thumbnail_size: Tuple[int, int] = (192, 144), max_workers: int = 4,
+                 cache_bytes: int = 64 * 1024 * 1024, spill_dir: Optional[str] = None):
+        self.image_positions = image_positions or DEFAULT_IMAGE_POSITIONS
+        self.thumbnail_size = thumbnail_size
+        self.text_fitter = TextFitter()
+        # 한도를 넘는 썸네일은 디스크로 내려보냄
+        self._cache = BoundedImageCache(cache_bytes, spill_dir)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='slide-preview')
+
+    def slide_hash(self, slide: SlideData) -> str:
+        """슬라이드 캐시 키 (내용 + 이미지 파일 상태 + 썸네일 크기)"""
+        payload = asdict(slide)
+        image_paths = ([slide.image_path] if slide.image_path else []) + \
+            [image_path for image_path, _ in slide.gallery]
+        payload['image_stat'] = [[stat.st_size, stat.st_mtime_ns] for stat in
+                                 (os.stat(path) for path in image_paths if os.path.exists(path))]
+        payload['thumbnail_size'] = list(self.thumbnail_size)
+        if slide.image_path and not slide.image_box:
+            # image_box 가 없으면 위치 설정으로 그리므로 설정이 바뀐 슬라이드만 다시 그림
+            payload['image_position_box'] = self.image_positions.get(slide.image_position)
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()
+
+    def render(self, slide: SlideData) -> Image.Image:
+        """슬라이드 한 장을 렌더링 (캐시 사용)"""
+        key = self.slide_hash(slide)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        thumbnail = self._draw(slide)
+        with self._lock:
+            self._cache.put(key, thumbnail)
+        return thumbnail
+
+    def render_async(self, slides: List[SlideData],
+                     callback: Optional[Callable[[int, Image.Image], None]] = None) -> List[Future]:
+        """슬라이드 목록을 백그라운드에서 렌더링
+
+        callback(index, image) 은 워커 스레드에서 호출되므로 Tk 위젯 갱신은
+        호출하는 쪽에서 root.after 로 메인 스레드에 넘겨야 합니다.
+        """
+        futures = []
+        for index, slide in enumerate(slides):
+            future = self._executor.submit(self.render, slide)
+            if callback:
+                future.add_done_callback(
+                    lambda f, i=index: f.exception() is None and callback(i, f.result()))
+            futures.append(future)
+        return futures
+
+    def render_all(self, slides: List[SlideData]) -> List[Image.Image]:
+        """슬라이드 목록을 렌더링하고 완료될 때까지 대기"""
+        return [future.result() for future in self.render_async(slides)]
+
+    def clear_cache(self):
+        """썸네일 캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self):
+        """스레드 풀 종료, 디스크로 내려보낸 썸네일 삭제"""
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            self._cache.close()
+
+    def image_box(self, slide: SlideData) -> Tuple[int, int, int, int]:
+        """이미지 영역 (x, y, width, height) - image_box 가 없으면 image_position/image_size 로 계산"""
+        if slide.image_box:
+            return tuple(slide.image_box)
+        position = self.image_positions.get(slide.image_position,
+                                            self.image_positions.get('right',
+                                                                     DEFAULT_IMAGE_POSITIONS['right']))
+        scale = IMAGE_SIZE_SCALE.get(slide.image_size, 1.0)
+        width = int(position['width'] * scale)
+        height = int(position['height'] * scale)
+        return position['x'], position['y'], width, height
+
+    def _draw(self, slide: SlideData) -> Image.Image:
+        """슬라이드 좌표계에서 그린 뒤 썸네일 크기로 축소"""
+        # 최종 크기의 2배로 그려서 축소 시 선이 너무 얇아지지 않도록 함
+        canvas_size = (self.thumbnail_size[0] * 2, self.thumbnail_size[1] * 2)
+        scale_x = canvas_size[0] / SLIDE_SIZE[0]
+        scale_y = canvas_size[1] / SLIDE_SIZE[1]
+
+        def to_canvas(box):
+            x, y, w, h = box
+            return (int(x * scale_x), int(y * scale_y),
+                    int((x + w) * scale_x), int((y + h) * scale_y))
+
+        canvas = Image.new('RGB', canvas_size, COLORS['background'])
+        draw = ImageDraw.Draw(canvas)
+        draw.rectangle((0, 0, canvas_size[0] - 1, canvas_size[1] - 1), outline=COLORS['border'])
+
+        placeholders = LAYOUT_PLACEHOLDERS.get(slide.layout, LAYOUT_PLACEHOLDERS[DEFAULT_LAYOUT])
+
+        for name in ('title', 'body'):
+            draw.rectangle(to_canvas(self._box(placeholders[name])), fill=COLORS['region'])
+
+        self._draw_text_bars(draw, to_canvas, placeholders['title'], slide.title,
+                             placeholders['title']['font_size'], COLORS['title'])
+        self._draw_text_bars(draw, to_canvas, placeholders['body'], slide.content,
+                             slide.body_font_size or placeholders['body']['font_size'],
+                             COLORS['body'])
+
+        if slide.image_path:
+            self._draw_image(canvas, draw, to_canvas(self.image_box(slide)), slide.image_path)
+        for image_path, box in slide.gallery:
+            self._draw_image(canvas, draw, to_canvas(box), image_path)
+
+        return canvas.resize(self.thumbnail_size, Image.LANCZOS)
+
+    @staticmethod
+    def _box(placeholder: Dict) -> Tuple[int, int, int, int]:
+        return placeholder['x'], placeholder['y'], placeholder['width'], placeholder['height']
+
+    def _draw_text_bars(self, draw, to_canvas, placeholder, text, font_size, color):
+        """줄바꿈된 텍스트를 줄 단위 막대로 표시 (자리표시자를 넘치면 빨간색)"""
+        if not text:
+            return
+
+        line_height = font_size * LINE_SPACING
+        bottom = placeholder['y'] + placeholder['height']
+        metrics = self.text_fitter.metrics
+        for row, (_, line) in enumerate(self.text_fitter.wrap(text, font_size,
+                                                              placeholder['width'])):
+            top = placeholder['y'] + row * line_height
+            width = max(font_size / 2, metrics.text_width(line, font_size))
+            overflow = top + line_height > bottom
+            bar = (placeholder['x'], top + line_height / 4, width, line_height / 2)
+            draw.rectangle(to_canvas(bar), fill=COLORS['overflow'] if overflow else color)
+
+    @staticmethod
+    def _draw_image(canvas, draw, box, image_path):
+        """이미지 영역에 실제 이미지 축소본(없으면 자리표시)을 그림"""
+        left, top, right, bottom = box
+        try:
+            with Image.open(image_path) as img:
+                img.draft('RGB', (right - left, bottom - top))
+                img = img.convert('RGB')
+                img.thumbnail((right - left, bottom - top))
+                offset_x = left + (right - left - img.width) // 2
+                offset_y = top + (bottom - top - img.height) // 2
+                draw.rectangle(box, fill=COLORS['image'])
+                canvas.paste(img, (offset_x, offset_y))
+        except Exception:
+            draw.rectangle(box, fill=COLORS['image'])
+            draw.line((left, top, right, bottom), fill=COLORS['image_border'])
+            draw.line((left, bottom, right, top), fill=COLORS['image_border'])
+        draw.rectangle(box, outline=COLORS['image_border'])
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ 템플릿 카탈로그
+.key 파일(zip 또는 패키지 폴더) 안에 이미 들어 있는 테마 미리보기 이미지만 꺼내
+한 번 축소해 썸네일 캐시에 저장 (템플릿 전체를 읽거나 열지 않음)
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join('cache', 'template_thumbnails')
+
+# Keynote 가 문서에 저장하는 미리보기 (큰 것부터)
+PREVIEW_MEMBERS = ('preview.jpg', 'preview-web.jpg', 'preview-micro.jpg')
+
+# 미리보기가 없을 때 대신 쓸 수 있는 Data/ 안의 이미지
+DATA_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def read_preview(template_path: str) -> Optional[bytes]:
+    """템플릿의 미리보기 이미지 바이트 (없으면 Data/ 의 가장 큰 이미지, 그것도 없으면 None)"""
+    if os.path.isdir(template_path):
+        # 패키지 폴더 형식 .key
+        for name in PREVIEW_MEMBERS:
+            path = os.path.join(template_path, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        data_dir = os.path.join(template_path, 'Data')
+        candidates = [os.path.join(data_dir, name) for name in os.listdir(data_dir)
+                      if name.lower().endswith(DATA_IMAGE_EXTENSIONS)] \
+            if os.path.isdir(data_dir) else []
+        if not candidates:
+            return None
+        with open(max(candidates, key=os.path.getsize), 'rb') as f:
+            return f.read()
+
+    try:
+        with zipfile.ZipFile(template_path) as archive:
+            # 중앙 디렉터리만 읽고, 필요한 항목 하나만 꺼냄
+            members = {info.filename: info for info in archive.infolist()}
+            for name in PREVIEW_MEMBERS:
+                if name in members:
+                    return archive.read(name)
+            data_images = [info for info in members.values()
+                           if info.filename.startswith('Data/')
+                           and info.filename.lower().endswith(DATA_IMAGE_EXTENSIONS)]
+            if data_images:
+                return archive.read(max(data_images, key=lambda info: info.file_size))
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+class TemplateCatalog:
+    """템플릿 썸네일 캐시 (파일 경로/크기/수정 시각이 같으면 다시 만들지 않음)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 thumbnail_size: Tuple[int, int] = (160, 120), max_workers: int = 4):
+        self.cache_dir = cache_dir
+        self.thumbnail_size = thumbnail_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='template-thumbnail')
+        self._pending: Dict[str, Future] = {}
+
+    def cache_path(self, template_path: str) -> str:
+        """템플릿 썸네일의 캐시 파일 경로"""
+        stat = os.stat(template_path)
+        key = (f"{os.path.abspath(template_path)}|{stat.st_size}|{stat.st_mtime_ns}|"
+               f"{self.thumbnail_size[0]}x{self.thumbnail_size[1]}")
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def cached_thumbnail(self, template_path: str) -> Optional[str]:
+        """이미 만들어 둔 썸네일 경로 (없으면 None, 디코딩 없음)"""
+        try:
+            path = self.cache_path(template_path)
+        except OSError:
+            return None
+        return path if os.path.exists(path) else None
+
+    def thumbnail(self, template_path: str) -> Optional[str]:
+        """썸네일 PNG 경로 (캐시에 없으면 미리보기를 꺼내 한 번 축소해 저장)"""
+        try:
+            path = self.cache_path(template_path)
+        except OSError:
+            return None
+        if os.path.exists(path):
+            return path
+
+        data = read_preview(template_path)
+        if data is None:
+            return None
+
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft('RGB', self.thumbnail_size)  # JPEG 는 축소 디코딩
+            img = img.convert('RGB')
+            img.thumbnail(self.thumbnail_size)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        img.save(temp_path, 'PNG')
+        os.replace(temp_path, path)
+        return path
+
+    def thumbnail_async(self, template_path: str) -> Future:
+        """백그라운드에서 썸네일 준비 (같은 템플릿 요청은 하나로 합침)"""
+        future = self._pending.get(template_path)
+        if future is None or (future.done() and future.exception() is not None):
+            future = self._executor.submit(self.thumbnail, template_path)
+            self._pending[template_path] = future
+        return future
+
+    def forget(self, template_paths):
+        """config.json 에서 바뀐 템플릿의 대기 작업 버리기 (디스크 캐시는 파일 상태로 구분되므로 유지)"""
+        for path in template_paths:
+            self._pending.pop(path, None)
+
+    def warm(self, template_paths: List[str]) -> Dict[str, Optional[str]]:
+        """모든 템플릿 썸네일을 미리 만들고 완료될 때까지 대기"""
+        futures = {path: self.thumbnail_async(path) for path in template_paths}
+        return {path: future.result() for path, future in futures.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def main():
+    """메인 함수 - config.json 의 템플릿 썸네일 캐시 만들기"""
+    parser = argparse.ArgumentParser(description="템플릿 썸네일 캐시 만들기")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    from app_config import config_store
+    templates = config_store(args.config).get().templates
+    paths = [template.path for template in templates.values() if os.path.exists(template.path)]
+
+    catalog = TemplateCatalog(args.cache_dir)
+    start_time = time.perf_counter()
+    results = catalog.warm(paths)
+    elapsed = time.perf_counter() - start_time
+    catalog.shutdown()
+
+    missing = [path for path, thumbnail in results.items() if thumbnail is None]
+    print(f"🗂️ 썸네일 {len(results) - len(missing)}/{len(results)}개 준비 ({elapsed:.2f}초)")
+    for path in missing:
+        print(f"⚠️  미리보기 없음: {path}")
+    return not missing
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -249,6 +249,1657 @@ def run_performance_test():
         print("⚠️  성능: 보통")
         return True
 
+def test_slide_preview():
+    """슬라이드 미리보기 렌더러 테스트"""
+    print("\n🖼️ 미리보기 렌더러 테스트...")
+    
+    from keynote_generator_main import SlideData
+    from slide_preview import SlidePreviewRenderer
+    
+    renderer = SlidePreviewRenderer(thumbnail_size=(160, 120), max_workers=2)
+    slides = [
+        SlideData(slide_type='title', layout='Title & Subtitle', title='AI와 미래의 일'),
+        SlideData(slide_type='content', layout='Title, Bullets & Photo',
+                  title='AI 기술의 발전', content='• 머신러닝의 혁신\n' * 30,
+                  image_path='없는_이미지.png')
+    ]
+    
+    try:
+        start_time = time.time()
+        thumbnails = renderer.render_all(slides)
+        first_time = time.time() - start_time
+        
+        start_time = time.time()
+        cached = renderer.render_all(slides)
+        cached_time = time.time() - start_time
+    finally:
+        renderer.shutdown()
+    
+    if [t.size for t in thumbnails] != [(160, 120)] * 2:
+        print("❌ 썸네일 크기 오류")
+        return False
+    if any(a is not b for a, b in zip(thumbnails, cached)):
+        print("❌ 캐시가 사용되지 않음")
+        return False
+    
+    print(f"✅ 렌더링 시간: {first_time:.4f}초 (캐시: {cached_time:.4f}초)")
+    return True
+
+def test_export_pipeline():
+    """내보내기 파이프라인 테스트 (가짜 내보내기 함수 사용)"""
+    print("\n📤 내보내기 파이프라인 테스트...")
+    
+    from export_pipeline import ExportQueue, convert_directory
+    
+    calls = []
+    
+    def fake_export(exports, source_path):
+        calls.append((source_path, sorted(exports)))
+        for path in exports.values():
+            open(path, 'w').close()
+        return True
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'sub', 'package.key'))
+        for name in ['a.key', os.path.join('sub', 'b.key')]:
+            open(os.path.join(temp_dir, name), 'w').close()
+        
+        export_queue = ExportQueue(concurrency=2, export_func=fake_export)
+        jobs = [f.result() for f in convert_directory(temp_dir, ['pdf', 'pptx'], export_queue)]
+        again = convert_directory(temp_dir, ['pdf', 'pptx'], export_queue)
+        
+        # 찾은 뒤 사라진 파일(저장 중인 임시 .key 등)은 건너뜀
+        import export_pipeline
+        original_find = export_pipeline.find_keynote_files
+        def find_with_vanished(root):
+            return [os.path.join(root, 'gone.key')] + original_find(root)
+        export_pipeline.find_keynote_files = find_with_vanished
+        try:
+            vanished = convert_directory(temp_dir, ['pdf'], export_queue, seen={})
+        except OSError as e:
+            vanished = e
+        finally:
+            export_pipeline.find_keynote_files = original_find
+        export_queue.shutdown()
+    
+    # 문서마다 한 번만 열고 두 형식을 함께 내보내야 함
+    if len(calls) != 3 or any(formats != ['pdf', 'pptx'] for _, formats in calls):
+        print(f"❌ 내보내기 호출 오류: {calls}")
+        return False
+    if not all(job.success for job in jobs) or again:
+        print("❌ 변환 결과 또는 재변환 판단 오류")
+        return False
+    if vanished != []:
+        print(f"❌ 사라진 파일 처리 오류: {vanished}")
+        return False
+    
+    # 파일 이름의 따옴표/백슬래시는 AppleScript 문자열 안에서 이스케이프
+    from keynote_generator_main import AppleScriptController, ScriptResult
+    scripts = []
+    
+    def capture(cls, script):
+        scripts.append(script)
+        return ScriptResult(True)
+    
+    original_run_once = AppleScriptController._run_once
+    AppleScriptController._run_once = classmethod(capture)
+    try:
+        source = '/tmp/보고서" & (do shell script "id") & ".key'
+        AppleScriptController.export_presentation({'pdf': '/tmp/a\\b".pdf'}, source)
+    finally:
+        AppleScriptController._run_once = original_run_once
+    if 'POSIX file "/tmp/보고서\\" & (do shell script \\"id\\") & \\".key"' not in scripts[0] \
+            or 'POSIX file "/tmp/a\\\\b\\".pdf"' not in scripts[0]:
+        print(f"❌ 내보내기 경로 이스케이프 오류: {scripts[0]}")
+        return False
+    
+    print(f"✅ {len(jobs)}개 문서 변환, 문서당 1회 호출")
+    return True
+
+def test_lazy_imports():
+    """헤드리스 임포트 시 tkinter/PIL 을 로드하지 않는지 테스트"""
+    print("\n📦 지연 임포트 테스트...")
+    
+    # 슬라이드 계획 모듈과 concurrent.futures/subprocess 도 계획/실행할 때만 로드
+    heavy = ('tkinter', 'PIL', 'image_assignment', 'image_packing', 'resource_limits',
+             'text_fitting', 'text_segmentation', 'concurrent.futures', 'subprocess')
+    script = ("import sys, keynote_generator_main; "
+              f"print(','.join(m for m in {heavy!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', script],
+                          capture_output=True, text=True, timeout=30)
+    
+    if result.returncode != 0:
+        print(f"❌ 임포트 실패: {result.stderr}")
+        return False
+    if result.stdout.strip():
+        print(f"❌ 무거운 모듈이 로드됨: {result.stdout.strip()}")
+        return False
+    
+    # 임포트 시간 예산 (--import-report 와 같은 측정, 일시적인 부하를 피해 3회 중 최솟값)
+    from keynote_generator_main import STARTUP_BUDGET_MS, measure_import_time
+    elapsed_ms = min(measure_import_time('keynote_generator_main')[0][1] for _ in range(3)) / 1000
+    if elapsed_ms > STARTUP_BUDGET_MS['import']:
+        print(f"❌ 임포트 시간 {elapsed_ms:.1f}ms 가 예산 {STARTUP_BUDGET_MS['import']}ms 초과")
+        return False
+    
+    print(f"✅ 무거운 모듈 없이 임포트됨 ({elapsed_ms:.1f}ms)")
+    return True
+
+def test_text_fitting():
+    """텍스트 맞춤 엔진 테스트"""
+    print("\n📏 텍스트 맞춤 테스트...")
+    
+    from keynote_generator_main import SlideData
+    from text_fitting import TextFitter
+    
+    fitter = TextFitter()
+    
+    # 짧은 문단은 그대로
+    short = SlideData(slide_type='content', layout='Title & Bullets',
+                      title='AI 기술의 발전', content='• 머신러닝의 혁신\n• 자연어 처리 기술')
+    if fitter.fit_slide(short) != [short]:
+        print("❌ 짧은 문단이 변경됨")
+        return False
+    
+    # 긴 문단(long_content)은 이어지는 슬라이드로 나뉘고 내용이 보존되어야 함
+    long_text = "인공지능은 우리의 일하는 방식을 빠르게 바꾸고 있습니다. " * 60
+    fitted = fitter.fit_slide(SlideData(slide_type='content', layout='Title & Bullets',
+                                        title='미래 직업의 변화', content=long_text))
+    if len(fitted) < 2 or not all(fitter.fits(s.content, s.layout) for s in fitted):
+        print(f"❌ 긴 문단 분할 실패: {len(fitted)}개")
+        return False
+    if ''.join(s.content for s in fitted).replace(' ', '') != long_text.replace(' ', ''):
+        print("❌ 분할 후 내용 손실")
+        return False
+    
+    # 아주 긴 한 문단(48만 자)도 줄바꿈을 한 번만 계산해 선형 시간에 나눔
+    huge_text = long_text * 250
+    start_time = time.time()
+    pages = fitter.paginate(huge_text, 'Title & Bullets')
+    paginate_time = time.time() - start_time
+    if ''.join(pages).replace(' ', '') != huge_text.replace(' ', '') or paginate_time > 5:
+        print(f"❌ 긴 문단 나누기 오류: {len(pages)}쪽, {paginate_time:.2f}초")
+        return False
+    
+    # 대량 문단 처리 속도
+    corpus = [("문단 텍스트 English words 섞인 내용입니다 " * (i % 40 + 1)) for i in range(5000)]
+    start_time = time.time()
+    for paragraph in corpus:
+        fitter.fit_slide(SlideData(slide_type='content', layout='Title & Bullets',
+                                   title='제목', content=paragraph))
+    processing_time = time.time() - start_time
+    
+    print(f"✅ 긴 문단 → {len(fitted)}개 슬라이드, {len(huge_text):,}자 문단 → {len(pages)}쪽 ({paginate_time:.2f}초)")
+    print(f"✅ {len(corpus):,}개 문단 맞춤: {processing_time:.3f}초")
+    return True
+
+def test_controller_results():
+    """컨트롤러 결과 객체와 telemetry 집계 테스트 (osascript 없이)"""
+    print("\n📈 컨트롤러 결과/telemetry 테스트...")
+    
+    from keynote_generator_main import (AppleScriptController, ControllerTelemetry,
+                                        ScriptResult, SlideData)
+    
+    # 슬라이드 추가는 시간 초과여도 재시도하지 않음 (첫 시도가 이미 적용됐으면 중복),
+    # 저장은 다시 해도 같으므로 시간 초과 뒤 한 번 재시도
+    responses = [
+        ScriptResult(False, 'timeout', 'timeout', '시간 초과'),
+        ScriptResult(False, 'script_error', AppleScriptController._classify_error(
+            -1728, 'Can’t get layout "Photo - 3 Up".'), 'Can’t get layout', -1728),
+        ScriptResult(False, 'timeout', 'timeout', '시간 초과'),
+        ScriptResult(True),
+    ]
+    original_run_once = AppleScriptController._run_once
+    original_telemetry = AppleScriptController.telemetry
+    AppleScriptController._run_once = classmethod(lambda cls, script: responses.pop(0))
+    AppleScriptController.telemetry = ControllerTelemetry()
+    try:
+        slide = SlideData(slide_type='content', layout='Photo - 3 Up', title='사진')
+        timed_out = AppleScriptController.add_slide_with_layout(slide)
+        result = AppleScriptController.add_slide_with_layout(slide)
+        saved = AppleScriptController.save_presentation('out.key')
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, 'telemetry.jsonl')
+            AppleScriptController.telemetry.export_run(log_path, {'template': '1'})
+            AppleScriptController.telemetry.export_run(log_path, {'template': '1'})
+            aggregate = ControllerTelemetry.aggregate(log_path)
+    finally:
+        AppleScriptController._run_once = original_run_once
+        AppleScriptController.telemetry = original_telemetry
+    
+    if result or result.error_class != 'missing_layout' or result.attempts != 1:
+        print(f"❌ 결과 오류: {result}")
+        return False
+    if timed_out.error_class != 'timeout' or timed_out.attempts != 1 or not saved or saved.attempts != 2:
+        print(f"❌ 작업별 재시도 오류: 추가 {timed_out}, 저장 {saved}")
+        return False
+    
+    layout_stats = aggregate['layout'].get('Photo - 3 Up', {})
+    if aggregate['runs'] != 2 or layout_stats.get('errors') != {'timeout': 2, 'missing_layout': 2}:
+        print(f"❌ 집계 오류: {aggregate}")
+        return False
+    
+    # 결과를 쌓지 않고 바로 집계하므로 오래 도는 서비스에서도 크기가 늘지 않음
+    telemetry = ControllerTelemetry()
+    start_time = time.perf_counter()
+    for i in range(50000):
+        telemetry.record(ScriptResult(i % 10 != 0, error_class=None if i % 10 else 'timeout',
+                                      operation='add_slide', latency=0.001,
+                                      labels={'layout': f"레이아웃 {i}"}))
+    record_time = time.perf_counter() - start_time
+    summary = telemetry.summary()
+    stats = summary['operations']['add_slide']
+    if telemetry.count != 50000 or stats['count'] != 50000 or stats['errors'] != {'timeout': 5000} \
+            or len(summary['layout']) != ControllerTelemetry.MAX_LABEL_VALUES + 1:
+        print(f"❌ 누적 집계 오류: {stats}, 레이아웃 {len(summary['layout'])}개")
+        return False
+    summary['operations']['add_slide']['count'] = 0
+    if telemetry.summary()['operations']['add_slide']['count'] != 50000:
+        print("❌ 집계 복사본이 원본을 바꿈")
+        return False
+    
+    print(f"✅ {result.describe()}")
+    print(f"✅ 결과 50,000건 누적 집계 {record_time:.3f}초")
+    return True
+
+def test_generation_service():
+    """생성 HTTP 서비스 테스트 (가짜 렌더 백엔드)"""
+    print("\n🌐 생성 서비스 테스트...")
+
+    import base64
+    import http.client
+    import threading
+    import urllib.error
+    import urllib.request
+    from generation_service import (GenerationService, ServiceError, StubController, create_server,
+                                    load_templates)
+
+    def call(base_url, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, json.loads(response.read().decode('utf-8'))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = GenerationService(load_templates(), output_dir=temp_dir, workers=2,
+                                    controller_factory=lambda: StubController(0.001),
+                                    slide_delay=0.0)
+        server = create_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            payload = {'text': "서비스 테스트\n\n첫 문단\n• 항목\n\n둘째 문단", 'template': '1',
+                       'images': [{'name': 'a.png',
+                                   'data': base64.b64encode(b'not really a png').decode()}]}
+            status, first = call(base_url, 'POST', '/jobs', payload)
+            _, second = call(base_url, 'POST', '/jobs', payload)
+
+            job = first
+            deadline = time.time() + 10
+            while job['status'] in ('queued', 'running') and time.time() < deadline:
+                time.sleep(0.02)
+                _, job = call(base_url, 'GET', f"/jobs/{first['job_id']}")
+            _, health = call(base_url, 'GET', '/health')
+            _, metrics = call(base_url, 'GET', '/metrics')
+            
+            # 잘못된 timeout 은 연결을 끊지 않고 400
+            try:
+                call(base_url, 'POST', '/jobs', dict(payload, timeout=None))
+                bad_timeout_status = 200
+            except urllib.error.HTTPError as e:
+                bad_timeout_status = e.code
+            
+            # 음수/숫자가 아닌 Content-Length 도 400
+            bad_length_statuses = []
+            for length in ('-1', 'abc'):
+                connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1],
+                                                        timeout=10)
+                connection.putrequest('POST', '/jobs')
+                connection.putheader('Content-Length', length)
+                connection.endheaders()
+                bad_length_statuses.append(connection.getresponse().status)
+                connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        rejected = []
+        for timeout in ([1], -1, 0, float('nan'), float('inf'), True, '30'):
+            try:
+                service.submit(dict(payload, timeout=timeout))
+            except ServiceError as e:
+                rejected.append(e.status)
+        if bad_timeout_status != 400 or rejected != [400] * 7:
+            print(f"❌ timeout 검사 오류: {bad_timeout_status}, {rejected}")
+            return False
+        if bad_length_statuses != [400, 400]:
+            print(f"❌ Content-Length 검사 오류: {bad_length_statuses}")
+            return False
+        
+        # 끝난 작업의 업로드는 삭제
+        service._queue.join()
+        if os.listdir(service.upload_dir):
+            print(f"❌ 끝난 작업의 업로드가 남음: {os.listdir(service.upload_dir)}")
+            return False
+        
+        # 큐가 가득 차서 거절된 요청의 업로드는 저장하지 않음
+        busy = GenerationService(load_templates(), output_dir=os.path.join(temp_dir, 'busy'),
+                                 queue_size=1, controller_factory=lambda: StubController(0.05),
+                                 slide_delay=0.0)
+        stored_names = []
+        store_image = busy._store_image
+        def count_store(data, name, digest):
+            stored_names.append(name)
+            return store_image(data, name, digest)
+        busy._store_image = count_store
+        statuses = []
+        for i in range(5):
+            upload = {'name': f"{i}.png", 'data': base64.b64encode(f"image {i}".encode()).decode()}
+            try:
+                busy.submit(dict(payload, text=f"바쁨 {i}\n\n문단", images=[upload]))
+                statuses.append(202)
+            except ServiceError as e:
+                statuses.append(e.status)
+        busy._queue.join()  # 임시 폴더를 지우기 전에 받아들인 작업이 끝날 때까지 대기
+        if 503 not in statuses or len(stored_names) != statuses.count(202):
+            print(f"❌ 거절된 요청의 업로드가 저장됨: {statuses}, 저장 {stored_names}")
+            return False
+        if os.listdir(busy.upload_dir):
+            print(f"❌ 끝난 작업의 업로드가 남음: {os.listdir(busy.upload_dir)}")
+            return False
+        
+        # 같은 이미지를 쓰는 작업이 남아 있으면 먼저 끝난 작업이 지우지 않음
+        shared = {'name': 'shared.png', 'data': base64.b64encode(b'shared image').decode()}
+        slow = GenerationService(load_templates(), output_dir=os.path.join(temp_dir, 'shared'),
+                                 controller_factory=lambda: StubController(0.05), slide_delay=0.0)
+        jobs = [slow.submit(dict(payload, text=f"공유 {i}\n\n문단", images=[shared]))[0]
+                for i in range(2)]
+        deadline = time.time() + 10
+        while jobs[1].status == 'queued' and time.time() < deadline:  # 워커 1개: 첫 작업 정리 뒤 시작
+            time.sleep(0.005)
+        shared_kept = os.path.exists(jobs[1].images[0]['path'])
+        slow._queue.join()
+        if not shared_kept or jobs[1].status != 'done' or os.listdir(slow.upload_dir):
+            print(f"❌ 공유 업로드 처리 오류: {shared_kept}, {jobs[1].status}, "
+                  f"{os.listdir(slow.upload_dir)}")
+            return False
+
+        if status != 202 or not second['coalesced'] or second['job_id'] != first['job_id']:
+            print(f"❌ 동일 요청 병합 오류: {first}, {second}")
+            return False
+        if job['status'] != 'done' or not os.path.exists(job['output_path']):
+            print(f"❌ 작업 실패: {job}")
+            return False
+        if health['status'] != 'ok' or metrics['counters']['done'] != 1:
+            print(f"❌ 상태/지표 오류: {health}, {metrics}")
+            return False
+
+    print(f"✅ 슬라이드 {job['slide_count']}장 생성, 병합 {metrics['counters']['coalesced']}건")
+    return True
+
+def test_image_assignment():
+    """문단 ↔ 이미지 배정 테스트"""
+    print("\n🧩 이미지 배정 테스트...")
+    
+    import itertools
+    import random
+    from PIL import Image
+    from image_assignment import SLIDE_SIZE, ImageAssigner, solve_assignment
+    from keynote_generator_main import create_slide_structure
+    from text_fitting import TextFitter
+    
+    # 작은 문제는 모든 순열과 비교해 최소 비용인지 확인
+    rng = random.Random(0)
+    for _ in range(50):
+        rows, columns = rng.randint(1, 5), rng.randint(1, 5)
+        cost = [[rng.random() for _ in range(columns)] for _ in range(rows)]
+        total = sum(cost[i][j] for i, j in enumerate(solve_assignment(cost)) if j >= 0)
+        if rows <= columns:
+            best = min(sum(cost[i][p[i]] for i in range(rows))
+                       for p in itertools.permutations(range(columns), rows))
+        else:
+            best = min(sum(cost[p[j]][j] for j in range(columns))
+                       for p in itertools.permutations(range(rows), columns))
+        if abs(total - best) > 1e-9:
+            print(f"❌ 최소 비용 매칭 오류: {total} != {best}")
+            return False
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 넓은 차트를 먼저, 세로 인포그래픽을 나중에 추가
+        images = []
+        for name, size in (('wide.png', (1800, 600)), ('tall.png', (400, 1000))):
+            path = os.path.join(temp_dir, name)
+            Image.new('RGB', size, 'white').save(path)
+            images.append({'path': path, 'name': name})
+        
+        long_body = '\n'.join(f"• 자세한 설명 항목 {i}" for i in range(14))
+        text = f"배정 테스트\n\n긴 문단\n{long_body}\n\n짧은 문단\n한 줄 요약"
+        slides = create_slide_structure(text, images)
+    
+    by_title = {slide.title: slide for slide in slides}
+    if not (by_title['긴 문단'].image_path.endswith('tall.png')
+            and by_title['짧은 문단'].image_path.endswith('wide.png')):
+        print(f"❌ 이미지 모양에 맞지 않는 배정: {[(s.title, s.image_path) for s in slides]}")
+        return False
+    
+    for slide in slides:
+        if slide.image_box:
+            x, y, width, height = slide.image_box
+            if x < 0 or y < 0 or x + width > SLIDE_SIZE[0] or y + height > SLIDE_SIZE[1]:
+                print(f"❌ 슬라이드 밖 이미지 영역: {slide.image_box}")
+                return False
+    
+    # 수백 개 이미지도 빠르게 배정
+    kinds = ['wide_chart', 'tall_infographic', 'square_icon', 'standard_photo']
+    assigner = ImageAssigner(TextFitter(), analyze_image=lambda path: {
+        'aspect_ratio': 1.5, 'type': kinds[hash(path) % 4], 'size': 'medium'})
+    contents = ["문단 내용 " * (i % 60 + 1) for i in range(500)]
+    many_images = [{'path': f"/tmp/{i}.png", 'name': f"{i}.png"} for i in range(500)]
+    start_time = time.time()
+    assignment = assigner.assign(contents, many_images)
+    elapsed = time.time() - start_time
+    if len(assignment) != 500 or len({id(a['image']) for a in assignment.values()}) != 500:
+        print("❌ 대량 배정 결과 오류")
+        return False
+    
+    print(f"✅ 모양 기반 배정 확인, 500×500 배정 {elapsed:.2f}초")
+    return True
+
+def test_image_packing():
+    """다중 이미지 슬라이드 배치 테스트"""
+    print("\n🗂️ 다중 이미지 배치 테스트...")
+    
+    from PIL import Image
+    from image_packing import MULTI_IMAGE_LAYOUT, pack_images
+    from keynote_generator_main import create_slide_structure
+    from text_fitting import LAYOUT_PLACEHOLDERS
+    
+    region = LAYOUT_PLACEHOLDERS[MULTI_IMAGE_LAYOUT]['photos']
+    for ratios in ([1.33], [0.75, 1.78, 1.0], [3.0, 3.0, 3.0], [0.5, 0.5]):
+        boxes, coverage = pack_images(ratios, region)
+        for ratio, (x, y, width, height) in zip(ratios, boxes):
+            if (x < region['x'] or y < region['y'] or x + width > region['x'] + region['width']
+                    or y + height > region['y'] + region['height']
+                    or abs(width / height - ratio) > 0.05 * ratio):
+                print(f"❌ 배치 오류: {ratios} → {boxes}")
+                return False
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                if a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]:
+                    print(f"❌ 겹치는 이미지: {a}, {b}")
+                    return False
+    
+    # 사진 보고서: 문단 3개 + 사진 12장 (예전에는 3장만 들어가고 나머지는 버려짐)
+    sizes = [(1600, 1200), (1200, 1600), (1920, 1080), (1000, 1000)] * 3
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = []
+        for i, size in enumerate(sizes):
+            path = os.path.join(temp_dir, f"{i}.jpg")
+            Image.new('RGB', size).save(path)
+            images.append({'path': path, 'name': f"{i}.jpg"})
+        text = "현장 보고\n\n1층 점검\n균열 없음\n\n2층 점검\n누수 없음\n\n외벽\n도장 상태 양호"
+        slides = create_slide_structure(text, images)
+    
+    placed = [slide.image_path for slide in slides if slide.image_path] + \
+        [path for slide in slides for path, _ in slide.gallery]
+    multi = [slide for slide in slides if slide.layout == MULTI_IMAGE_LAYOUT]
+    if sorted(placed) != sorted(image['path'] for image in images):
+        print(f"❌ 누락되거나 중복된 이미지: {len(placed)}/{len(images)}")
+        return False
+    if not multi or len(slides) - 1 >= len(images):
+        print(f"❌ 다중 이미지 슬라이드 없음: {[slide.layout for slide in slides]}")
+        return False
+    
+    print(f"✅ 사진 {len(images)}장 → 슬라이드 {len(slides) - 1}장 (다중 이미지 {len(multi)}장)")
+    return True
+
+def test_resource_limits():
+    """자원 한도 / 디스크 내려보내기 테스트"""
+    print("\n🧮 자원 한도 테스트...")
+    
+    import tracemalloc
+    from PIL import Image
+    from keynote_generator_main import create_slide_structure
+    from resource_limits import (MB, BoundedImageCache, ResourceLimitError, ResourceLimits,
+                                 SpillList)
+    
+    with open('config.json', 'r', encoding='utf-8') as f:
+        limits = ResourceLimits.from_config(json.load(f))
+    if limits.max_image_bytes != 50 * MB:
+        print(f"❌ 설정 로드 오류: {limits}")
+        return False
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 사진 10,000장 보고서: 계획은 2MB 를 넘으면 디스크로
+        images = [{'path': os.path.join(temp_dir, f"{i}.jpg"), 'name': f"{i}.jpg"}
+                  for i in range(10000)]
+        text = "보고서\n\n" + "\n\n".join(f"구역 {i}\n점검 결과 양호" for i in range(50))
+        bounded = ResourceLimits(max_slides=100000, max_memory_bytes=2 * MB, spill_dir=temp_dir)
+        tracemalloc.start()
+        slides = create_slide_structure(text, images, limits=bounded)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        reference = create_slide_structure(text, images)
+        if not isinstance(slides, SpillList) or not slides.spilled or list(slides) != reference:
+            print("❌ 디스크로 내려보낸 계획이 원래 계획과 다름")
+            return False
+        # 반복 도중에 인덱싱해도 반복 위치가 바뀌지 않음 (반복자마다 파일을 따로 엶)
+        iterator = iter(slides)
+        next(iterator)
+        if slides[3] != reference[3] or next(iterator) != reference[1]:
+            print("❌ 디스크 계획 읽기 위치가 공유됨")
+            return False
+        slides.close()
+        if any(name.startswith('plan-') for name in os.listdir(temp_dir)):
+            print("❌ 계획 파일이 남음")
+            return False
+        
+        try:
+            create_slide_structure(text, images, limits=ResourceLimits(max_slides=100))
+            print("❌ 슬라이드 한도가 적용되지 않음")
+            return False
+        except ResourceLimitError:
+            pass
+        
+        # 썸네일 캐시는 한도를 넘으면 디스크로 내려갔다가 다시 읽힘
+        cache = BoundedImageCache(3 * 100 * 100 * 3, spill_dir=temp_dir)
+        for i in range(10):
+            cache.put(str(i), Image.new('RGB', (100, 100), (i, i, i)))
+        reloaded = cache.get('0')
+        if len(cache) > 3 or reloaded is None or reloaded.getpixel((0, 0)) != (0, 0, 0):
+            print("❌ 이미지 캐시 한도/복원 오류")
+            return False
+        spill_dir = cache.spill_dir
+        cache.close()
+        for key in ('closed 1', 'closed 2'):  # 닫힌 뒤에 밀려난 이미지는 디스크에 쓰지 않음
+            cache.put(key, Image.new('RGB', (300, 300)))
+        abandoned = BoundedImageCache(100, spill_dir=temp_dir)
+        abandoned_dir = abandoned.spill_dir
+        del abandoned
+        if os.path.exists(spill_dir) or os.path.exists(abandoned_dir):
+            print("❌ 썸네일 캐시 폴더가 남음")
+            return False
+    
+    print(f"✅ 슬라이드 {len(reference)}장 계획, 메모리에 남은 양 {retained / MB:.1f}MB")
+    return True
+
+def test_template_catalog():
+    """템플릿 썸네일 카탈로그 테스트"""
+    print("\n🗂️ 템플릿 카탈로그 테스트...")
+    
+    from PIL import Image
+    from template_catalog import TemplateCatalog, read_preview
+    
+    with open('config.json', 'r', encoding='utf-8') as f:
+        paths = [info['path'] for info in json.load(f)['templates'].values()
+                 if os.path.exists(info['path'])]
+    if not paths:
+        print("⚠️  템플릿 파일 없음 - 건너뜀")
+        return True
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TemplateCatalog(os.path.join(temp_dir, 'thumbs'), (160, 120))
+        try:
+            start_time = time.time()
+            built = catalog.warm(paths)
+            build_time = time.time() - start_time
+            
+            # 선택 창을 다시 열 때는 캐시 파일만 확인 (디코딩 없음)
+            start_time = time.time()
+            cached = {path: catalog.cached_thumbnail(path) for path in paths}
+            cached_time = time.time() - start_time
+        finally:
+            catalog.shutdown()
+        
+        if any(thumbnail is None for thumbnail in built.values()) or cached != built:
+            print(f"❌ 썸네일 생성/캐시 오류: {built}")
+            return False
+        with Image.open(next(iter(built.values()))) as thumbnail:
+            if thumbnail.width > 160 or thumbnail.height > 120:
+                print(f"❌ 썸네일 크기 오류: {thumbnail.size}")
+                return False
+        
+        # 패키지 폴더 형식: preview.jpg 가 없으면 Data/ 의 이미지 사용
+        package = os.path.join(temp_dir, 'folder.key', 'Data')
+        os.makedirs(package)
+        Image.new('RGB', (64, 48), 'red').save(os.path.join(package, 'bg.png'))
+        if read_preview(os.path.dirname(package)) is None:
+            print("❌ 패키지 폴더 미리보기를 찾지 못함")
+            return False
+    
+    print(f"✅ 썸네일 {len(built)}개 생성 {build_time:.3f}초, 캐시 확인 {cached_time * 1000:.1f}ms")
+    return True
+
+def test_replay_bundle():
+    """재현 번들 기록/재실행 테스트"""
+    print("\n🔁 재현 번들 테스트...")
+    
+    from PIL import Image
+    from app_config import AppConfig
+    from image_assignment import ImageAssigner
+    from keynote_generator_main import (ContentAnalyzer, LayoutSelector, create_slide_structure,
+                                        generate_presentation)
+    from replay import FakeController, RecordingController, load_bundle, replay, write_bundle
+    from text_fitting import TextFitter
+    
+    text = "재현 테스트\n\n첫 번째 문단입니다.\n\n두 번째 문단\n- 항목 하나\n- 항목 둘"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = []
+        for i, size in enumerate([(400, 200), (200, 400)]):
+            path = os.path.join(temp_dir, f"image{i}.png")
+            Image.new('RGB', size, 'blue').save(path)
+            images.append({'path': path, 'name': os.path.basename(path)})
+        template_path = os.path.join(temp_dir, 'template.key')
+        with open(template_path, 'wb') as f:
+            f.write(b'template')
+        
+        slides = create_slide_structure(text, images)
+        recorder = RecordingController(FakeController())
+        output_path = os.path.join(temp_dir, 'out.key')
+        generate_presentation(template_path, output_path, slides, controller=recorder,
+                              slide_delay=0)
+        bundle_path = write_bundle(os.path.join(temp_dir, 'replays', 'run.zip'), text, images,
+                                   template_path, output_path, slides, recorder.calls,
+                                   {'plan': 0.0, 'generate': 0.0})
+        
+        # 원본 이미지를 지워도 번들 안의 이미지로 같은 계획과 호출 순서가 나와야 함
+        for image in images:
+            os.remove(image['path'])
+        report = replay(bundle_path)
+        if not (report['plan_matches'] and report['calls_match'] and report['success']) \
+                or report['template_changed']:
+            print(f"❌ 재실행 결과가 기록과 다름: {report}")
+            return False
+        
+        # 템플릿이 바뀌면 알아채야 함
+        with open(template_path, 'wb') as f:
+            f.write(b'changed')
+        if not replay(bundle_path, use_recorded_plan=True)['template_changed']:
+            print("❌ 템플릿 변경을 감지하지 못함")
+            return False
+        
+        methods = [call['method'] for call in load_bundle(bundle_path)['calls']]
+        
+        # 기본과 다른 설정으로 만든 계획도, 기본 규칙이 적용된 프로세스에서 같게 재현되어야 함
+        raw = {'ai_settings': {'layout_optimization': False},
+               'image_settings': {'positions': {'left': {'x': 10, 'y': 10, 'width': 300,
+                                                         'height': 200}},
+                                  'default_position': 'left'},
+               'resource_limits': {'max_slides': 50},
+               'ui_settings': {'theme': 'dark'}}
+        config = AppConfig.parse(raw)
+        images = []
+        for i, size in enumerate([(400, 200), (200, 400)]):
+            path = os.path.join(temp_dir, f"configured{i}.png")
+            Image.new('RGB', size, 'red').save(path)
+            images.append({'path': path, 'name': os.path.basename(path)})
+        text_fitter = TextFitter()
+        LayoutSelector.configure(config.effective_layout_rules)
+        try:
+            configured = create_slide_structure(
+                text, images, text_fitter,
+                ImageAssigner(text_fitter, config.image.positions,
+                              analyze_image=ContentAnalyzer.analyze_image))
+        finally:
+            LayoutSelector.configure(None)
+        recorder = RecordingController(FakeController())
+        generate_presentation(template_path, output_path, configured, controller=recorder,
+                              slide_delay=0)
+        bundle_path = write_bundle(os.path.join(temp_dir, 'replays', 'configured.zip'), text,
+                                   images, template_path, output_path, configured, recorder.calls,
+                                   {'plan': 0.0, 'generate': 0.0}, config=raw)
+        recorded_config = load_bundle(bundle_path)['config']
+        configured_report = replay(bundle_path)
+        rules_restored = LayoutSelector.LAYOUT_RULES is LayoutSelector.DEFAULT_LAYOUT_RULES
+    
+    if set(recorded_config) != {'ai_settings', 'image_settings', 'resource_limits'}:
+        print(f"❌ 계획 설정 기록 오류: {recorded_config}")
+        return False
+    if not (configured_report['plan_matches'] and configured_report['calls_match']) \
+            or not rules_restored:
+        print(f"❌ 기록된 설정으로 재현되지 않음: {configured_report}, 규칙 복원 {rules_restored}")
+        return False
+    
+    if methods[0] != 'create_presentation_from_template' or methods[-1] != 'save_presentation':
+        print(f"❌ 호출 순서 기록 오류: {methods}")
+        return False
+    print(f"✅ 슬라이드 {len(slides)}장, 호출 {len(methods)}회 기록 후 동일하게 재실행")
+    return True
+
+def test_text_features():
+    """문단 특징 벡터 테스트 (기존 정규식 방식과 결과 비교 + 1MB 문서 벤치마크)"""
+    print("\n🔤 문단 특징 벡터 테스트...")
+    
+    import random
+    import re
+    from keynote_generator_main import ContentAnalyzer, LayoutSelector
+    
+    def legacy_text_type(text):
+        # 불릿 패턴 세 개를 따로 훑던 이전 구현
+        if not text.strip():
+            return 'empty'
+        bullet_patterns = [r'^\s*[•·▪▫-]\s', r'^\s*\d+\.\s', r'^\s*[a-zA-Z]\.\s']
+        bullet_count = sum(len(re.findall(pattern, text, re.MULTILINE))
+                           for pattern in bullet_patterns)
+        if bullet_count >= 3:
+            return 'bullet_list'
+        elif len(text.split('\n')) <= 2 and len(text) < 100:
+            return 'title_subtitle'
+        elif len(text) > 500:
+            return 'long_content'
+        elif text.count(':') >= 2:
+            return 'definition_list'
+        return 'standard_content'
+    
+    random.seed(37)
+    pieces = ['- ', '• ', '1. ', '12. ', 'a. ', 'B. ', '  ', '\n', '\n\n', ':', '슬라이드 ',
+              'keynote ', '자동 생성', 'layout ', '-\n', '데이터: 값', '\t']
+    samples = ['', '   \n ', '제목\n부제목', 'a. 하나\n\n- 둘\n 3. 셋']
+    samples += [''.join(random.choice(pieces) for _ in range(random.randint(1, 60)))
+                for _ in range(2000)]
+    for sample in samples:
+        if ContentAnalyzer.detect_text_type(sample) != legacy_text_type(sample):
+            print(f"❌ 기존 방식과 유형이 다름: {sample!r}")
+            return False
+    
+    features = ContentAnalyzer.extract_features("제목\n- 하나\n1. 둘\na. three: 3\nb. four: 4")
+    if (features.symbol_bullets, features.number_bullets, features.letter_bullets) != (1, 1, 2) \
+            or features.line_count != 5 or features.colon_count != 2:
+        print(f"❌ 특징 계산 오류: {features}")
+        return False
+    scripts = [ContentAnalyzer.extract_features(text).script
+               for text in ("한국어 문단입니다", "English only", "한국어 문단에 Keynote 단어", "123")]
+    if scripts != ['korean', 'english', 'mixed', 'none']:
+        print(f"❌ 문자 체계 힌트 오류: {scripts}")
+        return False
+    
+    # 레이아웃 규칙은 같은 특징 벡터를 그대로 사용
+    analysis = features.as_analysis(image_count=1)
+    if LayoutSelector.select_optimal_layout(analysis)['keynote_layout'] != 'Title, Bullets & Photo':
+        print(f"❌ 특징 벡터로 레이아웃 선택 실패: {analysis}")
+        return False
+    
+    # 1MB 이상 한/영 혼합 문서 벤치마크
+    words = ['프레젠테이션', '자동', '슬라이드', '이미지', 'keynote', 'layout', 'template', '분석']
+    lines = []
+    document_length = 0
+    while document_length < 1024 * 1024:
+        prefix = random.choice(['', '', '- ', '1. ', 'a. ', '• '])
+        body = ' '.join(random.choice(words) for _ in range(random.randint(3, 12)))
+        lines.append(prefix + body + random.choice(['', '', ': 값']))
+        document_length += len(lines[-1]) + 1
+    document = '\n'.join(lines)
+    
+    def best_time(function):
+        best = float('inf')
+        for _ in range(3):
+            start_time = time.perf_counter()
+            function(document)
+            best = min(best, time.perf_counter() - start_time)
+        return best
+    
+    legacy_time = best_time(legacy_text_type)
+    feature_time = best_time(ContentAnalyzer.extract_features)
+    if ContentAnalyzer.detect_text_type(document) != legacy_text_type(document):
+        print("❌ 1MB 문서 유형이 기존 방식과 다름")
+        return False
+    
+    print(f"✅ {len(samples)}개 문단 유형 일치, {len(document) / 1024 / 1024:.1f}MB 문서: "
+          f"기존 {legacy_time * 1000:.1f}ms → 특징 벡터 {feature_time * 1000:.1f}ms "
+          f"(문자 체계/불릿 종류 포함)")
+    return True
+
+def test_render_backend():
+    """렌더 백엔드 테스트 (메모리 백엔드 문서 모델 + AppleScript 백엔드 호출 순서)"""
+    print("\n🧱 렌더 백엔드 테스트...")
+    
+    from PIL import Image
+    from generation_service import StubController
+    from keynote_generator_main import SlideData, create_slide_structure
+    from render_backend import (ControllerBackend, MemoryBackend, create_backend,
+                                register_backend, render_presentation)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, 'template.key')
+        with open(template_path, 'wb') as f:
+            f.write(b'template')
+        images = []
+        for i in range(5):
+            path = os.path.join(temp_dir, f"image{i}.png")
+            Image.new('RGB', (300 + 50 * i, 200), 'green').save(path)
+            images.append({'path': path, 'name': os.path.basename(path)})
+        text = "백엔드 테스트\n\n첫 문단입니다.\n\n두 번째 문단입니다."
+        slides = create_slide_structure(text, images)
+        
+        backend = MemoryBackend()
+        result = render_presentation(backend, template_path, os.path.join(temp_dir, 'out.key'),
+                                     slides)
+        document = backend.saved.get(os.path.join(temp_dir, 'out.key'))
+        placed = sum(len(slide.images) for slide in document.slides) if document else 0
+        if not result or len(document.slides) != len(slides) or placed != len(images):
+            print(f"❌ 메모리 문서 오류: {result}, 이미지 {placed}/{len(images)}")
+            return False
+        if [name for name, _ in backend.calls] != ['create_presentation', 'add_slides', 'save']:
+            print(f"❌ 일괄 추가가 아님: {backend.calls}")
+            return False
+        
+        # Keynote 와 같은 오류 모델
+        missing = backend.add_slides([SlideData('content', 'No Such Layout', '제목')])[0]
+        empty = MemoryBackend()
+        if missing.error_class != 'missing_layout' or empty.add_images([]).error_class != 'missing_object':
+            print("❌ 오류 모델 오류")
+            return False
+        
+        # AppleScript 백엔드는 컨트롤러 메서드로 슬라이드마다 호출
+        stub = StubController(slide_latency=0)
+        result = render_presentation(ControllerBackend(stub, slide_delay=0), template_path,
+                                     os.path.join(temp_dir, 'stub.key'), slides)
+        if not result or len(stub.slides) != len(slides):
+            print(f"❌ 컨트롤러 백엔드 오류: {result}")
+            return False
+        
+        # 새 백엔드는 등록만으로 선택 가능
+        register_backend('test-memory', lambda: MemoryBackend(write_files=True))
+        if not isinstance(create_backend('test-memory'), MemoryBackend):
+            print("❌ 백엔드 등록 실패")
+            return False
+        try:
+            create_backend('no-such-backend')
+            print("❌ 알 수 없는 백엔드를 거부하지 않음")
+            return False
+        except ValueError:
+            pass
+        
+        # 계획/스케줄링 처리량 (Keynote 없이 전체 속도로)
+        large_plan = [SlideData('content', 'Title & Bullets', f"제목 {i}", "본문 " * 20)
+                      for i in range(10000)]
+        start_time = time.perf_counter()
+        render_presentation(MemoryBackend(), template_path, os.path.join(temp_dir, 'large.key'),
+                            large_plan)
+        elapsed = time.perf_counter() - start_time
+    
+    print(f"✅ 메모리 백엔드 {len(large_plan):,}장 {elapsed:.3f}초 "
+          f"({len(large_plan) / elapsed:,.0f}장/초)")
+    return True
+
+def test_render_farm():
+    """렌더 팜 디스패처 테스트 (로컬 에이전트, 부하 분산, 자산 캐시, 재시도)"""
+    print("\n🏭 렌더 팜 테스트...")
+    
+    import hashlib
+    import socket
+    import threading
+    from PIL import Image
+    from keynote_generator_main import create_slide_structure
+    from render_backend import MemoryBackend
+    from render_farm import FarmError, RenderAgent, RenderFarm, create_agent_server
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = []
+        for i in range(4):
+            path = os.path.join(temp_dir, f"image{i}.png")
+            Image.new('RGB', (300 + 60 * i, 200), 'purple').save(path)
+            images.append({'path': path, 'name': os.path.basename(path)})
+        template_path = os.path.join(temp_dir, 'template.key')
+        with open(template_path, 'wb') as f:
+            f.write(b'template' * 1000)
+        
+        servers = []
+        for i in range(2):
+            agent = RenderAgent(os.path.join(temp_dir, f"agent{i}"),
+                                lambda: MemoryBackend(write_files=True, slide_latency=0.002))
+            server = create_agent_server(agent, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+        
+        # 응답하지 않는 에이전트 (닫힌 포트) 도 섞어 재시도 확인
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            dead_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        urls = [dead_url] + [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+        
+        farm = RenderFarm(urls, request_timeout=5)
+        try:
+            plans = [create_slide_structure(f"팜 {i}\n\n문단 하나\n\n문단 둘\n• 항목", images)
+                     for i in range(12)]
+            futures = [farm.submit(plan, template_path, os.path.join(temp_dir, 'out', f"{i}.json"))
+                       for i, plan in enumerate(plans)]
+            results = [future.result(timeout=30) for future in futures]
+            metrics = farm.metrics()
+            
+            # 시간 초과로 실패한 작업도 에이전트에서 지움 (기록/결과 파일이 남지 않음)
+            impatient = RenderFarm(urls[1:2], max_attempts=1, job_timeout=0, request_timeout=5)
+            try:
+                impatient.render(plans[0], template_path, os.path.join(temp_dir, 'late.json'))
+                timed_out = False
+            except FarmError as e:
+                timed_out = e.error_class == 'timeout'
+            finally:
+                impatient.shutdown()
+            agents = [server.agent for server in servers]
+            deadline = time.time() + 5
+            while any(agent.queue_depth for agent in agents) and time.time() < deadline:
+                time.sleep(0.01)
+            leftovers = [len(agent._jobs) + len(os.listdir(agent.output_dir)) for agent in agents]
+        finally:
+            farm.shutdown()
+            for server in servers:
+                server.shutdown()
+                server.server_close()
+        
+        with open(results[0]['output_path'], 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    
+    dispatched = {state['url']: state['dispatched'] for state in metrics['agents']}
+    counters = metrics['counters']
+    if len(document['slides']) != len(plans[0]) or counters['succeeded'] != len(plans):
+        print(f"❌ 렌더 결과 오류: {counters}")
+        return False
+    if metrics['agents'][0]['failures'] == 0 or any(result['agent'] == dead_url for result in results):
+        print(f"❌ 죽은 에이전트 처리 오류: {metrics['agents']}")
+        return False
+    live = [dispatched[url] for url in urls[1:]]
+    if min(live) < len(plans) // 4:
+        print(f"❌ 부하 분산 오류: {dispatched}")
+        return False
+    # 이미지 4장 + 템플릿을 에이전트마다 한 번만 전송
+    if counters['assets_uploaded'] > 2 * (len(images) + 1):
+        print(f"❌ 자산 중복 전송: {counters}")
+        return False
+    
+    if not timed_out or any(leftovers):
+        print(f"❌ 끝난 작업이 에이전트에 남음: 시간 초과 {timed_out}, 남은 기록/파일 {leftovers}")
+        return False
+    
+    # 에이전트 자산은 크기 한도를 넘으면 오래 쓰지 않은 것부터, 끝난 작업 기록은 보관 시간이 지나면 삭제
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agent = RenderAgent(temp_dir, MemoryBackend, max_asset_bytes=2500, job_ttl=0)
+        keys = []
+        for i in range(3):
+            data = bytes([i]) * 1000
+            keys.append(hashlib.sha256(data).hexdigest() + '.png')
+            agent.put_asset(keys[-1], data)
+            os.utime(agent.asset_path(keys[-1]), (i, i))
+        job = agent.submit({'template': keys[0], 'plan': []})
+        deadline = time.time() + 5
+        while not job.finished_at and time.time() < deadline:
+            time.sleep(0.01)
+        agent._prune_jobs()
+        if agent.missing_assets(keys) != keys[:1] or agent.get(job.job_id) is not None:
+            print(f"❌ 에이전트 보관 한도 오류: {agent.missing_assets(keys)}, {agent._jobs}")
+            return False
+    
+    # 연결 실패, 5xx, 재시도 가능한 렌더 오류만 에이전트를 잠시 뺌 (큐 가득 참, 4xx, 계획 오류는 아님)
+    faults = [error.agent_fault for error in (
+        FarmError("연결 실패"), FarmError("서버 오류", 500), FarmError("큐 가득 참", 503),
+        FarmError("너무 큼", 413, retryable=False), FarmError("멈춤", error_class='timeout'),
+        FarmError("객체 없음", retryable=False, error_class='missing_object'))]
+    if faults != [True, True, False, False, True, False]:
+        print(f"❌ 에이전트 고장 판정 오류: {faults}")
+        return False
+    
+    print(f"✅ 작업 {len(plans)}개 분배 {live}, 자산 업로드 {counters['assets_uploaded']}개 "
+          f"(캐시 적중 {counters['asset_cache_hits']}회), 재시도 {counters['retries']}회")
+    return True
+
+def test_output_sink():
+    """출력 관리 테스트 (원자적 저장, 내용 해시 재사용, 끊긴 결과 거부, 보관 정책)"""
+    print("\n💾 출력 관리 테스트...")
+    
+    import shutil
+    import threading
+    import zipfile
+    from generation_service import GenerationService, StubController, load_templates
+    from keynote_generator_main import create_slide_structure
+    from output_sink import OutputSink, RetentionPolicy, TEMP_DIR_NAME
+    
+    def write_key(path, payload):
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('Index/Document.iwa', payload)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, 'template.key')
+        with open(template_path, 'wb') as f:
+            f.write(b'template')
+        sink = OutputSink(os.path.join(temp_dir, 'out'), retention=RetentionPolicy(max_files=2))
+        slides = create_slide_structure("출력 테스트\n\n문단\n• 항목", [])
+        key = sink.content_key(slides, template_path)
+        
+        # 템플릿 경로가 달라도 내용이 같으면 같은 키
+        copy_path = os.path.join(temp_dir, 'copy.key')
+        shutil.copy(template_path, copy_path)
+        if sink.content_key(slides, copy_path) != key or sink.existing(key):
+            print("❌ 내용 해시 키 오류")
+            return False
+        
+        # 끝까지 쓰이지 않은 zip 은 최종 경로에 나타나지 않음
+        temp_path = sink.reserve(key)
+        write_key(temp_path, b'x' * 10000)
+        with open(temp_path, 'r+b') as f:
+            f.truncate(os.path.getsize(temp_path) - 30)
+        try:
+            sink.commit(key, temp_path)
+            print("❌ 잘린 결과를 받아들임")
+            return False
+        except OSError:
+            pass
+        if os.path.exists(sink.path_for(key)) or os.listdir(sink.temp_root):
+            print("❌ 잘린 결과가 남음")
+            return False
+        
+        # 같은 키를 동시에 저장해도 결과는 하나
+        committed = []
+        def commit_one(i):
+            path = sink.reserve(key)
+            write_key(path, f"결과 {i}".encode('utf-8'))
+            committed.append(sink.commit(key, path))
+        threads = [threading.Thread(target=commit_one, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if set(committed) != {sink.path_for(key)} or sink.existing(key) != sink.path_for(key) \
+                or not zipfile.is_zipfile(sink.path_for(key)) or os.listdir(sink.temp_root):
+            print(f"❌ 동시 저장 오류: {committed}")
+            return False
+        
+        # 보관 정책: 최근 2개만 남기고 내보낸 PDF 도 함께 삭제
+        keys = []
+        for i in range(3):
+            other = sink.content_key(create_slide_structure(f"다른 발표 {i}", []), template_path)
+            path = sink.reserve(other)
+            write_key(path, b'other')
+            final_path = sink.commit(other, path)
+            with open(os.path.splitext(final_path)[0] + '.pdf', 'wb') as f:
+                f.write(b'%PDF')
+            os.utime(final_path + '.manifest.json', (1000 + i, 1000 + i))
+            keys.append(other)
+        sink.existing(key)  # 방금 사용한 결과는 유지
+        stale_dir = os.path.join(sink.root, TEMP_DIR_NAME, 'stale')
+        os.makedirs(stale_dir)
+        os.utime(stale_dir, (0, 0))
+        removed = sink.cleanup()
+        remaining = [entry['path'] for entry in sink.outputs()]
+        if remaining != [sink.path_for(key), sink.path_for(keys[2])] \
+                or os.path.exists(os.path.splitext(sink.path_for(keys[0]))[0] + '.pdf') \
+                or os.path.exists(stale_dir):
+            print(f"❌ 보관 정책 오류: {remaining}, {removed}")
+            return False
+        
+        # 생성 서비스를 다시 시작해도 같은 요청은 기존 결과를 다시 사용
+        jobs = []
+        for _ in range(2):
+            service = GenerationService(load_templates(),
+                                        output_dir=os.path.join(temp_dir, 'service'),
+                                        controller_factory=lambda: StubController(0.0),
+                                        slide_delay=0.0)
+            job, _ = service.submit({'text': "서비스 출력\n\n문단 하나", 'template': '1'})
+            deadline = time.time() + 10
+            while not job.finished and time.time() < deadline:
+                time.sleep(0.01)
+            jobs.append(job)
+        if any(job.status != 'done' for job in jobs) or jobs[0].output_path != jobs[1].output_path \
+                or not any(event['message'] == "기존 결과 사용" for event in jobs[1].events):
+            print(f"❌ 서비스 결과 재사용 오류: {[(job.status, job.output_path) for job in jobs]}")
+            return False
+    
+    print(f"✅ 원자적 저장, 동시 저장 {len(committed)}건 → 1개, 정리 {len(removed)}개, 서비스 재사용")
+    return True
+
+def test_slide_annotations():
+    """발표자 노트/텍스트 서식 일괄 적용 테스트 (osascript 대신 빈 프로세스로 처리량 측정)"""
+    print("\n🗒️ 노트/서식 테스트...")
+    
+    from keynote_generator_main import (AppleScriptController, ControllerTelemetry, ScriptResult,
+                                        SlideData, StyleRun, create_slide_structure,
+                                        generate_presentation)
+    from render_backend import MemoryBackend, render_presentation
+    
+    text = "노트 테스트\n\n첫 문단\n• 항목 하나\n노트: 첫 문단 \"강조\" 설명\n\n둘째 문단\n본문\nNotes: second"
+    slides = create_slide_structure(text, [])
+    if [slide.notes for slide in slides] != ['', '첫 문단 "강조" 설명', 'second'] \
+            or any('노트' in slide.content or 'Notes' in slide.content for slide in slides):
+        print(f"❌ 노트 분리 오류: {[(slide.content, slide.notes) for slide in slides]}")
+        return False
+    faq = create_slide_structure("안내\n\nFAQ\nNote: prices exclude VAT\n메모: 회의실 B\n  노트: 들여쓴 줄", [])
+    if faq[1].notes or faq[1].content != "Note: prices exclude VAT\n메모: 회의실 B\n  노트: 들여쓴 줄":
+        print(f"❌ 본문 줄이 노트로 옮겨짐: {(faq[1].content, faq[1].notes)}")
+        return False
+    
+    slides[1].style_runs = [StyleRun(text_item=1, font='Helvetica Neue', size=40),
+                            StyleRun(start=3, end=6, color=(255, 0, 0))]
+    restored = SlideData.from_json(slides[1].to_json())
+    if restored != slides[1]:
+        print(f"❌ JSON 왕복 오류: {restored}")
+        return False
+    
+    # 중간 슬라이드 추가가 실패해도 노트는 올바른 슬라이드에, 적용은 한 번만
+    broken = SlideData(slide_type='content', layout='없는 레이아웃', title='실패', notes='버려짐')
+    plan = [slides[0], broken, slides[1], slides[2]]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, 'template.key')
+        open(template_path, 'wb').close()
+        backend = MemoryBackend()
+        render_presentation(backend, template_path, os.path.join(temp_dir, 'out.key'), plan)
+    document = backend.saved[os.path.join(temp_dir, 'out.key')]
+    if [slide.notes for slide in document.slides] != ['', '첫 문단 "강조" 설명', 'second'] \
+            or document.slides[1].style_runs != slides[1].style_runs \
+            or [call for call in backend.calls if call[0] == 'annotate_slides'] != [('annotate_slides', 2)]:
+        print(f"❌ 메모리 백엔드 적용 오류: {backend.calls}")
+        return False
+    
+    # 계획 JSON 의 서식 구간은 값 형식을 검사 (AppleScript 문장에 그대로 들어가므로)
+    run = StyleRun.from_dict({'text_item': '1', 'start': 2.0, 'end': 5, 'size': '36', 'color': [255, 0, 0]})
+    if (run.text_item, run.start, run.end, run.size, run.color) != (1, 2, 5, 36.0, (255, 0, 0)):
+        print(f"❌ 서식 구간 변환 오류: {run}")
+        return False
+    for bad in ({'size': '36 to 1\ndo shell script "id"'}, {'color': [255, 0, '0}\ndo shell script "id"']},
+                {'start': 'x'}, {'end': [1]}, {'font': 3}, {'color': [1, 2]}, {'size': float('nan')},
+                {'text_item': True}, {'script': 'id'}):
+        try:
+            StyleRun.from_dict(bad)
+        except ValueError:
+            continue
+        print(f"❌ 잘못된 서식 구간 허용: {bad}")
+        return False
+    
+    # AppleScript 는 모든 슬라이드의 노트/서식을 스크립트 하나로 보냄
+    deck = [SlideData(slide_type='content', layout='Title & Bullets', title=f"슬라이드 {i}",
+                      content="본문", notes=f"발표자 노트 {i}\n두 번째 줄 \\ \"따옴표\"",
+                      style_runs=[StyleRun(text_item=1, size=36)])
+            for i in range(100)]
+    scripts = []
+    
+    def spawn(cls, script):
+        # osascript 대신 빈 프로세스를 띄워 프로세스 생성 비용만 측정
+        scripts.append(script)
+        subprocess.run(['true'])
+        return ScriptResult(True, output='0')
+    
+    original_run_once = AppleScriptController._run_once
+    original_telemetry = AppleScriptController.telemetry
+    original_limit = AppleScriptController.ANNOTATION_SCRIPT_BYTES
+    AppleScriptController._run_once = classmethod(spawn)
+    AppleScriptController.telemetry = ControllerTelemetry()
+    try:
+        result = generate_presentation('template.key', 'out.key', deck, slide_delay=0.0)
+        operations = AppleScriptController.telemetry.summary()['operations']
+        annotate_script = scripts[-2]
+        
+        scripts.clear()
+        annotations = [(i + 1, slide) for i, slide in enumerate(deck)]
+        start = time.perf_counter()
+        for position, slide in annotations:
+            AppleScriptController.annotate_slides([(position, slide)], len(deck))
+        per_slide_time = time.perf_counter() - start
+        per_slide_calls = len(scripts)
+        
+        scripts.clear()
+        start = time.perf_counter()
+        bulk = AppleScriptController.annotate_slides(annotations, len(deck))
+        bulk_time = time.perf_counter() - start
+        bulk_calls = len(scripts)
+        
+        AppleScriptController.ANNOTATION_SCRIPT_BYTES = 4096
+        scripts.clear()
+        AppleScriptController.annotate_slides(annotations, len(deck))
+        chunked_calls = len(scripts)
+    finally:
+        AppleScriptController._run_once = original_run_once
+        AppleScriptController.telemetry = original_telemetry
+        AppleScriptController.ANNOTATION_SCRIPT_BYTES = original_limit
+    
+    if not result or 'annotate_slides' not in operations \
+            or annotate_script.count('set presenter notes to') != len(deck) \
+            or '\\\\ \\"따옴표\\"' not in annotate_script \
+            or 'characters' in annotate_script or 'set size of object text of text item 1' not in annotate_script:
+        print(f"❌ 일괄 스크립트 오류: {operations}\n{annotate_script[:500]}")
+        return False
+    if bulk_calls != 1 or per_slide_calls != len(deck) or not bulk or bulk.output != '0' \
+            or not 1 < chunked_calls < len(deck):
+        print(f"❌ 호출 수 오류: 일괄 {bulk_calls}, 슬라이드별 {per_slide_calls}, 분할 {chunked_calls}")
+        return False
+    
+    print(f"✅ 노트 {len(deck)}장: 슬라이드별 {per_slide_calls}회 {len(deck) / per_slide_time:.0f}장/초 → "
+          f"일괄 {bulk_calls}회 {len(deck) / bulk_time:.0f}장/초 (프로세스 생성 비용만)")
+    return True
+
+def test_config_reload():
+    """설정 검증/캐시/변경 감시와 의존 캐시 무효화 테스트"""
+    print("\n⚙️ 설정 다시 읽기 테스트...")
+    
+    import copy
+    import random
+    from app_config import AppConfig, ConfigChange, ConfigError, ConfigStore
+    from generation_service import GenerationService, StubController
+    from keynote_generator_main import LayoutSelector, SlideData
+    from slide_preview import SlidePreviewRenderer
+    
+    with open('config.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    config = AppConfig.load('config.json')
+    
+    # config.json 규칙은 코드의 기본 규칙과 같은 결과
+    rng = random.Random(0)
+    analyses = [{'text_type': rng.choice(['title_subtitle', 'bullet_list', 'standard_content']),
+                 'text_length': rng.randint(0, 800), 'image_count': rng.randint(0, 3)}
+                for _ in range(500)]
+    defaults = [LayoutSelector.select_optimal_layout(analysis) for analysis in analyses]
+    try:
+        LayoutSelector.configure(config.layout_rules)
+        configured = [LayoutSelector.select_optimal_layout(analysis) for analysis in analyses]
+    finally:
+        LayoutSelector.configure(None)
+    if configured != defaults:
+        print("❌ config.json 레이아웃 규칙이 기본 규칙과 다름")
+        return False
+    
+    # 문제는 한 번에 모두 보고하고, 조건식은 허용된 구문만 컴파일
+    broken = copy.deepcopy(data)
+    broken['templates']['3'] = {'description': '경로 없음'}
+    broken['layout_rules']['title_slide']['condition'] = "__import__('os').system('true')"
+    broken['image_settings']['positions']['left']['width'] = -1
+    broken['ui_settings']['font_size'] = True
+    try:
+        AppConfig.parse(broken)
+        print("❌ 잘못된 설정을 받아들임")
+        return False
+    except ConfigError as e:
+        problems = e.problems
+    if len(problems) != 4:
+        print(f"❌ 검증 문제 목록 오류: {problems}")
+        return False
+    
+    # 자원 한도는 1 이상의 정수만 (null/실수는 설정 오류), 검증을 거치지 않은 null 은 기본값
+    from resource_limits import ResourceLimits
+    for name, value in (('max_slides', None), ('max_images', 2.5), ('max_memory_mb', None)):
+        limited = copy.deepcopy(data)
+        limited['resource_limits'][name] = value
+        try:
+            AppConfig.parse(limited)
+            print(f"❌ 잘못된 자원 한도를 받아들임: {name}={value!r}")
+            return False
+        except ConfigError:
+            pass
+    limits = ResourceLimits.from_config({'resource_limits': {'max_slides': None, 'max_memory_mb': None}})
+    if limits.max_slides != ResourceLimits().max_slides \
+            or limits.max_memory_bytes != ResourceLimits().max_memory_bytes:
+        print(f"❌ null 자원 한도가 기본값이 아님: {limits}")
+        return False
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'config.json')
+        version = [0]
+        
+        def write(content):
+            version[0] += 1
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.utime(path, ns=(version[0] * 10 ** 9, version[0] * 10 ** 9))
+        
+        write(data)
+        store = ConfigStore(path)
+        changes = []
+        store.subscribe(lambda new_config, change: changes.append(change))
+        first = store.get()
+        if store.get() is not first or store.check() is not None:
+            print("❌ 바뀌지 않은 설정을 다시 읽음")
+            return False
+        
+        # 템플릿 하나와 레이아웃 규칙 하나만 변경
+        edited = copy.deepcopy(data)
+        edited['templates']['2']['path'] = 'templates/2-new.key'
+        edited['layout_rules']['content_heavy']['priority'] = 4
+        write(edited)
+        change = store.check()
+        if change is None or change.templates != {'2'} or not change.rules_changed \
+                or change.positions_changed or change.limits_changed or len(changes) != 1:
+            print(f"❌ 변경 내역 오류: {change}")
+            return False
+        
+        # 잘못 고친 파일은 이전 설정 유지
+        write(broken)
+        if store.check() is not None or store.last_error is None \
+                or store.get().templates['2'].path != 'templates/2-new.key':
+            print("❌ 잘못된 설정으로 교체됨")
+            return False
+        
+        # 서비스: 바뀐 템플릿으로 만든 결과만 병합 기록에서 제외
+        service = GenerationService({'1': 'templates/1.key', '2': 'templates/2.key'},
+                                    output_dir=os.path.join(temp_dir, 'service'),
+                                    controller_factory=lambda: StubController(0.0),
+                                    slide_delay=0.0)
+        
+        def run(template_id):
+            job, coalesced = service.submit({'text': "설정 테스트\n\n문단", 'template': template_id})
+            deadline = time.time() + 10
+            while not job.finished and time.time() < deadline:
+                time.sleep(0.01)
+            return job, coalesced
+        
+        jobs = {template_id: run(template_id)[0] for template_id in ('1', '2')}
+        service.apply_config(store.get(), ConfigChange(sections={'templates'}, templates={'2'}))
+        same_1, coalesced_1 = run('1')
+        new_2, coalesced_2 = run('2')
+        if not coalesced_1 or same_1 is not jobs['1'] or coalesced_2 \
+                or new_2.template_path != 'templates/2-new.key':
+            print(f"❌ 서비스 무효화 오류: {coalesced_1}, {coalesced_2}, {new_2.template_path}")
+            return False
+    
+    # 미리보기: 이미지 위치가 바뀌면 위치 기본값으로 그리는 슬라이드만 캐시 키가 바뀜
+    renderer = SlidePreviewRenderer(copy.deepcopy(config.image.positions))
+    with_image = SlideData(slide_type='content', layout='Title, Bullets & Photo', title='사진',
+                           image_path=os.path.abspath('config.json'))
+    text_only = SlideData(slide_type='content', layout='Title & Bullets', title='글')
+    before = (renderer.slide_hash(with_image), renderer.slide_hash(text_only))
+    renderer.image_positions['right'] = {'x': 0, 'y': 0, 'width': 10, 'height': 10}
+    after = (renderer.slide_hash(with_image), renderer.slide_hash(text_only))
+    renderer.shutdown()
+    if before[0] == after[0] or before[1] != after[1]:
+        print("❌ 미리보기 캐시 무효화 범위 오류")
+        return False
+    
+    print(f"✅ 규칙 {len(config.layout_rules)}개 일치, 검증 문제 {len(problems)}개 보고, "
+          f"템플릿 1개만 무효화")
+    return True
+
+def test_slide_library():
+    """슬라이드 라이브러리 참조/일괄 복제 테스트"""
+    print("\n📚 슬라이드 라이브러리 테스트...")
+    
+    from keynote_generator_main import (AppleScriptController, ControllerTelemetry, ScriptResult,
+                                        SlideData, create_slide_structure,
+                                        generate_presentation)
+    from render_backend import MemoryBackend, render_presentation
+    from slide_library import SlideLibrary
+    
+    text = ("라이브러리 테스트\n\n[[표지]]\n\n첫 문단\n본문\n노트: 첫 문단 노트\n\n"
+            "[[ 목차 ]]\n\n[[섹션 구분]]\n\n둘째 문단\n본문\n\n[[마무리]]")
+    slides = create_slide_structure(text, [])
+    order = [slide.library_slide or slide.title for slide in slides]
+    if order != ['라이브러리 테스트', '표지', '첫 문단', '목차', '섹션 구분', '둘째 문단', '마무리']:
+        print(f"❌ 라이브러리 참조 순서 오류: {order}")
+        return False
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, 'template.key')
+        open(template_path, 'wb').close()
+        
+        # 메모리 백엔드로 만든 문서를 라이브러리로 사용
+        library_path = os.path.join(temp_dir, 'library.key')
+        builder = MemoryBackend(write_files=True)
+        render_presentation(builder, template_path, library_path,
+                            [SlideData(slide_type='content', layout='Title & Bullets',
+                                       title=f"라이브러리 {name}", content=name)
+                             for name in ('표지', '목차', '마무리')])
+        library = SlideLibrary(library_path, {'표지': 1, '목차': 2, '섹션 구분': 2, '마무리': 3})
+        
+        # 없는 이름은 그 슬라이드만 실패하고, 노트는 성공한 위치 기준으로 올바른 슬라이드에
+        plan = slides[:4] + [SlideData(slide_type='library', layout='Library', title='없음',
+                                       library_slide='없음')] + slides[4:]
+        backend = MemoryBackend()
+        output_path = os.path.join(temp_dir, 'out.key')
+        render_presentation(backend, template_path, output_path, plan, library=library)
+        document = backend.saved[output_path]
+        titles = [slide.title for slide in document.slides]
+        imports = [count for operation, count in backend.calls
+                   if operation == 'import_library_slides']
+        if titles != ['라이브러리 테스트', '라이브러리 표지', '첫 문단', '라이브러리 목차',
+                      '라이브러리 목차', '둘째 문단', '라이브러리 마무리'] \
+                or imports != [1, 3, 1] or document.slides[2].notes != '첫 문단 노트':
+            print(f"❌ 메모리 백엔드 복제 오류: {titles}, {backend.calls}")
+            return False
+        
+        # 라이브러리 설정이 없으면 참조 슬라이드만 건너뜀
+        backend = MemoryBackend()
+        render_presentation(backend, template_path, output_path, slides)
+        if len(backend.saved[output_path].slides) != 3:
+            print("❌ 라이브러리 없이 렌더링 오류")
+            return False
+    
+    # AppleScript: 연속된 라이브러리 슬라이드 3장은 스크립트 한 번 (새로 만들면 3번)
+    section = [SlideData(slide_type='library', layout='Library', title=name, library_slide=name)
+               for name in ('표지', '목차', '마무리')]
+    built = [SlideData(slide_type='content', layout='Title & Bullets', title=name, content=name)
+             for name in ('표지', '목차', '마무리')]
+    library = SlideLibrary('/tmp/library.key', {'표지': 1, '목차': 2, '마무리': 3})
+    scripts = []
+    
+    def fake_run(cls, script):
+        scripts.append(script)
+        return ScriptResult(True, output='1,0,1' if 'duplicate slide' in script else '')
+    
+    original_run_once = AppleScriptController._run_once
+    original_telemetry = AppleScriptController.telemetry
+    AppleScriptController._run_once = classmethod(fake_run)
+    try:
+        AppleScriptController.telemetry = ControllerTelemetry()
+        result = generate_presentation('template.key', 'out.key', section, slide_delay=0.0,
+                                       library=library)
+        library_operations = AppleScriptController.telemetry.summary()['operations']
+        import_script = next(script for script in scripts if 'duplicate slide' in script)
+        
+        AppleScriptController.telemetry = ControllerTelemetry()
+        generate_presentation('template.key', 'out.key', built, slide_delay=0.0)
+        built_operations = AppleScriptController.telemetry.summary()['operations']
+    finally:
+        AppleScriptController._run_once = original_run_once
+        AppleScriptController.telemetry = original_telemetry
+    
+    import_calls = library_operations['import_library_slides']['count']
+    if not result or import_calls != 1 or 'add_slide' in library_operations \
+            or built_operations['add_slide']['count'] != 3 \
+            or '{1, 2, 3}' not in import_script or 'close libraryDoc saving no' not in import_script:
+        print(f"❌ 일괄 복제 오류: {library_operations}\n{import_script[:300]}")
+        return False
+    
+    print(f"✅ 라이브러리 슬라이드 {len(section)}장: 새로 만들기 "
+          f"{built_operations['add_slide']['count']}회 → 복제 {import_calls}회")
+    return True
+
+def test_ui_profiler():
+    """GUI 메인 루프 프로파일러 테스트 (창 없이 tkinter 콜백 래퍼로 핸들러 호출)"""
+    print("\n🩺 메인 루프 프로파일러 테스트...")
+    
+    try:
+        import tkinter
+    except ImportError:
+        print("⚠️ tkinter 없음 - 건너뜀")
+        return True
+    from ui_profiler import MainLoopProfiler
+    
+    def hot_loop(seconds):
+        end = time.perf_counter() + seconds
+        total = 0
+        while time.perf_counter() < end:
+            total += sum(range(100))
+        return total
+    
+    def slow_handler():
+        hot_loop(0.12)
+    
+    def fast_handler(*args):
+        return len(args)
+    
+    def nested_handler():
+        tkinter.CallWrapper(slow_handler, None, None)()
+    
+    class AfterHost:
+        """Misc.after 가 등록하는 콜백만 받아 두는 객체"""
+        def __init__(self):
+            self.tk = type('FakeTk', (), {'call': staticmethod(lambda *args: 'after#1')})()
+            self.registered = []
+        
+        def _register(self, func):
+            self.registered.append(func)
+            return 'callback'
+        
+        def deletecommand(self, name):
+            pass
+    
+    original_wrapper = tkinter.CallWrapper
+    host = AfterHost()
+    profiler = MainLoopProfiler(stall_threshold=0.05, sample_interval=0.002)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with profiler:
+            tkinter.CallWrapper(slow_handler, None, None)()
+            for i in range(200):
+                tkinter.CallWrapper(fast_handler, None, None)(i)
+            tkinter.Misc.after(host, 10, fast_handler, 'after')
+            tkinter.CallWrapper(host.registered[0], None, None)()
+            tkinter.CallWrapper(nested_handler, None, None)()
+            
+            wrapped = tkinter.CallWrapper(fast_handler, None, None)
+            start = time.perf_counter()
+            for i in range(10000):
+                wrapped(i)
+            wrapped_time = time.perf_counter() - start
+        restored = tkinter.CallWrapper is original_wrapper
+        
+        plain = tkinter.CallWrapper(fast_handler, None, None)
+        start = time.perf_counter()
+        for i in range(10000):
+            plain(i)
+        plain_time = time.perf_counter() - start
+        
+        folded_path = profiler.write_folded(os.path.join(temp_dir, 'stalls.folded'))
+        with open(folded_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    handlers = {name.rsplit('.', 1)[-1]: stats for name, stats in profiler.handlers.items()}
+    if not restored or handlers['fast_handler'].count != 10201 \
+            or handlers['slow_handler'].count != 2 or handlers['nested_handler'].stalls != 1:
+        print(f"❌ 핸들러 집계 오류: {profiler.handlers}")
+        return False
+    # 중첩 호출은 바깥 핸들러의 멈춤 하나로만 기록
+    if [stall.handler.rsplit('.', 1)[-1] for stall in profiler.stalls] != ['slow_handler',
+                                                                            'nested_handler']:
+        print(f"❌ 멈춤 기록 오류: {profiler.stalls}")
+        return False
+    if not lines or any('fast_handler' in line or 'CallWrapper' in line for line in lines) \
+            or not all(line.rsplit(' ', 1)[1].isdigit() for line in lines) \
+            or not any(line.split(';')[0].endswith('slow_handler') and 'hot_loop' in line
+                       for line in lines):
+        print(f"❌ folded 스택 오류: {lines[:3]}")
+        return False
+    
+    overhead_us = (wrapped_time - plain_time) / 10000 * 1_000_000
+    print(f"✅ 멈춤 {len(profiler.stalls)}회, 스택 샘플 {sum(profiler.folded.values())}개, "
+          f"핸들러당 측정 비용 {overhead_us:.1f}µs")
+    return True
+
+def test_text_segmentation():
+    """제목/문장 분할과 글자 묶음 폭 테스트 (split 방식과 처리량 비교)"""
+    print("\n✂️ 텍스트 분할 테스트...")
+    
+    import unicodedata
+    from keynote_generator_main import create_slide_structure
+    from text_segmentation import (TITLE_MAX_WIDTH, benchmark_document, display_width,
+                                   iter_blocks, sentence_ends, split_paragraphs, split_title,
+                                   truncate_width)
+    
+    text = ("# 2024 사업 보고서\n부제 줄\n\n"
+            "## 시장 동향\n국내 시장이 성장했습니다.\n• 항목 하나\n\n"
+            "1. 준비\n2. 실행\n3. 정리\n\n"
+            "2.1 세부 분석\n\n분석 본문\n\n"
+            "제 3 장 전망\n\n"
+            "3. 결론\n\n"
+            "결론 문단\n마무리")
+    blocks = [(block.kind, block.text, block.level) for block in iter_blocks(text)]
+    expected = [('heading', '2024 사업 보고서', 1), ('paragraph', '부제 줄', 0),
+                ('heading', '시장 동향', 2), ('paragraph', '국내 시장이 성장했습니다.\n• 항목 하나', 0),
+                ('paragraph', '1. 준비\n2. 실행\n3. 정리', 0),
+                ('heading', '세부 분석', 2), ('paragraph', '분석 본문', 0),
+                ('heading', '전망', 1), ('heading', '결론', 1), ('paragraph', '결론 문단\n마무리', 0)]
+    if blocks != expected:
+        print(f"❌ 블록 분할 오류: {blocks}")
+        return False
+    
+    # 청크 경계가 줄 중간이어도 같은 결과 (스트리밍)
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    if [(block.kind, block.text, block.level) for block in iter_blocks(chunks)] != expected:
+        print("❌ 청크 입력 결과가 다름")
+        return False
+    
+    slides = create_slide_structure(text, [])
+    titles = [slide.title for slide in slides]
+    if titles != ['2024 사업 보고서', '시장 동향', '1. 준비', '세부 분석', '전망', '결론'] \
+            or slides[1].content != '국내 시장이 성장했습니다.\n• 항목 하나' or slides[4].content \
+            or slides[5].content != '결론 문단\n마무리':
+        print(f"❌ 슬라이드 제목 오류: {titles}")
+        return False
+    
+    # "제N부/장/절" 바로 뒤에 글자가 붙은 문장은 제목이 아님
+    sentences = "제2부서는 영업을 담당합니다.\n제1장에서 설명했듯이 중요합니다."
+    if [(block.kind, block.text) for block in iter_blocks(sentences)] != [('paragraph', sentences)] \
+            or [(block.kind, block.text) for block in iter_blocks("제1장\n\n본문")] != [
+                ('heading', '제1장'), ('paragraph', '본문')]:
+        print(f"❌ 제N장 문장이 제목으로 분할됨: {list(iter_blocks(sentences))}")
+        return False
+    
+    # 여러 단계 번호로 시작하는 문장 줄(소수)은 문단 안에 남음
+    report = "매출 요약\n2.5 million users joined this quarter\n3.0 버전 출시 후 성장\n\n결론"
+    if [(block.kind, block.text) for block in iter_blocks(report)] != [
+            ('paragraph', "매출 요약\n2.5 million users joined this quarter\n3.0 버전 출시 후 성장"),
+            ('paragraph', '결론')]:
+        print(f"❌ 소수 줄이 제목으로 분할됨: {list(iter_blocks(report))}")
+        return False
+    slides = create_slide_structure("분기 보고\n\n" + report, [])
+    if [slide.title for slide in slides] != ['분기 보고', '매출 요약', '결론'] \
+            or slides[1].content != "2.5 million users joined this quarter\n3.0 버전 출시 후 성장":
+        print(f"❌ 소수 줄 슬라이드 오류: {[(slide.title, slide.content) for slide in slides]}")
+        return False
+    
+    # 긴 한국어 첫 줄: 폭 안에 드는 첫 문장이 제목, 아니면 글자 묶음 경계에서 자름
+    title, content = split_title("회의 결과를 공유합니다. " + "세부 내용은 다음과 같습니다 " * 5)
+    if title != "회의 결과를 공유합니다." or not content.startswith("세부 내용은"):
+        print(f"❌ 첫 문장 제목 오류: {title}")
+        return False
+    decomposed = unicodedata.normalize('NFD', "한국어 제목이 아주 길게 이어지는 경우의 처리 " * 3)
+    for line in (decomposed, "팀 👩‍👩‍👧‍👦 가족 🇰🇷 " * 10):
+        title, content = split_title(line)
+        kept = title[:-3]
+        if not title.endswith('...') or display_width(kept) > TITLE_MAX_WIDTH \
+                or unicodedata.normalize('NFC', kept) != unicodedata.normalize('NFC', line[:len(kept)]) \
+                or content != line:
+            print(f"❌ 폭 기준 자르기 오류: {title!r}")
+            return False
+        next_char = line[len(kept)]
+        if unicodedata.combining(next_char) or 0x1160 <= ord(next_char) <= 0x11ff \
+                or next_char in ('\u200d', '\U0001f1f7'):
+            print(f"❌ 글자 묶음 중간에서 자름: {title!r}")
+            return False
+    if display_width("한글abc") != 7 or truncate_width("漢字かなabc", 5) != "漢字":
+        print("❌ 표시 폭 계산 오류")
+        return False
+    
+    sample = "Dr. Kim said 3.14 is pi. J. Smith agreed! 좋다。다음 문장\n1. 목록 항목"
+    ends = [sample[:end].rsplit(None, 1)[-1] for end in sentence_ends(sample)]
+    if ends != ['pi.', 'agreed!', '좋다。']:
+        print(f"❌ 문장 경계 오류: {ends}")
+        return False
+    
+    # 처리량: 빈 줄로만 나누는 이전 방식과 비교
+    document = benchmark_document(2.0)
+    megabytes = len(document.encode('utf-8')) / (1024 * 1024)
+    start = time.perf_counter()
+    paragraphs = sum(1 for _ in split_paragraphs(document))
+    split_time = time.perf_counter() - start
+    start = time.perf_counter()
+    block_count = 0
+    for block in iter_blocks(document):
+        block_count += 1
+        if block.kind == 'paragraph':
+            split_title(block.text)
+    segment_time = time.perf_counter() - start
+    
+    print(f"✅ 제목 {sum(kind == 'heading' for kind, _, _ in expected)}개 인식, 문장 경계 {len(ends)}개")
+    print(f"✅ {megabytes:.1f}MB 혼합 문서: split {paragraphs:,}문단 {megabytes / split_time:.1f}MB/s, "
+          f"스트리밍 분할 {block_count:,}블록 {megabytes / segment_time:.1f}MB/s")
+    return True
+
 def generate_test_report():
     """테스트 보고서 생성"""
     print("\n📊 테스트 결과 요약")
@@ -263,6 +1914,26 @@ def generate_test_report():
         ("접근성 권한", test_accessibility_permissions),
         ("컨트롤러 파일", test_applescript_controller),
         ("샘플 생성", create_sample_test),
+        ("미리보기", test_slide_preview),
+        ("내보내기", test_export_pipeline),
+        ("지연 임포트", test_lazy_imports),
+        ("텍스트 맞춤", test_text_fitting),
+        ("컨트롤러 결과", test_controller_results),
+        ("생성 서비스", test_generation_service),
+        ("이미지 배정", test_image_assignment),
+        ("다중 이미지", test_image_packing),
+        ("자원 한도", test_resource_limits),
+        ("템플릿 카탈로그", test_template_catalog),
+        ("재현 번들", test_replay_bundle),
+        ("문단 특징", test_text_features),
+        ("렌더 백엔드", test_render_backend),
+        ("렌더 팜", test_render_farm),
+        ("출력 관리", test_output_sink),
+        ("노트/서식", test_slide_annotations),
+        ("설정 다시 읽기", test_config_reload),
+        ("슬라이드 라이브러리", test_slide_library),
+        ("메인 루프 프로파일러", test_ui_profiler),
+        ("텍스트 분할", test_text_segmentation),
         ("성능", run_performance_test)
     ]
     
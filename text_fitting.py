@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📏 텍스트 맞춤 엔진
+레이아웃 자리표시자 크기와 글꼴 폭 테이블로 텍스트를 측정해
+넘치는 문단을 작은 글꼴로 맞추거나 이어지는 슬라이드로 나눔
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import math
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from text_segmentation import sentence_ends
+
+if TYPE_CHECKING:
+    from keynote_generator_main import SlideData
+
+# 레이아웃별 자리표시자 (Keynote 기본 테마 1024x768 기준, config.json positions 와 같은 형식)
+LAYOUT_PLACEHOLDERS = {
+    'Title & Subtitle': {
+        'title': {'x': 112, 'y': 250, 'width': 800, 'height': 130, 'font_size': 54},
+        'body': {'x': 112, 'y': 400, 'width': 800, 'height': 90, 'font_size': 28}
+    },
+    'Title & Bullets': {
+        'title': {'x': 60, 'y': 40, 'width': 904, 'height': 100, 'font_size': 40},
+        'body': {'x': 60, 'y': 170, 'width': 904, 'height': 540, 'font_size': 28}
+    },
+    'Title, Bullets & Photo': {
+        'title': {'x': 60, 'y': 40, 'width': 904, 'height': 100, 'font_size': 40},
+        'body': {'x': 60, 'y': 170, 'width': 420, 'height': 540, 'font_size': 24}
+    },
+    'Photo - 3 Up': {
+        'title': {'x': 60, 'y': 40, 'width': 904, 'height': 100, 'font_size': 40},
+        'body': {'x': 60, 'y': 660, 'width': 904, 'height': 60, 'font_size': 20},
+        'photos': {'x': 60, 'y': 160, 'width': 904, 'height': 480}
+    }
+}
+
+DEFAULT_LAYOUT = 'Title & Bullets'
+
+# 줄 높이 (글꼴 크기 대비)
+LINE_SPACING = 1.2
+
+# 기본 글꼴 크기에서 이 비율까지 줄여 보고, 그래도 넘치면 슬라이드를 나눔
+MIN_FONT_SCALE = 0.75
+FONT_SIZE_STEP = 2
+
+CONTINUATION_SUFFIX = " (계속)"
+
+
+class FontMetrics:
+    """글자 폭 테이블 (em 단위, 글자별로 메모이즈)
+
+    font_path 를 주면 PIL 로 실제 TrueType 글꼴 폭을 측정하고, 없으면
+    유니코드 문자 범주로 추정한 폭을 사용합니다 (macOS 글꼴이 없는 환경용).
+    """
+
+    # 측정용 글꼴 크기 (em 단위로 환산하기 위한 기준)
+    MEASURE_SIZE = 100
+
+    def __init__(self, font_path: Optional[str] = None):
+        self.font_path = font_path
+        self._font = None
+        self._char_widths: Dict[str, float] = {}
+        self._word_widths: Dict[str, float] = {}
+
+    def char_width(self, char: str) -> float:
+        """글자 폭 (em)"""
+        width = self._char_widths.get(char)
+        if width is None:
+            width = self._measure_char(char)
+            self._char_widths[char] = width
+        return width
+
+    def word_width(self, word: str) -> float:
+        """단어 폭 (em) - 같은 단어가 자주 반복되므로 단어 단위로도 메모이즈"""
+        width = self._word_widths.get(word)
+        if width is None:
+            char_widths = self._char_widths
+            width = 0.0
+            for char in word:
+                char_width = char_widths.get(char)
+                if char_width is None:
+                    char_width = self.char_width(char)
+                width += char_width
+            if len(self._word_widths) < 100_000:
+                self._word_widths[word] = width
+        return width
+
+    def text_width(self, text: str, font_size: float) -> float:
+        """텍스트 폭 (포인트)"""
+        return self.word_width(text) * font_size
+
+    def _measure_char(self, char: str) -> float:
+        if self.font_path:
+            if self._font is None:
+                from PIL import ImageFont
+                self._font = ImageFont.truetype(self.font_path, self.MEASURE_SIZE)
+            return self._font.getlength(char) / self.MEASURE_SIZE
+        return self._estimate_char(char)
+
+    @staticmethod
+    def _estimate_char(char: str) -> float:
+        """문자 범주로 글자 폭 추정"""
+        if char == ' ':
+            return 0.28
+        if unicodedata.east_asian_width(char) in ('W', 'F'):
+            return 1.0  # 한글, 한자, 가나, 전각 문자
+        if unicodedata.combining(char):
+            return 0.0
+        if char.isdigit():
+            return 0.56
+        if char.isupper():
+            return 0.68
+        if char.isalpha():
+            return 0.52 if char not in 'ijlft' else 0.3
+        if char in '.,:;\'!|':
+            return 0.28
+        return 0.5
+
+
+class TextFitter:
+    """자리표시자에 맞게 슬라이드 텍스트를 맞춤"""
+
+    def __init__(self, metrics: Optional[FontMetrics] = None,
+                 placeholders: Optional[Dict] = None):
+        self.metrics = metrics or FontMetrics()
+        self.placeholders = placeholders or LAYOUT_PLACEHOLDERS
+
+    def body_placeholder(self, layout: str) -> Dict:
+        """레이아웃의 본문 자리표시자"""
+        return self.placeholders.get(layout, self.placeholders[DEFAULT_LAYOUT])['body']
+
+    def wrap(self, text: str, font_size: float, box_width: float) -> List[Tuple[int, str]]:
+        """텍스트를 줄바꿈해 (원래 줄 번호, 줄) 목록 반환"""
+        max_width = box_width / font_size  # em 단위로 비교
+        wrapped = []
+        for line_number, line in enumerate(text.split('\n')):
+            wrapped.extend((line_number, line[start:end])
+                           for start, end in self._line_spans(line, max_width))
+        return wrapped
+
+    def _line_spans(self, line: str, max_width: float) -> List[Tuple[int, int]]:
+        """한 줄을 줄바꿈한 구간 (시작, 끝) 목록 - 단어 경계 우선, 긴 단어는 글자 단위"""
+        word_widths = self.metrics._word_widths  # 메모이즈 테이블 직접 조회 (핫 루프)
+        word_width = self.metrics.word_width
+        char_width = self.metrics.char_width
+        space = char_width(' ')
+        spans = []
+        start: Optional[int] = None
+        end = 0
+        width = 0.0
+        position = 0
+
+        for word in line.split(' '):
+            word_start, word_end = position, position + len(word)
+            position = word_end + 1
+            current_width = word_widths.get(word)
+            if current_width is None:
+                current_width = word_width(word)
+
+            if start is not None and width + space + current_width <= max_width:
+                end, width = word_end, width + space + current_width
+                continue
+
+            if start is not None:
+                spans.append((start, end))
+            if current_width <= max_width:
+                start, end, width = word_start, word_end, current_width
+                continue
+
+            # 한 줄보다 긴 단어 (띄어쓰기 없는 긴 문장, URL 등)는 글자 단위로 자름
+            piece_start, piece_width = word_start, 0.0
+            for index in range(word_start, word_end):
+                current_char = char_width(line[index])
+                if piece_width + current_char > max_width and index > piece_start:
+                    spans.append((piece_start, index))
+                    piece_start, piece_width = index, 0.0
+                piece_width += current_char
+            start, end, width = piece_start, word_end, piece_width
+
+        if start is not None:
+            spans.append((start, end))
+        return spans
+
+    def max_lines(self, placeholder: Dict, font_size: float) -> int:
+        """자리표시자에 들어가는 줄 수"""
+        return max(1, int(placeholder['height'] // (font_size * LINE_SPACING)))
+
+    def line_widths(self, text: str) -> List[float]:
+        """줄별 폭 (em, 줄바꿈 전)"""
+        word_width = self.metrics.word_width
+        space = self.metrics.char_width(' ')
+        return [sum(map(word_width, line.split(' '))) + space * line.count(' ')
+                for line in text.split('\n')]
+
+    def fits(self, text: str, layout: str, font_size: Optional[float] = None,
+             line_widths: Optional[List[float]] = None) -> bool:
+        """텍스트가 본문 자리표시자에 들어가는지 확인
+
+        line_widths 를 주면 줄 수 하한으로 확실히 넘치는 경우를 줄바꿈 없이 걸러냅니다.
+        """
+        placeholder = self.body_placeholder(layout)
+        font_size = font_size or placeholder['font_size']
+        max_width = placeholder['width'] / font_size
+        remaining = self.max_lines(placeholder, font_size)
+
+        if line_widths is not None:
+            min_lines = sum(max(1, math.ceil(width / max_width)) for width in line_widths)
+            if min_lines > remaining:
+                return False
+
+        for line in text.split('\n'):
+            remaining -= len(self._line_spans(line, max_width))
+            if remaining < 0:
+                return False
+        return True
+
+    def fit_slide(self, slide: "SlideData") -> List["SlideData"]:
+        """슬라이드 하나를 맞춤 (작은 글꼴 레이아웃 또는 이어지는 슬라이드로 분할)"""
+        if slide.slide_type == 'title' or not slide.content:
+            return [slide]
+
+        # 1. 같은 레이아웃(이미지가 없으면 본문이 넓은 기본 레이아웃도)에서 글꼴을 줄여 봄
+        layouts = [slide.layout]
+        if not slide.image_path and not slide.gallery and slide.layout != DEFAULT_LAYOUT:
+            layouts.append(DEFAULT_LAYOUT)
+
+        line_widths = self.line_widths(slide.content)
+        for layout in layouts:
+            placeholder = self.body_placeholder(layout)
+            default_size = placeholder['font_size']
+            min_size = default_size * MIN_FONT_SCALE
+            font_size = default_size
+            while font_size >= min_size:
+                if self.fits(slide.content, layout, font_size, line_widths):
+                    if layout == slide.layout and font_size == default_size:
+                        return [slide]
+                    return [replace(slide, layout=layout,
+                                    body_font_size=None if font_size == default_size else font_size)]
+                font_size -= FONT_SIZE_STEP
+
+        # 2. 본문이 가장 넓은 레이아웃의 기본 글꼴 크기로 이어지는 슬라이드에 나눔
+        #    (이미지, 발표자 노트, 서식 구간은 첫 슬라이드에만)
+        layout = layouts[-1]
+        return [replace(slide, layout=layout,
+                        title=slide.title if i == 0 else slide.title + CONTINUATION_SUFFIX,
+                        content=page,
+                        image_path=slide.image_path if i == 0 else None,
+                        gallery=slide.gallery if i == 0 else [],
+                        notes=slide.notes if i == 0 else '',
+                        style_runs=slide.style_runs if i == 0 else [])
+                for i, page in enumerate(self.paginate(slide.content, layout))]
+
+    def paginate(self, text: str, layout: str) -> List[str]:
+        """텍스트를 자리표시자 크기의 페이지로 나눔 (가능하면 원래 줄 경계에서)"""
+        placeholder = self.body_placeholder(layout)
+        max_width = placeholder['width'] / placeholder['font_size']
+        max_lines = self.max_lines(placeholder, placeholder['font_size'])
+
+        pages: List[List[str]] = []
+        current: List[str] = []
+        used_lines = 0
+        for line in text.split('\n'):
+            spans = self._line_spans(line, max_width)
+            if current and used_lines + len(spans) > max_lines:
+                pages.append(current)
+                current, used_lines = [], 0
+
+            if len(spans) <= max_lines:
+                current.append(line)
+                used_lines += len(spans)
+                continue
+
+            # 한 줄(문단)이 한 페이지보다 길면 줄바꿈된 줄 단위로 나누되, 페이지의 절반 이상을
+            # 채우는 문장 경계가 있으면 거기서 나눔
+            # (줄바꿈 구간은 한 번만 계산하고 위치로 따라감 - 문장 경계에서 나눈 줄의 나머지는
+            #  원래 줄바꿈보다 줄 수가 늘지 않으므로 남은 구간을 그대로 씀)
+            ends = sentence_ends(line)
+            span_ends = [end for _, end in spans]
+            first, start = 0, spans[0][0]
+            while len(spans) - first > max_lines:
+                last = first + max_lines - 1
+                cut = span_ends[last]
+                half = spans[first + max_lines // 2][0]
+                position = bisect_right(ends, cut) - 1
+                if position >= 0 and ends[position] > half:
+                    cut = ends[position]
+                pages.append([line[start:cut].rstrip(' ')])
+                first = bisect_left(span_ends, cut, first, last + 1)
+                if cut == span_ends[first]:
+                    first += 1
+                    start = spans[first][0]
+                else:
+                    start = cut
+                    while line[start] == ' ':
+                        start += 1
+            current, used_lines = [line[start:]], len(spans) - first
+
+        if current:
+            pages.append(current)
+
+        return [page_text for page_text in ('\n'.join(page).strip('\n') for page in pages)
+                if page_text]
+
+    def fit_slides(self, slides: List["SlideData"]) -> List["SlideData"]:
+        """모든 슬라이드 맞춤"""
+        fitted = []
+        for slide in slides:
+            fitted.extend(self.fit_slide(slide))
+        return fitted
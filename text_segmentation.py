@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+✂️ 텍스트 분할기
+문서를 줄 단위로 흘려 읽으며 제목(Markdown #, "제 3 장 ...", 따로 선 번호 절 "2.1 ...")과 문단 블록으로
+나누고, 문장 경계와 글자 묶음(grapheme) 단위 표시 폭(한글/한자/가나는 2칸)으로 제목을 뽑는
+스트리밍 토크나이저
+
+문자열 전체를 줄 목록으로 만들지 않으므로 파일 객체나 청크 반복자를 그대로 넘길 수 있습니다.
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import io
+import re
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# 슬라이드 제목 최대 표시 폭 (라틴 문자 50자, 한글 25자)
+TITLE_MAX_WIDTH = 50
+TITLE_ELLIPSIS = '...'
+
+# 항상 제목인 줄: Markdown "# 제목", "제 3 장 제목" (단위 뒤에 공백이나 줄 끝이 와야 함 -
+# "제2부서는 ...", "제1장에서 ..." 같은 문장은 본문)
+HEADING_PATTERN = re.compile(
+    r'(?:(?P<hashes>#{1,6})[ \t]+(?P<markdown>.*?)(?:[ \t]+#+)?'
+    r'|제[ \t]*\d+[ \t]*(?P<unit>[부장절])(?:[ \t]+(?P<chapter>.*))?)[ \t]*$')
+# 빈 줄로 둘러싸인 한 줄 문단일 때만 제목인 줄: "3. 결론", "3) 결론", "2.1 세부 분석"
+# (여러 단계 번호도 "2.5 million ..." 처럼 문장 앞의 소수일 수 있어 따로 선 줄만 제목으로 봄)
+STANDALONE_HEADING_PATTERN = re.compile(
+    r'(?:\d+[.)]|(?P<number>\d+(?:\.\d+)+)\.?)[ \t]+(?P<title>\S.*)$')
+HEADING_STARTS = frozenset('#제')
+CHAPTER_LEVELS = {'부': 1, '장': 1, '절': 2}
+
+# 문장 끝: .!?… 뒤에 닫는 따옴표/괄호와 공백(또는 끝), 전각 。！？ 는 공백 없이도
+SENTENCE_END_PATTERN = re.compile(
+    r'(?:[.!?…]+[\'"’”)\]」』]*(?=\s|$)|[。！？]+[\'"’”)\]」』]*)')
+# 문장 끝으로 보지 않는 약어 (소문자, 마침표 제외)
+ABBREVIATIONS = frozenset({'e.g', 'i.e', 'mr', 'mrs', 'ms', 'dr', 'prof', 'vs', 'no', 'fig',
+                           'st', 'jr', 'sr', 'cf', 'approx'})
+_WORD_BEFORE = re.compile(r'(\S+)$')
+
+Source = Union[str, Iterable[str]]
+
+
+@dataclass
+class Block:
+    """분할 결과 블록
+
+    joined 는 앞 블록과 빈 줄 없이 이어졌는지 (같은 원문 문단에서 제목 줄로 나뉜 경우)입니다.
+    """
+    kind: str          # 'heading' 또는 'paragraph'
+    text: str
+    level: int = 0     # 제목 수준 (1 부터)
+    joined: bool = False
+
+
+# ---------------------------------------------------------------------- 글자 묶음/폭
+
+_CHAR_INFO: Dict[str, Tuple[int, bool, bool]] = {}
+
+
+def _char_info(char: str) -> Tuple[int, bool, bool]:
+    """글자 → (표시 폭, 앞 글자 묶음에 붙는지, 국기 글자인지) - 글자별로 캐시"""
+    info = _CHAR_INFO.get(char)
+    if info is None:
+        code = ord(char)
+        category = unicodedata.category(char)
+        joins = (code == 0x200d                                  # ZWJ 이모지 연결
+                 or unicodedata.combining(char) != 0
+                 or category in ('Mn', 'Me', 'Mc')
+                 or 0xfe00 <= code <= 0xfe0f                     # 이체 선택자
+                 or 0x1f3fb <= code <= 0x1f3ff                   # 피부색 수정자
+                 or 0xe0020 <= code <= 0xe007f                   # 태그 (깃발)
+                 or 0x1160 <= code <= 0x11ff or 0xd7b0 <= code <= 0xd7ff)  # 한글 중성/종성 자모
+        regional = 0x1f1e6 <= code <= 0x1f1ff
+        if regional or unicodedata.east_asian_width(char) in ('W', 'F'):
+            width = 2  # 국기는 지역 표시 글자 쌍의 첫 글자 폭
+        elif joins or category == 'Cf':
+            width = 0
+        else:
+            width = 1
+        info = _CHAR_INFO[char] = (width, joins, regional)
+    return info
+
+
+def _scan(text: str, limit: Optional[int] = None) -> Tuple[int, int]:
+    """글자 묶음 단위로 폭을 더해 (표시 폭, 폭 limit 안에 드는 앞부분 길이) 반환
+
+    글자 묶음은 UAX #29 의 흔한 경우만 근사합니다: 결합 문자, 한글 중성/종성 자모,
+    ZWJ 로 이은 이모지, 이체 선택자/피부색 수정자, 국기(지역 표시 글자 쌍).
+    묶음의 폭은 첫 글자 폭이며 이모지 표현 선택자(U+FE0F)가 붙으면 2칸입니다.
+    limit 을 넘는 묶음을 만나면 거기서 멈추고 그 묶음까지 더한 폭(> limit)을 반환합니다.
+    """
+    width = base = regional = 0
+    after_zwj = False
+    for index, char in enumerate(text):
+        char_width, joins, is_regional = _CHAR_INFO.get(char) or _char_info(char)
+        if index and (joins or after_zwj or (is_regional and regional % 2 == 1)):
+            if char == '\ufe0f' and base == 1:
+                width, base = width + 1, 2
+        else:
+            if limit is not None and width + char_width > limit:
+                return width + char_width, index
+            width, base = width + char_width, char_width
+        after_zwj = char == '\u200d'
+        regional = regional + 1 if is_regional else 0
+    return width, len(text)
+
+
+def iter_graphemes(text: str) -> Iterator[str]:
+    """글자 묶음 단위로 반환 (결합 문자, 한글 자모, 이모지 연결/수정자, 국기 쌍을 나누지 않음)"""
+    start = 0
+    regional = 0
+    after_zwj = False
+    for index, char in enumerate(text):
+        _, joins, is_regional = _CHAR_INFO.get(char) or _char_info(char)
+        if index and not (joins or after_zwj or (is_regional and regional % 2 == 1)):
+            yield text[start:index]
+            start = index
+        after_zwj = char == '\u200d'
+        regional = regional + 1 if is_regional else 0
+    if text:
+        yield text[start:]
+
+
+def display_width(text: str, limit: Optional[int] = None) -> int:
+    """표시 폭 (ASCII 는 글자 수 그대로) - limit 을 주면 넘는 즉시 멈추고 limit 보다 큰 값 반환"""
+    if text.isascii():
+        return len(text)
+    return _scan(text, limit)[0]
+
+
+def truncate_width(text: str, width: int) -> str:
+    """표시 폭 width 안에 들어가는 앞부분 (글자 묶음 경계에서 자름)"""
+    if text.isascii():
+        return text[:width]
+    return text[:_scan(text, width)[1]]
+
+
+# ---------------------------------------------------------------------- 문장
+
+def _iter_sentence_ends(text: str, endpos: Optional[int] = None) -> Iterator[int]:
+    endpos = len(text) if endpos is None else min(endpos, len(text))
+    for match in SENTENCE_END_PATTERN.finditer(text, 0, endpos):
+        start, end = match.span()
+        if end == endpos < len(text) and not text[end].isspace():
+            continue  # 검사 범위 끝에서 잘린 것
+        if text[start] == '.' and match.group().rstrip('\'"’”)]」』') == '.':
+            word = _WORD_BEFORE.search(text, max(0, start - 12), start)
+            word = word.group(1) if word else ''
+            word_start = start - len(word)
+            if (word.lower() in ABBREVIATIONS
+                    or (len(word) == 1 and word.isupper())
+                    or (word.isdigit() and (word_start == 0 or text[word_start - 1] == '\n'))):
+                continue
+        yield end
+
+
+def sentence_ends(text: str) -> List[int]:
+    """문장이 끝나는 위치(문장 끝 부호와 닫는 따옴표 뒤) 목록
+
+    소수점(3.14), 약어(e.g., Dr.), 줄 머리의 목록 번호(1.), 영문 이니셜(J.)은 끝으로 보지 않습니다.
+    """
+    return list(_iter_sentence_ends(text))
+
+
+def first_sentence_end(text: str, endpos: Optional[int] = None) -> Optional[int]:
+    """첫 문장이 끝나는 위치 (endpos 앞에서만 찾음, 없으면 None)"""
+    return next(_iter_sentence_ends(text, endpos), None)
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """문장 단위로 반환 (앞뒤 공백 제거, 마지막 조각도 포함)"""
+    start = 0
+    for end in sentence_ends(text) + [len(text)]:
+        sentence = text[start:end].strip()
+        if sentence:
+            yield sentence
+        start = end
+
+
+def split_title(paragraph: str, max_width: int = TITLE_MAX_WIDTH) -> Tuple[str, str]:
+    """문단 → (제목, 본문)
+
+    첫 줄이 폭 안에 들면 첫 줄이 제목이고 나머지가 본문입니다 (한 줄 문단은 그 줄이 본문).
+    첫 줄이 길면 첫 문장이 폭 안에 들 때 첫 문장을 제목으로, 아니면 글자 묶음 경계에서 잘라
+    말줄임표를 붙이며, 이때 본문은 내용을 잃지 않도록 나머지 문장 또는 문단 전체입니다.
+    """
+    first, _, rest = paragraph.partition('\n')
+    if display_width(first, max_width) <= max_width:
+        return first, rest or first
+
+    # 폭 안에 드는 문장은 (폭 0 인 글자가 섞여도) 이보다 짧음
+    end = first_sentence_end(first, max_width * 4)
+    if end is not None and end < len(first):
+        sentence = first[:end].strip()
+        if display_width(sentence, max_width) <= max_width:
+            remainder = first[end:].strip()
+            return sentence, '\n'.join(part for part in (remainder, rest) if part)
+    return truncate_width(first, max_width) + TITLE_ELLIPSIS, paragraph
+
+
+# ---------------------------------------------------------------------- 스트리밍 분할
+
+def _iter_lines(source: Source) -> Iterator[str]:
+    """문자열 또는 청크 반복자 → 줄 (청크 경계에서 잘린 줄은 이어 붙임)"""
+    if isinstance(source, str):
+        yield from io.StringIO(source)
+        return
+    pending = ''
+    for chunk in source:
+        if pending:
+            chunk = pending + chunk
+        lines = chunk.split('\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def heading_of(line: str) -> Optional[Tuple[int, str]]:
+    """항상 제목인 줄이면 (수준, 제목 텍스트)"""
+    match = HEADING_PATTERN.match(line)
+    if match is None:
+        return None
+    if match.group('hashes'):
+        return len(match.group('hashes')), match.group('markdown').strip()
+    chapter = (match.group('chapter') or '').strip()
+    return CHAPTER_LEVELS[match.group('unit')], chapter or line.strip()
+
+
+def _paragraph(lines: List[str], joined: bool, standalone: bool) -> Block:
+    text = '\n'.join(lines).strip()
+    if standalone and len(lines) == 1:
+        match = STANDALONE_HEADING_PATTERN.match(text)
+        if (match and display_width(text, TITLE_MAX_WIDTH) <= TITLE_MAX_WIDTH
+                and first_sentence_end(match.group('title')) is None):
+            number = match.group('number')
+            level = number.count('.') + 1 if number else 1
+            return Block('heading', match.group('title').strip(), level, joined)
+    return Block('paragraph', text, 0, joined)
+
+
+def iter_blocks(source: Source) -> Iterator[Block]:
+    """문서를 제목/문단 블록으로 나눔 (줄 단위 스트리밍)
+
+    문단은 빈 줄(공백만 있는 줄 포함)로 나누고, 제목 줄은 빈 줄이 없어도 앞뒤를 나눕니다.
+    """
+    lines: List[str] = []
+    joined = False
+    for line in _iter_lines(source):
+        line = line.rstrip('\r\n')
+        stripped = line.strip()
+        if not stripped:
+            if lines:
+                yield _paragraph(lines, joined, not joined)
+                lines = []
+            joined = False
+            continue
+        if stripped[0] in HEADING_STARTS:
+            heading = heading_of(stripped)
+            if heading is not None:
+                if lines:
+                    yield _paragraph(lines, joined, False)
+                    lines, joined = [], True
+                yield Block('heading', heading[1], heading[0], joined)
+                joined = True
+                continue
+        lines.append(line)
+    if lines:
+        yield _paragraph(lines, joined, not joined)
+
+
+def split_paragraphs(text: str) -> Iterator[str]:
+    """이전 방식: 빈 줄로만 나누고 첫 줄 앞 50자를 제목으로 (벤치마크 비교용)"""
+    for paragraph in text.split('\n\n'):
+        paragraph = paragraph.strip()
+        if paragraph:
+            lines = paragraph.split('\n', 1)
+            yield lines[0][:50] + ('...' if len(lines[0]) > 50 else '')
+
+
+def benchmark_document(size_mb: float = 4.0) -> str:
+    """한국어/영어/일본어/중국어/이모지가 섞인 벤치마크 문서"""
+    section = ("# 제 {n} 부 시장 동향 Market trends\n"
+               "인공지능 도입은 빠르게 늘고 있습니다. Adoption grew 3.5x, e.g. in retail. "
+               "生成AIの活用が広がっています。市场规模持续扩大！👩‍💻 팀이 검토했습니다.\n"
+               "• 항목 하나\n• second item\n\n"
+               "{n}.1 세부 분석\n"
+               + "긴 문단 문장입니다. Long paragraph sentence here! " * 12 + "\n\n"
+               "{n}. 요약\n\n"
+               "짧은 결론 문단\n한 줄 더\n\n")
+    parts = []
+    size = 0
+    n = 0
+    while size < size_mb * 1024 * 1024:
+        n += 1
+        part = section.format(n=n)
+        parts.append(part)
+        size += len(part.encode('utf-8'))
+    return ''.join(parts)
+
+
+def main():
+    """메인 함수 - 파일 분할 결과 보기 / 이전 방식과 처리량 비교"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="텍스트 분할기")
+    parser.add_argument('file', nargs='?', help="분할할 텍스트 파일 (없으면 벤치마크 문서)")
+    parser.add_argument('--size-mb', type=float, default=4.0, help="벤치마크 문서 크기")
+    parser.add_argument('--show', type=int, default=10, help="출력할 블록 수")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = benchmark_document(args.size_mb)
+    megabytes = len(text.encode('utf-8')) / (1024 * 1024)
+
+    start = time.perf_counter()
+    paragraphs = sum(1 for _ in split_paragraphs(text))
+    split_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocks = headings = 0
+    shown = []
+    for block in iter_blocks(text):
+        blocks += 1
+        if block.kind == 'heading':
+            headings += 1
+        else:
+            split_title(block.text)
+        if len(shown) < args.show:
+            shown.append(block)
+    segment_time = time.perf_counter() - start
+
+    for block in shown:
+        label = f"H{block.level}" if block.kind == 'heading' else "P "
+        print(f"  {label} {truncate_width(block.text.splitlines()[0], 60)}")
+    print(f"📄 {megabytes:.1f}MB")
+    print(f"  split 방식:   {paragraphs:,}개 문단  {megabytes / split_time:8.1f}MB/s")
+    print(f"  스트리밍 분할: {blocks:,}개 블록 (제목 {headings:,})  "
+          f"{megabytes / segment_time:8.1f}MB/s")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🩺 GUI 메인 루프 프로파일러
+Tk 이벤트 핸들러/after 콜백마다 메인 스레드를 붙잡은 시간을 재고, 오래 걸린 호출(멈춤) 동안
+메인 스레드 스택을 샘플링해 flamegraph 용 folded 스택 파일로 저장
+
+tkinter 는 모든 파이썬 콜백(command=, bind, after)을 CallWrapper 로 감싸 Tcl 에 등록하므로,
+install() 이 CallWrapper 를 바꾼 뒤 만든 위젯/콜백은 모두 측정됩니다 (창을 만들기 전에 설치).
+folded 파일은 flamegraph.pl, speedscope, inferno 에서 그대로 열 수 있습니다.
+
+    python keynote_generator_main.py --profile stalls.folded    # 직접 사용하며 기록
+    xvfb-run -a python ui_profiler.py --output stalls.folded    # 시나리오 + 멈춤 예산 검사 (CI)
+
+Author: AI Assistant
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+# 이 시간 이상 메인 스레드를 붙잡은 핸들러는 멈춤으로 기록하고 스택 샘플을 남김
+STALL_THRESHOLD = 0.1
+# 핸들러 실행 중 스택 샘플링 간격 (초)
+SAMPLE_INTERVAL = 0.005
+# 이벤트 루프 지연을 재는 heartbeat 간격 (초)
+HEARTBEAT_INTERVAL = 0.05
+# 시나리오에서 허용하는 가장 긴 멈춤 (ms)
+STALL_BUDGET_MS = 250
+
+
+@dataclass
+class HandlerStats:
+    """핸들러별 집계"""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    stalls: int = 0
+
+
+@dataclass
+class Stall:
+    """메인 스레드 멈춤 (핸들러 하나가 threshold 이상 실행)"""
+    handler: str
+    duration: float
+    started: float  # 프로파일링 시작 기준 (초)
+
+
+def callback_target(func: Callable) -> Callable:
+    """Tcl 에 등록된 콜백의 원래 함수 (Misc.after 의 내부 callit 을 벗겨 냄)"""
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and func.__closure__:
+        # Misc.after 가 등록하는 callit 은 원래 함수를 클로저 변수 func 로 가짐
+        cells = dict(zip(code.co_freevars, func.__closure__))
+        if 'func' in cells:
+            return callback_target(cells['func'].cell_contents)
+    return func
+
+
+def handler_name(func: Callable) -> str:
+    """콜백 이름 (after 콜백은 원래 함수 이름, lambda 는 정의 줄까지)"""
+    func = callback_target(func)
+    target = getattr(func, '__func__', func)
+    name = getattr(target, '__qualname__', None) or type(func).__qualname__
+    if name.endswith('<lambda>') and hasattr(target, '__code__'):
+        name += f":{target.__code__.co_firstlineno}"
+    return name
+
+
+def _frame_name(code) -> str:
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)})"
+
+
+class MainLoopProfiler:
+    """Tk 메인 루프 프로파일러
+
+    stall_threshold 이상 걸린 핸들러 호출만 스택 샘플을 남기므로 (짧은 호출의 샘플은 버림)
+    folded 파일은 멈춤 구간의 시간 분포를 나타냅니다. 샘플 수 × sample_interval ≈ 시간.
+    """
+
+    def __init__(self, stall_threshold: float = STALL_THRESHOLD,
+                 sample_interval: float = SAMPLE_INTERVAL,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.stall_threshold = stall_threshold
+        self.sample_interval = sample_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.stalls: List[Stall] = []
+        self.folded: Counter = Counter()
+        self.loop_lags: List[float] = []  # threshold 이상 늦은 heartbeat 지연
+
+        self._lock = threading.Lock()
+        self._active: Optional[tuple] = None  # (핸들러 이름, 시작 시각) - 가장 바깥 호출
+        self._samples: List[str] = []         # 진행 중인 호출의 샘플
+        self._main_ident = threading.main_thread().ident
+        self._started = time.perf_counter()
+        self._original_wrapper = None
+        self._wrapper_code = None
+        self._hidden_codes = set()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._root = None
+
+    # ------------------------------------------------------------------ 설치
+
+    def install(self, root=None) -> "MainLoopProfiler":
+        """tkinter.CallWrapper 교체와 샘플러 시작 (root 를 주면 이벤트 루프 지연도 측정)"""
+        import tkinter
+
+        if self._original_wrapper is None:
+            profiler = self
+            original = self._original_wrapper = tkinter.CallWrapper
+
+            class ProfiledCallWrapper(original):
+                def __call__(self, *args):
+                    if getattr(callback_target(self.func), 'profiler_heartbeat', False):
+                        return original.__call__(self, *args)
+                    return profiler._measure(handler_name(self.func), original.__call__,
+                                             self, *args)
+
+            tkinter.CallWrapper = ProfiledCallWrapper
+            # 샘플 스택은 가장 바깥 측정 래퍼 위쪽만, 래퍼/after 내부 프레임은 빼고 기록
+            self._wrapper_code = ProfiledCallWrapper.__call__.__code__
+            self._hidden_codes = {self._wrapper_code, original.__call__.__code__,
+                                  self._measure.__code__}
+            self._hidden_codes.update(code for code in tkinter.Misc.after.__code__.co_consts
+                                      if getattr(code, 'co_name', None) == 'callit')
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name='ui-profiler',
+                                             daemon=True)
+            self._sampler.start()
+
+        if root is not None:
+            self._root = root
+            self._schedule_heartbeat()
+        return self
+
+    def uninstall(self):
+        """원래 CallWrapper 복원 (이미 등록된 콜백은 계속 측정되지만 집계는 멈춤)"""
+        if self._original_wrapper is None:
+            return
+        import tkinter
+        tkinter.CallWrapper = self._original_wrapper
+        self._original_wrapper = None
+        self._root = None
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    # ------------------------------------------------------------------ 측정
+
+    def _measure(self, name: str, call: Callable, *args):
+        if self._original_wrapper is None:
+            return call(*args)
+        outermost = self._active is None
+        start = time.perf_counter()
+        if outermost:
+            with self._lock:
+                self._active, self._samples = (name, start), []
+        try:
+            return call(*args)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self.handlers.setdefault(name, HandlerStats())
+                stats.count += 1
+                stats.total += duration
+                stats.max = max(stats.max, duration)
+                if outermost:
+                    if duration >= self.stall_threshold:
+                        stats.stalls += 1
+                        self.stalls.append(Stall(name, duration, start - self._started))
+                        self.folded.update(self._samples)
+                    self._active, self._samples = None, []
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            active = self._active
+            if active is None:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            del frame
+            if self._wrapper_code not in codes:
+                continue
+            outermost = len(codes) - 1 - codes[::-1].index(self._wrapper_code)
+            stack = [_frame_name(code) for code in codes[:outermost]
+                     if code not in self._hidden_codes]
+            with self._lock:
+                if self._active is active:
+                    self._samples.append(';'.join([active[0]] + stack[::-1]))
+
+    def _schedule_heartbeat(self):
+        expected = time.perf_counter() + self.heartbeat_interval
+
+        def heartbeat():
+            lag = time.perf_counter() - expected
+            if lag >= self.stall_threshold:
+                self.loop_lags.append(lag)
+            if self._root is not None:
+                self._schedule_heartbeat()
+
+        heartbeat.profiler_heartbeat = True  # 핸들러 집계에서 제외
+        self._root.after(int(self.heartbeat_interval * 1000), heartbeat)
+
+    # ------------------------------------------------------------------ 결과
+
+    @property
+    def max_stall(self) -> float:
+        return max([stall.duration for stall in self.stalls] + self.loop_lags + [0.0])
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                'stall_threshold': self.stall_threshold,
+                'sample_interval': self.sample_interval,
+                'max_stall': self.max_stall,
+                'handlers': {name: asdict(stats) for name, stats in self.handlers.items()},
+                'stalls': [asdict(stall) for stall in self.stalls],
+                'loop_lags': list(self.loop_lags),
+                'samples': sum(self.folded.values())
+            }
+
+    def write_folded(self, path: str) -> str:
+        """folded 스택 저장 ("핸들러;함수 (파일);... 샘플수" 한 줄씩)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in sorted(self.folded.items())]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + ('\n' if lines else ''))
+        return path
+
+    def write_report(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=1)
+        return path
+
+    def print_report(self, top: int = 10):
+        report = self.report()
+        print(f"🩺 메인 루프 프로파일 (멈춤 기준 {self.stall_threshold * 1000:.0f}ms)")
+        rows = sorted(report['handlers'].items(), key=lambda item: item[1]['max'], reverse=True)
+        for name, stats in rows[:top]:
+            print(f"  {stats['max'] * 1000:8.1f}ms 최대  {stats['total'] * 1000:8.1f}ms 합계  "
+                  f"{stats['count']:5}회  멈춤 {stats['stalls']}  {name}")
+        print(f"  멈춤 {len(report['stalls'])}회, 늦은 heartbeat {len(report['loop_lags'])}회, "
+              f"가장 긴 멈춤 {report['max_stall'] * 1000:.1f}ms, 스택 샘플 {report['samples']}개")
+
+
+SCENARIO_TEXT = "\n\n".join(
+    ["프로파일링 시나리오\n발표 흐름 점검"] +
+    [f"섹션 {i}\n" + "\n".join(f"• 항목 {i}-{j}: 응답성 측정을 위한 본문 문장입니다" for j in range(6))
+     for i in range(40)])
+
+
+def run_scenario(profiler: MainLoopProfiler, settle: float = 1.0) -> bool:
+    """GUI 를 띄워 텍스트 입력 → 분석 → 다시 분석(캐시)을 실행하고 미리보기가 끝날 때까지 대기
+
+    창을 만드는 데 디스플레이가 필요합니다 (Linux CI 에서는 xvfb-run).
+    """
+    import keynote_generator_main as generator
+
+    generator._load_tkinter()
+    profiler.install()
+    try:
+        return _run_scenario_steps(generator, profiler, settle)
+    finally:
+        profiler.uninstall()
+
+
+def _run_scenario_steps(generator, profiler: MainLoopProfiler, settle: float) -> bool:
+    root = generator.tk.Tk()
+    app = generator.KeynoteGenerator(root)
+    profiler.install(root)
+    steps = [
+        lambda: app.text_area.insert('1.0', SCENARIO_TEXT),
+        app.analyze_content,
+        app.analyze_content
+    ]
+    finished = {}
+
+    def next_step():
+        if 'settings_loaded' not in app.startup_times:
+            root.after(10, next_step)
+            return
+        if steps:
+            root.after(0, steps.pop(0))
+            root.after(50, next_step)
+            return
+        finished['at'] = time.perf_counter()
+        root.after(int(settle * 1000), root.destroy)
+
+    root.after(10, next_step)
+    root.mainloop()
+    return 'at' in finished
+
+
+def main():
+    """메인 함수 - 시나리오를 실행하고 멈춤 예산 검사"""
+    parser = argparse.ArgumentParser(description="GUI 메인 루프 멈춤 프로파일링")
+    parser.add_argument('--output', default='ui_stalls.folded', help="folded 스택 파일")
+    parser.add_argument('--report', help="JSON 보고서 파일")
+    parser.add_argument('--threshold-ms', type=float, default=STALL_THRESHOLD * 1000)
+    parser.add_argument('--budget-ms', type=float, default=STALL_BUDGET_MS,
+                        help="이보다 긴 멈춤이 있으면 실패")
+    args = parser.parse_args()
+
+    profiler = MainLoopProfiler(stall_threshold=args.threshold_ms / 1000)
+    try:
+        completed = run_scenario(profiler)
+    except Exception as e:  # 디스플레이 없음 등
+        print(f"❌ 시나리오 실행 실패: {type(e).__name__}: {e}")
+        return False
+
+    profiler.print_report()
+    print(f"📁 {profiler.write_folded(args.output)}")
+    if args.report:
+        print(f"📁 {profiler.write_report(args.report)}")
+
+    within_budget = profiler.max_stall * 1000 <= args.budget_ms
+    print(f"{'✅' if within_budget else '❌'} 가장 긴 멈춤 {profiler.max_stall * 1000:.1f}ms "
+          f"/ 예산 {args.budget_ms:.0f}ms")
+    return completed and within_budget
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)